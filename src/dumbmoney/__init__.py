@@ -1,15 +1,72 @@
-from .feeds import (
-    get_ohlcv,
-    load_ohlcv_from_csv,
-    export_ohlcv_to_csv,
-    get_stock_details,
-)
-from .plotting import plot
+from typing import TYPE_CHECKING
+
+from .lazy import import_times, timed_import
+
+# Public names are loaded on first access (PEP 562), so that `import dumbmoney`
+# doesn't pull in pandas, the provider SDKs or the plotting backends.
+_LAZY_ATTRS = {
+    "get_ohlcv": "dumbmoney.feeds",
+    "get_ohlcv_many": "dumbmoney.feeds",
+    "get_stock_details": "dumbmoney.feeds",
+    "get_universe": "dumbmoney.feeds",
+    "build_panel": "dumbmoney.feeds",
+    "load_ohlcv_from_csv": "dumbmoney.feeds",
+    "export_ohlcv_to_csv": "dumbmoney.feeds",
+    "load_ohlcv_from_parquet": "dumbmoney.feeds",
+    "export_ohlcv_to_parquet": "dumbmoney.feeds",
+    "load_ohlcv_from_feather": "dumbmoney.feeds",
+    "export_ohlcv_to_feather": "dumbmoney.feeds",
+    "load_ohlcv_from_npy": "dumbmoney.feeds",
+    "export_ohlcv_to_npy": "dumbmoney.feeds",
+    "plot": "dumbmoney.plotting",
+}
+
+if TYPE_CHECKING:
+    from .feeds import (
+        get_ohlcv,
+        get_ohlcv_many,
+        load_ohlcv_from_csv,
+        export_ohlcv_to_csv,
+        load_ohlcv_from_parquet,
+        export_ohlcv_to_parquet,
+        load_ohlcv_from_feather,
+        export_ohlcv_to_feather,
+        load_ohlcv_from_npy,
+        export_ohlcv_to_npy,
+        get_stock_details,
+        get_universe,
+        build_panel,
+    )
+    from .plotting import plot
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(timed_import(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
+
 
 __all__ = [
     "get_ohlcv",
+    "get_ohlcv_many",
     "get_stock_details",
+    "get_universe",
+    "build_panel",
     "load_ohlcv_from_csv",
     "export_ohlcv_to_csv",
+    "load_ohlcv_from_parquet",
+    "export_ohlcv_to_parquet",
+    "load_ohlcv_from_feather",
+    "export_ohlcv_to_feather",
+    "load_ohlcv_from_npy",
+    "export_ohlcv_to_npy",
+    "import_times",
     "plot",
 ]
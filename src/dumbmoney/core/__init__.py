@@ -1,4 +1,5 @@
-from .data import OHLCVData, normalize_ohlcv
+from .data import OHLCVData, normalize_ohlcv, empty_ohlcv, compact_ohlcv
+from .panel import OHLCVPanel, PanelStore
 from .signals import SignalFrame, SignalType
 from .portfolio import SingleAssetPortfolioState, Order, Trade, Side
 from .results import BacktestMetrics, BacktestResult
@@ -7,6 +8,10 @@ from .stock import StockDetails
 __all__ = [
     "OHLCVData",
     "normalize_ohlcv",
+    "empty_ohlcv",
+    "compact_ohlcv",
+    "OHLCVPanel",
+    "PanelStore",
     "SignalFrame",
     "SignalType",
     "SingleAssetPortfolioState",
@@ -1,9 +1,11 @@
 from typing import List, Optional
 
+import numpy as np
 import pandas as pd
 
 
 _REQUIRED_COLS = ("open", "high", "low", "close", "volume")
+_PRICE_COLS = ("open", "high", "low", "close", "pre_close", "vwap")
 
 
 class OHLCVData(pd.DataFrame):
@@ -17,7 +19,7 @@ class OHLCVData(pd.DataFrame):
 
 
 def normalize_ohlcv(
-    data: pd.DataFrame, fields: Optional[List[str]] = None
+    data: pd.DataFrame, fields: Optional[List[str]] = None, compact: bool = False
 ) -> OHLCVData:
     """
     Ensure DataFrame has required OHLC columns and a DatetimeIndex.
@@ -25,6 +27,7 @@ def normalize_ohlcv(
     Args:
       data: pd.DataFrame containing OHLCV data.
       fields: Optional list of fields to include. If None, include all.
+      compact: Whether to downcast to compact dtypes, see `compact_ohlcv`.
     """
     df = data.copy()
     df.columns = [col.lower() for col in df.columns]
@@ -56,4 +59,55 @@ def normalize_ohlcv(
         other_cols = [col for col in other_cols if col in fields]
     df = df[cols + other_cols]
 
+    if compact:
+        return compact_ohlcv(df)
     return pd.DataFrame(df)  # type: ignore
+
+
+def compact_ohlcv(data: pd.DataFrame, price_tick: float = 0.001) -> OHLCVData:
+    """
+    Return OHLCV data with compact dtypes, about half the memory per bar:
+
+    - prices as float32, unless float32 can't hold some price within half a
+      `price_tick` (e.g. prices in the hundreds of thousands)
+    - volume as int32 (int64 if needed), unless it has missing or fractional values
+    - other float columns as float32, other text columns as categories
+    """
+    columns = {}
+    for col in data.columns:
+        values = data[col]
+        if values.dtype == object and (col in _REQUIRED_COLS or col in _PRICE_COLS):
+            values = pd.to_numeric(values, errors="coerce")
+
+        if col == "volume":
+            volume = values.to_numpy()
+            if not np.isfinite(volume).all() or (volume != np.round(volume)).any():
+                columns[col] = values
+            elif len(volume) == 0 or np.abs(volume).max() < 2**31:
+                columns[col] = values.astype("int32")
+            else:
+                columns[col] = values.astype("int64")
+        elif values.dtype == "float64" and col in _PRICE_COLS:
+            compact = values.astype("float32")
+            error = (compact.astype("float64") - values).abs().max()
+            columns[col] = compact if not error > price_tick / 2 else values
+        elif values.dtype == "float64":
+            columns[col] = values.astype("float32")
+        elif values.dtype == object:
+            columns[col] = values.astype("category")
+        else:
+            columns[col] = values
+
+    return pd.DataFrame(columns, index=data.index)  # type: ignore
+
+
+def empty_ohlcv() -> OHLCVData:
+    """
+    Return an empty OHLCV DataFrame with the required columns and a DatetimeIndex.
+    Used by feeds when a provider has no bars for the requested range.
+    """
+    df = pd.DataFrame(
+        {col: pd.Series(dtype="float64") for col in _REQUIRED_COLS},
+        index=pd.DatetimeIndex([], name="date"),
+    )
+    return df  # type: ignore
@@ -0,0 +1,219 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import json
+import numpy as np
+import pandas as pd
+
+from .data import OHLCVData, _REQUIRED_COLS
+
+
+PANEL_FIELDS = _REQUIRED_COLS
+
+
+def _as_slice(positions: np.ndarray) -> Optional[slice]:
+    """Return an equivalent slice if the positions are evenly spaced and increasing."""
+    if len(positions) == 0:
+        return slice(0, 0)
+    if len(positions) == 1:
+        return slice(int(positions[0]), int(positions[0]) + 1)
+    steps = np.diff(positions)
+    step = int(steps[0])
+    if step <= 0 or not (steps == step).all():
+        return None
+    return slice(int(positions[0]), int(positions[-1]) + 1, step)
+
+
+class OHLCVPanel:
+    """
+    OHLCV data of many symbols on a shared date index: one (date × symbol) array per
+    field, NaN where a symbol has no bar.
+
+    Selecting a date range or an evenly spaced run of symbols returns views of the
+    same arrays. Any other symbol subset is only gathered when a field is accessed.
+    """
+
+    def __init__(
+        self,
+        dates: pd.DatetimeIndex,
+        symbols: Sequence[str],
+        arrays: Dict[str, np.ndarray],
+        columns: Optional[np.ndarray] = None,
+    ):
+        self.dates = dates
+        self.symbols = pd.Index(symbols, name="symbol")
+        self._arrays = arrays
+        self._columns = columns  # pending symbol positions, gathered on access
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Dict[str, OHLCVData],
+        dates: Optional[pd.DatetimeIndex] = None,
+        fields: Sequence[str] = PANEL_FIELDS,
+        dtype="float64",
+    ) -> "OHLCVPanel":
+        """Build an in-memory panel, on the union of the frames' dates by default."""
+        if dates is None:
+            dates = pd.DatetimeIndex([], name="date")
+            for df in frames.values():
+                dates = dates.union(df.index)
+        shape = (len(dates), len(frames))
+        arrays = {field: np.full(shape, np.nan, dtype=dtype) for field in fields}
+        panel = cls(dates, list(frames), arrays)
+        for symbol, df in frames.items():
+            panel.write(symbol, df)
+        return panel
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._arrays)
+
+    @property
+    def shape(self):
+        """(dates, symbols)"""
+        return len(self.dates), len(self.symbols)
+
+    def values(self, field: str) -> np.ndarray:
+        """The (date × symbol) array of a field."""
+        array = self._arrays[field]
+        if self._columns is None:
+            return array
+        return array[:, self._columns]
+
+    def __getitem__(self, field: str) -> pd.DataFrame:
+        """A field as a (date × symbol) DataFrame, sharing the panel's memory."""
+        return pd.DataFrame(
+            self.values(field), index=self.dates, columns=self.symbols, copy=False
+        )
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.symbols
+
+    def select(
+        self,
+        start=None,
+        end=None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> "OHLCVPanel":
+        """Select the dates within [start, end] and/or a subset of symbols."""
+        first = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start))
+        last = (
+            len(self.dates)
+            if end is None
+            else self.dates.searchsorted(pd.Timestamp(end), side="right")
+        )
+        rows = slice(first, last)
+        arrays = {field: array[rows] for field, array in self._arrays.items()}
+        dates = self.dates[rows]
+
+        if symbols is None:
+            return OHLCVPanel(dates, self.symbols, arrays, self._columns)
+
+        symbols = list(symbols)
+        positions = self.symbols.get_indexer(symbols)
+        if (positions < 0).any():
+            missing = [s for s, p in zip(symbols, positions) if p < 0]
+            raise KeyError(f"Symbols not in panel: {missing}")
+        if self._columns is not None:
+            positions = self._columns[positions]
+
+        columns = _as_slice(positions)
+        if columns is None:
+            return OHLCVPanel(dates, symbols, arrays, positions)
+        arrays = {field: array[:, columns] for field, array in arrays.items()}
+        return OHLCVPanel(dates, symbols, arrays)
+
+    def symbol(self, symbol: str, dropna: bool = True) -> OHLCVData:
+        """The bars of one symbol, without the dates it has no bar on."""
+        position = self.symbols.get_loc(symbol)
+        if self._columns is not None:
+            position = self._columns[position]
+        df = pd.DataFrame(
+            {field: array[:, position] for field, array in self._arrays.items()},
+            index=self.dates,
+        )
+        if dropna:
+            df = df[df.notna().any(axis=1)]
+        return df  # type: ignore
+
+    def write(self, symbol: str, ohlcv: OHLCVData) -> None:
+        """Write a symbol's bars, aligned to the panel dates. Bars off the index are dropped."""
+        if self._columns is not None:
+            raise ValueError("Can't write to a gathered symbol subset")
+        position = self.symbols.get_loc(symbol)
+        rows = self.dates.get_indexer(ohlcv.index)
+        found = rows >= 0
+        rows = rows[found]
+        for field, array in self._arrays.items():
+            if field in ohlcv.columns:
+                array[rows, position] = ohlcv[field].to_numpy()[found]
+
+    def flush(self) -> None:
+        """Flush memory-mapped arrays to disk."""
+        for array in self._arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+
+
+class PanelStore:
+    """
+    On-disk panel: `dates.npy`, one (date × symbol) `<field>.npy` per field and
+    `meta.json` under `root`. Opened panels are memory-mapped, so a universe larger
+    than memory can be sliced and only the pages touched are read.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _meta_path(self) -> Path:
+        return self.root / "meta.json"
+
+    def exists(self) -> bool:
+        return self._meta_path().is_file()
+
+    def create(
+        self,
+        dates: pd.DatetimeIndex,
+        symbols: Sequence[str],
+        fields: Sequence[str] = PANEL_FIELDS,
+        dtype="float64",
+    ) -> OHLCVPanel:
+        """Create a NaN-filled store, replacing any existing one, and open it for writing."""
+        if not np.issubdtype(np.dtype(dtype), np.floating):
+            raise ValueError(f"Panel dtype must be a float type, got {dtype}")
+        symbols = list(dict.fromkeys(symbols))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._meta_path().unlink(missing_ok=True)
+
+        np.save(self.root / "dates.npy", dates.to_numpy(dtype="datetime64[ns]"))
+        for field in fields:
+            array = np.lib.format.open_memmap(
+                self.root / f"{field}.npy",
+                mode="w+",
+                dtype=dtype,
+                shape=(len(dates), len(symbols)),
+            )
+            array[:] = np.nan
+            array.flush()
+            del array
+        # Written last, so that an interrupted create leaves no store behind
+        meta = {
+            "fields": list(fields),
+            "symbols": symbols,
+            "dtype": np.dtype(dtype).str,
+        }
+        self._meta_path().write_text(json.dumps(meta))
+        return self.open(writable=True)
+
+    def open(self, writable: bool = False) -> OHLCVPanel:
+        if not self.exists():
+            raise FileNotFoundError(f"Panel store not found: {self.root}")
+        meta = json.loads(self._meta_path().read_text())
+        dates = pd.DatetimeIndex(np.load(self.root / "dates.npy"), name="date")
+        mode = "r+" if writable else "r"
+        arrays = {
+            field: np.load(self.root / f"{field}.npy", mmap_mode=mode)
+            for field in meta["fields"]
+        }
+        return OHLCVPanel(dates, meta["symbols"], arrays)
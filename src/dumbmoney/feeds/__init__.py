@@ -1,51 +1,74 @@
 from datetime import date
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Any, List, Union
+from typing import Iterable, Iterator, Optional, Any, List, Tuple, Union
 
+import os
 import pandas as pd
 
+from .async_feed import AsyncBaseFeed, ThreadedFeed
+from .async_feed_service import AsyncDataFeedService
+from .cache import FullHistoryCache, OHLCVCache, StockDetailsCache
 from .feed import AdjustType, BaseFeed
-from .feed_service import DataFeedService
+from .feed_service import DataFeedService, OHLCVResult
+from .panel import build_panel
+from .registry import FeedSpec, LazyFeed, register_feed, registered_feeds
+from .replay import RecordingFeed, ReplayFeed, ReplayProfile, replay_feeds
+from .routing import FeedRouter, HedgePolicy
+from .storage import (
+    export_ohlcv_to_feather,
+    export_ohlcv_to_npy,
+    export_ohlcv_to_parquet,
+    load_ohlcv_from_feather,
+    load_ohlcv_from_npy,
+    load_ohlcv_from_parquet,
+)
+from .universe import StockUniverse, UniverseMarket
+from .updater import UniverseUpdater, UpdateManifest, UpdateReport
 from ..core import OHLCVData, normalize_ohlcv, StockDetails
 
 
 @lru_cache(maxsize=1)
 def default_feed_service() -> DataFeedService:
-    from .akshare import AkshareFeed
-    from .tushare import TushareFeed
-    from .massive import MassiveFeed
-
-    feeds: List[BaseFeed] = [AkshareFeed()]
-
-    try:
-        tushare_feed = TushareFeed()
-        feeds.insert(0, tushare_feed)
-    except Exception:
-        pass
-
-    try:
-        massive_feed = MassiveFeed()
-        feeds.insert(0, massive_feed)
-    except Exception:
-        pass
-
-    try:
-        from .tiger import TigerFeed, TigerConfig
-        import os
-
-        tiger_config = TigerConfig(
-            private_key=os.getenv("TIGER_PRIVATE_KEY", ""),
-            tiger_id=os.getenv("TIGER_ID", ""),
-            account=os.getenv("TIGER_ACCOUNT", ""),
-            license=os.getenv("TIGER_LICENSE", ""),
-        )
-        tiger_feed = TigerFeed(config=tiger_config)
-        feeds.insert(0, tiger_feed)
-    except Exception:
-        pass
-
-    return DataFeedService(feeds=feeds)
+    """
+    Service over the registered feeds whose credentials are set, by priority.
+    Provider SDKs are only imported when a feed is first used.
+    """
+    feeds: List[BaseFeed] = [
+        LazyFeed(spec) for spec in registered_feeds() if spec.available()
+    ]
+
+    cache_dir = os.getenv("DUMBMONEY_CACHE_DIR")
+    cache = OHLCVCache(cache_dir) if cache_dir else None
+    details_cache = (
+        StockDetailsCache(Path(cache_dir) / "details") if cache_dir else None
+    )
+
+    return DataFeedService(
+        feeds=feeds,
+        cache=cache,
+        router=FeedRouter(adaptive=True),
+        details_cache=details_cache,
+    )
+
+
+@lru_cache(maxsize=1)
+def default_async_feed_service() -> AsyncDataFeedService:
+    """Async service over the same feeds and cache as `default_feed_service()`."""
+    service = default_feed_service()
+    return AsyncDataFeedService(
+        feeds=service.feeds,
+        cache=service.cache,
+        router=service.router,
+        details_cache=service.details_cache,
+        history_cache=service.history_cache,
+    )
+
+
+def _default_range(start: Optional[Any], end: Optional[Any]) -> Tuple[Any, Any]:
+    end_date: date = end or date.today()
+    start_date = start or date(end_date.year - 1, end_date.month, end_date.day)
+    return start_date, end_date
 
 
 def get_ohlcv(
@@ -54,9 +77,9 @@ def get_ohlcv(
     end: Optional[Any] = None,
     adjust: AdjustType = "forward",
     fields: Optional[List[str]] = None,
+    compact: bool = False,
 ) -> OHLCVData:
-    end_date: date = end or date.today()
-    start_date = start or date(end_date.year - 1, end_date.month, end_date.day)
+    start_date, end_date = _default_range(start, end)
     service = default_feed_service()
     return service.get_ohlcv(
         symbol=symbol,
@@ -64,6 +87,29 @@ def get_ohlcv(
         end=end_date,
         adjust=adjust,
         fields=fields,
+        compact=compact,
+    )
+
+
+def get_ohlcv_many(
+    symbols: Iterable[str],
+    start: Optional[Any] = None,
+    end: Optional[Any] = None,
+    adjust: AdjustType = "forward",
+    fields: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    compact: bool = False,
+) -> Iterator[OHLCVResult]:
+    start_date, end_date = _default_range(start, end)
+    service = default_feed_service()
+    return service.get_ohlcv_many(
+        symbols=symbols,
+        start=start_date,
+        end=end_date,
+        adjust=adjust,
+        fields=fields,
+        max_workers=max_workers,
+        compact=compact,
     )
 
 
@@ -90,3 +136,51 @@ def get_stock_details(
 ) -> Union[StockDetails, None]:
     service = default_feed_service()
     return service.get_stock_details(symbol=symbol)
+
+
+def get_universe(market: UniverseMarket, refresh: bool = False) -> StockUniverse:
+    service = default_feed_service()
+    return service.get_universe(market=market, refresh=refresh)
+
+
+__all__ = [
+    "AdjustType",
+    "BaseFeed",
+    "AsyncBaseFeed",
+    "ThreadedFeed",
+    "DataFeedService",
+    "AsyncDataFeedService",
+    "OHLCVResult",
+    "OHLCVCache",
+    "StockDetailsCache",
+    "FullHistoryCache",
+    "FeedRouter",
+    "HedgePolicy",
+    "StockUniverse",
+    "FeedSpec",
+    "LazyFeed",
+    "register_feed",
+    "registered_feeds",
+    "RecordingFeed",
+    "ReplayFeed",
+    "ReplayProfile",
+    "replay_feeds",
+    "default_feed_service",
+    "default_async_feed_service",
+    "get_ohlcv",
+    "get_ohlcv_many",
+    "get_stock_details",
+    "get_universe",
+    "build_panel",
+    "UniverseUpdater",
+    "UpdateManifest",
+    "UpdateReport",
+    "load_ohlcv_from_csv",
+    "export_ohlcv_to_csv",
+    "load_ohlcv_from_parquet",
+    "export_ohlcv_to_parquet",
+    "load_ohlcv_from_feather",
+    "export_ohlcv_to_feather",
+    "load_ohlcv_from_npy",
+    "export_ohlcv_to_npy",
+]
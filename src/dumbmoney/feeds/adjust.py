@@ -0,0 +1,63 @@
+from typing import Optional
+
+import pandas as pd
+
+from .feed import AdjustType
+from ..core import OHLCVData
+
+
+# Cache partition of the adjustment factors, next to the "none" bars
+FACTORS_PARTITION = "adj_factor"
+
+# Columns scaled by the adjustment factor, volume and turnover are left as is
+PRICE_COLS = ("open", "high", "low", "close", "pre_close", "vwap")
+
+
+def empty_factors() -> pd.DataFrame:
+    """Return an empty adjustment factor table."""
+    return pd.DataFrame(
+        {"adj_factor": pd.Series(dtype="float64")},
+        index=pd.DatetimeIndex([], name="date"),
+    )
+
+
+def adjust_ohlcv(
+    raw: OHLCVData,
+    factors: pd.DataFrame,
+    adjust: AdjustType,
+    latest: Optional[float] = None,
+) -> OHLCVData:
+    """
+    Compute adjusted bars from unadjusted bars and cumulative adjustment factors.
+
+    Backward adjusted prices are `raw * factor`, forward adjusted prices are
+    `raw * factor / latest`, `latest` being the most recent factor (the last one
+    in `factors` by default), so that the latest prices are left unchanged.
+
+    Args:
+      raw: Unadjusted bars.
+      factors: DataFrame indexed by date with an `adj_factor` column. Factors are
+        carried forward to the bars' dates; bars before the first factor use it.
+      adjust: Adjustment mode.
+      latest: Optional reference factor for forward adjustment.
+    """
+    if adjust == "none" or raw.empty:
+        return raw
+    if factors.empty:
+        raise ValueError("Adjustment factors are required to adjust prices.")
+
+    known = factors["adj_factor"].sort_index()
+    factor = (
+        known.reindex(raw.index, method="ffill")
+        .bfill()
+        .fillna(known.iloc[0])
+        .to_numpy()
+    )
+    if adjust == "forward":
+        factor = factor / (latest if latest is not None else known.iloc[-1])
+
+    df = raw.copy()
+    for col in PRICE_COLS:
+        if col in df.columns:
+            df[col] = df[col].to_numpy(dtype="float64") * factor
+    return df  # type: ignore
@@ -1,13 +1,13 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import List, Literal, Union, Optional
-
-import pandas as pd
+from typing import ClassVar, List, Literal, Optional, Tuple, Union
 
 from dumbmoney.core import StockDetails
 
 from .feed import AdjustType, BaseFeed, StockMarket
-from ..core import OHLCVData, normalize_ohlcv
+from .registry import AKSHARE_SPEC
+from .ingest import dates_from_strings, ohlcv_from_frame
+from ..core import OHLCVData, empty_ohlcv
 from ..logger import logger
 
 import akshare as ak
@@ -17,7 +17,9 @@ import akshare as ak
 class AkshareFeed(BaseFeed):
     """Data feed backed by Akshare."""
 
-    name: str = "Akshare"
+    name: str = AKSHARE_SPEC.name
+    max_concurrency: int = AKSHARE_SPEC.max_concurrency
+    calls_per_minute: Optional[float] = AKSHARE_SPEC.calls_per_minute
 
     rename_map = {
         "日期": "date",
@@ -28,6 +30,10 @@ class AkshareFeed(BaseFeed):
         "成交量": "volume",
     }
 
+    full_history_markets: ClassVar[Tuple[StockMarket, ...]] = (
+        AKSHARE_SPEC.full_history_markets
+    )
+
     adjust_map = {
         "none": "",
         "forward": "qfq",
@@ -36,7 +42,7 @@ class AkshareFeed(BaseFeed):
 
     @classmethod
     def markets(cls) -> Union[List[StockMarket], Literal["*"]]:
-        return "*"
+        return AKSHARE_SPEC.markets
 
     def get_ohlcv(
         self,
@@ -92,15 +98,26 @@ class AkshareFeed(BaseFeed):
                 adjust=self.adjust_map[adjust],
             )
 
-        df = df.rename(columns=self.rename_map)
-        df["date"] = pd.to_datetime(df["date"])
+        if df is None or df.empty:
+            return empty_ohlcv()
 
-        # filter df by date range
-        df = df[
-            (df["date"] >= pd.to_datetime(start)) & (df["date"] <= pd.to_datetime(end))
-        ]
+        date_col = next(
+            (col for col in df.columns if self.rename_map.get(col, col) == "date"),
+            None,
+        )
+        if date_col is None:
+            raise ValueError(
+                f"Akshare: no date column in the bars of {symbol}, got columns {list(df.columns)}"
+            )
 
-        return normalize_ohlcv(pd.DataFrame(df), fields=fields)
+        return ohlcv_from_frame(
+            df,
+            dates_from_strings(df[date_col]),
+            start,
+            end,
+            fields=fields,
+            rename=self.rename_map,
+        )
 
     def get_stock_details(self, symbol: str) -> Union[StockDetails, None]:
         # Not implemented yet
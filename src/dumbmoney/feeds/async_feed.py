@@ -0,0 +1,142 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import date
+from typing import ClassVar, List, Literal, Optional, Tuple, Union
+
+import asyncio
+import pandas as pd
+
+from .feed import AdjustType, BaseFeed, StockMarket
+from .throttle import RetryPolicy, is_retryable_error
+from .universe import UniverseMarket
+from ..core import OHLCVData, StockDetails
+
+
+@dataclass
+class AsyncBaseFeed(ABC):
+    """
+    Abstract base for data feeds with a native asyncio interface.
+    Mirrors `BaseFeed`, with coroutine methods.
+    """
+
+    name: str
+    max_concurrency: int = 4  # max number of requests in flight to this provider
+    calls_per_minute: Optional[float] = None  # provider quota, None for unlimited
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+
+    # Markets whose endpoint ignores start/end and returns the full history
+    full_history_markets: ClassVar[Tuple[StockMarket, ...]] = ()
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether a failed call is worth retrying (network errors, rate limits)."""
+        return is_retryable_error(error)
+
+    def markets(self) -> Union[List[StockMarket], Literal["*"]]:
+        """Return a list of supported markets."""
+        return "*"
+
+    @abstractmethod
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType = "forward",
+        fields: Optional[List[str]] = None,
+    ) -> OHLCVData:
+        """
+        Return a DataFrame indexed by datetime for a given symbol.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_stock_details(
+        self,
+        symbol: str,
+    ) -> Union[StockDetails, None]:
+        """
+        Return stock details for a given symbol.
+        """
+        raise NotImplementedError
+
+    async def get_universe(self, market: UniverseMarket) -> Optional[pd.DataFrame]:
+        """
+        Return all listings of a market in bulk requests, see `BaseFeed.get_universe`.
+        """
+        return None
+
+    async def get_adj_factors(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Return the cumulative adjustment factors of a symbol, see `BaseFeed.get_adj_factors`.
+        """
+        return None
+
+    @property
+    def provides_adj_factors(self) -> bool:
+        """Whether the feed implements `get_adj_factors`, see `BaseFeed.provides_adj_factors`."""
+        return type(self).get_adj_factors is not AsyncBaseFeed.get_adj_factors
+
+
+@dataclass(init=False)
+class ThreadedFeed(AsyncBaseFeed):
+    """
+    Async adapter for a blocking `BaseFeed`.
+    Provider SDK calls run in the default executor, off the event loop.
+    """
+
+    feed: BaseFeed
+
+    def __init__(self, feed: BaseFeed):
+        super().__init__(
+            name=feed.name,
+            max_concurrency=feed.max_concurrency,
+            calls_per_minute=feed.calls_per_minute,
+            retry=feed.retry,
+        )
+        self.feed = feed
+        self.full_history_markets = feed.full_history_markets  # type: ignore
+
+    def is_retryable(self, error: Exception) -> bool:
+        return self.feed.is_retryable(error)
+
+    def markets(self) -> Union[List[StockMarket], Literal["*"]]:
+        return self.feed.markets()
+
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType = "forward",
+        fields: Optional[List[str]] = None,
+    ) -> OHLCVData:
+        return await asyncio.to_thread(
+            self.feed.get_ohlcv,
+            symbol=symbol,
+            start=start,
+            end=end,
+            adjust=adjust,
+            fields=fields,
+        )
+
+    async def get_stock_details(self, symbol: str) -> Union[StockDetails, None]:
+        return await asyncio.to_thread(self.feed.get_stock_details, symbol=symbol)
+
+    async def get_universe(self, market: UniverseMarket) -> Optional[pd.DataFrame]:
+        return await asyncio.to_thread(self.feed.get_universe, market)
+
+    async def get_adj_factors(
+        self, symbol: str, start: date, end: date
+    ) -> Optional[pd.DataFrame]:
+        return await asyncio.to_thread(
+            self.feed.get_adj_factors, symbol=symbol, start=start, end=end
+        )
+
+    @property
+    def provides_adj_factors(self) -> bool:
+        return self.feed.provides_adj_factors
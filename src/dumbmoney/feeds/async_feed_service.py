@@ -0,0 +1,396 @@
+from datetime import date
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import asyncio
+import pandas as pd
+import time
+import weakref
+
+from .async_feed import AsyncBaseFeed, ThreadedFeed
+from .cache import (
+    FULL_HISTORY_START,
+    FullHistoryCache,
+    OHLCVCache,
+    StockDetailsCache,
+    slice_ohlcv,
+)
+from .feed import AdjustType, BaseFeed, StockMarket, infer_stock_market
+from .routing import FeedRouter
+from .singleflight import AsyncSingleFlight
+from .feed_service import (
+    OHLCVResult,
+    _Attempts,
+    _FeedServiceBase,
+    _Plan,
+    _advance,
+    _normalize_date,
+)
+from .throttle import get_rate_limiter
+from .universe import StockUniverse, UniverseMarket
+from ..core import OHLCVData, StockDetails, compact_ohlcv
+from ..logger import logger
+
+
+async def _run_plan_async(
+    plan: _Plan, fetchers: Mapping[str, Callable[[date, date], Awaitable[Any]]]
+) -> Any:
+    """
+    Asyncio counterpart of `_run_plan`: requests are awaited, and the plan itself
+    runs in a thread since it reads and writes the cache.
+    """
+    done, step = await asyncio.to_thread(_advance, plan)
+    while not done:
+        kind, start, end = step
+        try:
+            fetched = await fetchers[kind](start, end)
+        except Exception as e:
+            done, step = await asyncio.to_thread(_advance, plan, None, e)
+        else:
+            done, step = await asyncio.to_thread(_advance, plan, fetched)
+    return step
+
+
+class AsyncDataFeedService(_FeedServiceBase):
+    """Asyncio counterpart of `DataFeedService`, for use on a single event loop."""
+
+    def __init__(
+        self,
+        feeds: Sequence[Union[AsyncBaseFeed, BaseFeed]],
+        cache: Optional[OHLCVCache] = None,
+        router: Optional[FeedRouter] = None,
+        details_cache: Optional[StockDetailsCache] = None,
+        history_cache: Optional[FullHistoryCache] = None,
+        local_adjust: bool = False,
+        drift_check_bars: int = 5,
+        drift_tolerance: float = 1e-3,
+        coalesce: bool = True,
+    ) -> None:
+        if not feeds:
+            raise ValueError("At least one provider must be provided.")
+        super().__init__(
+            cache,
+            router,
+            details_cache,
+            history_cache,
+            local_adjust,
+            drift_check_bars,
+            drift_tolerance,
+        )
+        # Blocking feeds are moved off the event loop
+        self.feeds: List[AsyncBaseFeed] = [
+            feed if isinstance(feed, AsyncBaseFeed) else ThreadedFeed(feed)
+            for feed in feeds
+        ]
+        self._history_flights = AsyncSingleFlight()
+        # Concurrent requests covered by a fetch in flight share its result
+        self.flights: Optional[AsyncSingleFlight] = (
+            AsyncSingleFlight() if coalesce else None
+        )
+        # asyncio primitives are bound to a loop, so keep one set of slots per loop
+        self._slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _slot(self, feed: AsyncBaseFeed) -> asyncio.Semaphore:
+        slots: Dict[str, asyncio.Semaphore] = self._slots.setdefault(
+            asyncio.get_running_loop(), {}
+        )
+        if feed.name not in slots:
+            slots[feed.name] = asyncio.Semaphore(feed.max_concurrency)
+        return slots[feed.name]
+
+    async def _call(
+        self,
+        feed: AsyncBaseFeed,
+        fn: Callable[..., Awaitable[Any]],
+        market: Optional[StockMarket] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Await a feed method within the feed's concurrency cap and rate limit,
+        retrying retryable errors with jittered exponential backoff.
+        Outcomes are reported to the router when `market` is given, once per
+        call rather than per attempt.
+        """
+        if market is not None and not self.router.acquire(feed.name, market):
+            raise RuntimeError(f"trial call to half-open feed {feed.name} in flight")
+        limiter = get_rate_limiter(feed.name, feed.calls_per_minute)
+        attempt = 0
+        while True:
+            async with self._slot(feed):
+                if limiter is not None:
+                    await limiter.acquire_async()
+                started = time.perf_counter()
+                try:
+                    result = await fn(**kwargs)
+                except Exception as e:
+                    if attempt + 1 >= feed.retry.max_attempts or not feed.is_retryable(
+                        e
+                    ):
+                        if market is not None:
+                            self.router.record(feed.name, market, None, ok=False)
+                        raise
+                    error = e
+                else:
+                    if market is not None:
+                        self.router.record(
+                            feed.name, market, time.perf_counter() - started, ok=True
+                        )
+                    return result
+            delay = feed.retry.delay(attempt)
+            attempt += 1
+            logger.debug(
+                f"Feed {feed.name} failed ({error}), retrying in {delay:.2f}s (attempt {attempt + 1})"
+            )
+            await asyncio.sleep(delay)
+
+    async def _call_get_ohlcv(
+        self,
+        feed: AsyncBaseFeed,
+        market: StockMarket,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType,
+        fields: Optional[List[str]],
+    ) -> OHLCVData:
+        """Fetch bars from one feed, see `DataFeedService._call_get_ohlcv`."""
+        if market not in feed.full_history_markets:
+            return await self._call(
+                feed,
+                feed.get_ohlcv,
+                market=market,
+                symbol=symbol,
+                start=start,
+                end=end,
+                adjust=adjust,
+                fields=fields,
+            )
+
+        key = FullHistoryCache.key(feed.name, symbol, adjust)
+
+        async def fetch() -> OHLCVData:
+            history = self.history_cache.get(key)
+            if history is None:
+                history = await self._call(
+                    feed,
+                    feed.get_ohlcv,
+                    market=market,
+                    symbol=symbol,
+                    start=FULL_HISTORY_START,
+                    end=date.today(),
+                    adjust=adjust,
+                    fields=None,
+                )
+                self.history_cache.put(key, history)
+            return history
+
+        history = self.history_cache.get(key)
+        if history is None:
+            # Concurrent callers missing the cache share one download
+            history = await self._history_flights.do(
+                key, FULL_HISTORY_START, date.today(), fetch
+            )
+        return FullHistoryCache.slice(history, start, end, fields)
+
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        start,
+        end,
+        adjust: AdjustType = "forward",
+        fields: Optional[List[str]] = None,
+        compact: bool = False,
+    ) -> OHLCVData:
+        if compact:
+            return compact_ohlcv(
+                await self.get_ohlcv(symbol, start, end, adjust, fields)
+            )
+
+        start_date = _normalize_date(start)
+        end_date = _normalize_date(end)
+
+        if self.local_adjust and adjust != "none":
+            adjusted = await _run_plan_async(
+                self._local_adjust_plan(symbol, start_date, end_date, adjust),
+                {
+                    "factors": lambda s, e: self.get_adj_factors(symbol, s, e),
+                    "bars": lambda s, e: self.get_ohlcv(symbol, s, e, "none", fields),
+                },
+            )
+            if adjusted is not None:
+                return adjusted
+
+        if self.cache is None:
+            return await self._fetch_ohlcv(symbol, start_date, end_date, adjust, fields)
+
+        return await _run_plan_async(
+            self._ohlcv_plan(symbol, adjust, start_date, end_date, fields),
+            {"bars": lambda s, e: self._fetch_ohlcv(symbol, s, e, adjust, None)},
+        )
+
+    async def get_adj_factors(self, symbol: str, start, end) -> Optional[pd.DataFrame]:
+        """Return the cumulative adjustment factors of a symbol, see `DataFeedService.get_adj_factors`."""
+        start_date = _normalize_date(start)
+        end_date = _normalize_date(end)
+
+        if self.cache is None:
+            return await self._fetch_adj_factors(symbol, start_date, end_date)
+
+        return await _run_plan_async(
+            self._adj_factors_plan(symbol, start_date, end_date),
+            {"factors": lambda s, e: self._fetch_adj_factors(symbol, s, e)},
+        )
+
+    async def _fetch_adj_factors(
+        self, symbol: str, start: date, end: date
+    ) -> Optional[pd.DataFrame]:
+        _, market = infer_stock_market(symbol)
+        attempts = _Attempts("get_adj_factors", symbol, start, end)
+
+        for feed in self.router.order(self.feeds, market):
+            if not feed.provides_adj_factors:
+                continue
+            try:
+                factors = await self._call(
+                    feed, feed.get_adj_factors, symbol=symbol, start=start, end=end
+                )
+            except Exception as e:
+                attempts.failed(feed, e)
+                continue
+            if factors is not None:
+                return factors
+
+        if attempts.errors:
+            raise attempts.error()
+        return None
+
+    async def _fetch_ohlcv(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType,
+        fields: Optional[List[str]],
+    ) -> OHLCVData:
+        if self.flights is None:
+            return await self._fetch_ohlcv_from_feeds(
+                symbol, start, end, adjust, fields
+            )
+        # Fetch all fields, so that the result can be shared with any request
+        df = await self.flights.do(
+            (OHLCVCache.key(symbol), adjust),
+            start,
+            end,
+            lambda: self._fetch_ohlcv_from_feeds(symbol, start, end, adjust, None),
+        )
+        return slice_ohlcv(df, start, end, fields)
+
+    async def _fetch_ohlcv_from_feeds(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType,
+        fields: Optional[List[str]],
+    ) -> OHLCVData:
+        _, market = infer_stock_market(symbol)
+        attempts = _Attempts("get_ohlcv", symbol, start, end)
+
+        for feed in self.router.order(self.feeds, market):
+            try:
+                df = await self._call_get_ohlcv(
+                    feed, market, symbol, start, end, adjust, fields
+                )
+            except Exception as e:
+                attempts.failed(feed, e)
+                continue
+            if attempts.answered(feed, df):
+                return df
+
+        return attempts.result()
+
+    async def get_ohlcv_many(
+        self,
+        symbols: Iterable[str],
+        start,
+        end,
+        adjust: AdjustType = "forward",
+        fields: Optional[List[str]] = None,
+        compact: bool = False,
+    ) -> AsyncIterator[OHLCVResult]:
+        """
+        Fetch many symbols concurrently on the running loop.
+
+        Results are yielded as each symbol finishes. A failing symbol yields a result
+        carrying its error instead of aborting the whole batch.
+        """
+
+        async def fetch(symbol: str) -> OHLCVResult:
+            try:
+                df = await self.get_ohlcv(
+                    symbol=symbol,
+                    start=start,
+                    end=end,
+                    adjust=adjust,
+                    fields=fields,
+                    compact=compact,
+                )
+                return OHLCVResult(symbol=symbol, data=df)
+            except Exception as e:
+                return OHLCVResult(symbol=symbol, error=e)
+
+        tasks = [asyncio.ensure_future(fetch(symbol)) for symbol in symbols]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_stock_details(
+        self,
+        symbol: str,
+    ) -> Union[StockDetails, None]:
+        known = await asyncio.to_thread(self._known_details, symbol)
+        if known is not None:
+            return known
+
+        async def fetch(feed: AsyncBaseFeed) -> Union[StockDetails, None]:
+            return await self._call(feed, feed.get_stock_details, symbol=symbol)
+
+        # Query all feeds at once, then merge in priority order
+        results = await asyncio.gather(
+            *(fetch(feed) for feed in self.feeds), return_exceptions=True
+        )
+        return await asyncio.to_thread(self._merge_details, symbol, results)
+
+    async def get_universe(
+        self,
+        market: UniverseMarket,
+        refresh: bool = False,
+    ) -> StockUniverse:
+        """Return all listings of a market, see `DataFeedService.get_universe`."""
+        if not refresh:
+            universe = await asyncio.to_thread(self._known_universe, market)
+            if universe is not None:
+                return universe
+
+        async def fetch(feed: AsyncBaseFeed) -> Optional[pd.DataFrame]:
+            return await self._call(feed, lambda: feed.get_universe(market))
+
+        results = await asyncio.gather(
+            *(fetch(feed) for feed in self.feeds), return_exceptions=True
+        )
+
+        return await asyncio.to_thread(self._merge_universe, market, results)
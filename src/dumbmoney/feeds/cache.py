@@ -0,0 +1,420 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from threading import Lock, get_ident
+from typing import Callable, Dict, List, Literal, Optional, Tuple, Union
+
+import io
+import json
+import os
+import time
+
+import pandas as pd
+
+from .feed import AdjustType, infer_stock_market, last_final_date
+from .universe import StockUniverse, UniverseMarket
+from ..core import OHLCVData, StockDetails
+from ..core.data import _REQUIRED_COLS
+from ..logger import logger
+
+
+CacheFormat = Literal["parquet", "feather"]
+
+DateRange = Tuple[date, date]
+
+
+def _merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """Merge overlapping or adjacent date ranges."""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _has_weekday(start: date, end: date) -> bool:
+    """Check if a date range contains at least one weekday (potential trading day)."""
+    if (end - start).days >= 2:
+        return True
+    d = start
+    while d <= end:
+        if d.weekday() < 5:
+            return True
+        d += timedelta(days=1)
+    return False
+
+
+def _tmp_path(path: Path) -> Path:
+    """Temporary file to write `path` atomically, unique to the writing process and thread."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{get_ident()}.tmp")
+
+
+def _write_text(path: Path, text: str) -> None:
+    """Write a file atomically, readers never see it partially written."""
+    tmp = _tmp_path(path)
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def select_fields(df: pd.DataFrame, fields: Optional[List[str]] = None) -> OHLCVData:
+    """
+    Select the required OHLCV columns plus the optional fields, following the same rules as `normalize_ohlcv`.
+    """
+    if fields is None:
+        return df  # type: ignore
+    cols = [col for col in df.columns if col in _REQUIRED_COLS or col in fields]
+    if len(cols) == len(df.columns):
+        return df  # type: ignore
+    return df[cols]  # type: ignore
+
+
+def slice_ohlcv(
+    data: OHLCVData,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    fields: Optional[List[str]] = None,
+    copy: bool = True,
+) -> OHLCVData:
+    """
+    Slice bars sorted by date to [start, end].
+
+    The result is a copy, so that callers of data shared with others (a cached
+    history, the result of a coalesced fetch) can modify it; `copy=False` returns
+    a view for data held by the caller only.
+    """
+    lo = data.index.searchsorted(pd.Timestamp(start)) if start else 0
+    hi = data.index.searchsorted(pd.Timestamp(end), side="right") if end else len(data)
+    df = select_fields(
+        data if lo == 0 and hi == len(data) else data.iloc[lo:hi], fields
+    )
+    return df.copy() if copy else df  # type: ignore
+
+
+@dataclass
+class OHLCVCache:
+    """
+    Local on-disk OHLCV store, partitioned by adjust type and symbol.
+
+    Bars are stored in a columnar file per partition (`<root>/<adjust>/<symbol>.parquet`),
+    next to a small JSON sidecar recording the date ranges that have been fetched,
+    so that gaps without trading days are not fetched again.
+
+    Requires `pyarrow` (`pip install "dumbmoney[cache]"`).
+    """
+
+    root: Union[str, Path]
+    fmt: CacheFormat = "parquet"
+
+    _locks: Dict[str, Lock] = field(init=False, default_factory=dict, repr=False)
+    _locks_guard: Lock = field(init=False, default_factory=Lock, repr=False)
+
+    def __post_init__(self):
+        if self.fmt not in ("parquet", "feather"):
+            raise ValueError(f"Unsupported cache format: {self.fmt}")
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                'OHLCVCache requires pyarrow. Install it with `pip install "dumbmoney[cache]"`.'
+            ) from e
+        self.root = Path(self.root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(symbol: str) -> str:
+        """Normalized partition key of a symbol, e.g. "600519" -> "600519_SH"."""
+        code, market = infer_stock_market(symbol)
+        return f"{code}_{market.value}"
+
+    def _lock(self, partition: str) -> Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(partition, Lock())
+
+    def _paths(self, symbol: str, adjust: str) -> Tuple[Path, Path]:
+        base = Path(self.root) / adjust / self.key(symbol)
+        return base.with_suffix(f".{self.fmt}"), base.with_suffix(".json")
+
+    def _read_frame(self, path: Path) -> Optional[pd.DataFrame]:
+        if not path.is_file():
+            return None
+        if self.fmt == "parquet":
+            return pd.read_parquet(path)
+        return pd.read_feather(path).set_index("date")
+
+    def _write_frame(self, df: pd.DataFrame, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _tmp_path(path)
+        if self.fmt == "parquet":
+            df.to_parquet(tmp, index=True)
+        else:
+            df.reset_index().to_feather(tmp)
+        os.replace(tmp, path)
+
+    def covered(self, symbol: str, adjust: AdjustType) -> List[DateRange]:
+        """Return the date ranges of a partition that have already been fetched."""
+        _, meta_path = self._paths(symbol, adjust)
+        if not meta_path.is_file():
+            return []
+        meta = json.loads(meta_path.read_text())
+        return [
+            (date.fromisoformat(start), date.fromisoformat(end))
+            for start, end in meta.get("ranges", [])
+        ]
+
+    def missing_ranges(
+        self,
+        symbol: str,
+        adjust: AdjustType,
+        start: date,
+        end: date,
+    ) -> List[DateRange]:
+        """
+        Return the sub-ranges of [start, end] that are not in the cache yet.
+        Gaps without any weekday are skipped since they can't contain trading days.
+        """
+        gaps: List[DateRange] = []
+        cursor = start
+        for c_start, c_end in self.covered(symbol, adjust):
+            if c_end < cursor:
+                continue
+            if c_start > end:
+                break
+            if c_start > cursor:
+                gaps.append((cursor, c_start - timedelta(days=1)))
+            cursor = max(cursor, c_end + timedelta(days=1))
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return [(s, e) for s, e in gaps if _has_weekday(s, e)]
+
+    def load(
+        self,
+        symbol: str,
+        adjust: AdjustType,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Optional[OHLCVData]:
+        """
+        Load cached bars of a symbol within [start, end], or None if nothing is cached.
+        """
+        data_path, _ = self._paths(symbol, adjust)
+        df = self._read_frame(data_path)
+        if df is None:
+            return None
+        return slice_ohlcv(df, start, end, fields, copy=False)  # type: ignore
+
+    def load_edges(
+        self,
+        symbol: str,
+        adjust: AdjustType,
+        start: date,
+        end: date,
+        n: int,
+    ) -> Optional[OHLCVData]:
+        """Load the `n` cached bars of a symbol just before `start` and the `n` just after `end`."""
+        data_path, _ = self._paths(symbol, adjust)
+        df = self._read_frame(data_path)
+        if df is None:
+            return None
+        lo = df.index.searchsorted(pd.Timestamp(start))
+        hi = df.index.searchsorted(pd.Timestamp(end), side="right")
+        return pd.concat([df.iloc[max(0, lo - n) : lo], df.iloc[hi : hi + n]])  # type: ignore
+
+    def store(
+        self,
+        symbol: str,
+        adjust: AdjustType,
+        data: OHLCVData,
+        start: date,
+        end: date,
+    ) -> None:
+        """
+        Merge freshly fetched bars into the cache and mark [start, end] as fetched.
+        Ranges reaching the exchange's current day or later are only marked up to the
+        day before (see `last_final_date`), since the current day's bar may not be final.
+        """
+        data_path, meta_path = self._paths(symbol, adjust)
+        with self._lock(f"{adjust}/{self.key(symbol)}"):
+            existing = self._read_frame(data_path)
+            if existing is not None and not existing.empty:
+                merged = pd.concat([existing, data]) if not data.empty else existing
+                merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            else:
+                merged = data
+            if existing is None or not data.empty:
+                self._write_frame(merged, data_path)
+
+            ranges = self.covered(symbol, adjust)
+            end = min(end, last_final_date(infer_stock_market(symbol)[1]))
+            if start <= end:
+                ranges.append((start, end))
+            meta = {
+                "ranges": [
+                    [s.isoformat(), e.isoformat()] for s, e in _merge_ranges(ranges)
+                ]
+            }
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_text(meta_path, json.dumps(meta))
+
+        logger.debug(
+            f"OHLCVCache: stored {len(data)} bars of {symbol} ({adjust}) for {start} → {end}"
+        )
+
+    def invalidate(self, symbol: str, adjust: Optional[AdjustType] = None) -> None:
+        """Drop the cached bars of a symbol, for one adjust type or all of them."""
+        adjusts = [adjust] if adjust else ["none", "forward", "backward"]
+        for adj in adjusts:
+            data_path, meta_path = self._paths(symbol, adj)
+            with self._lock(f"{adj}/{self.key(symbol)}"):
+                for path in (data_path, meta_path):
+                    if path.is_file():
+                        path.unlink()
+
+
+# Earliest date requested when downloading a full history
+FULL_HISTORY_START = date(1990, 1, 1)
+
+HistoryKey = Tuple[str, str, str]  # (feed name, partition key, adjust)
+
+
+class FullHistoryCache:
+    """
+    In-memory LRU cache of full price histories, for provider endpoints that
+    ignore the requested date range and always return the whole listing history.
+    Sub-range requests are answered by copies sliced from the cached series, which
+    is never handed out itself.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 900.0,  # seconds, the last bar may change during the session
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[HistoryKey, Tuple[float, OHLCVData]]" = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+        self._fetch_locks: Dict[HistoryKey, Lock] = {}
+
+    @staticmethod
+    def key(feed_name: str, symbol: str, adjust: AdjustType) -> HistoryKey:
+        return (feed_name, OHLCVCache.key(symbol), adjust)
+
+    def get(self, key: HistoryKey) -> Optional[OHLCVData]:
+        """Return a cached full history, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            fetched_at, data = entry
+            if self._clock() - fetched_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: HistoryKey, data: OHLCVData) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(
+        self, key: HistoryKey, fetch: Callable[[], OHLCVData]
+    ) -> OHLCVData:
+        """Return a cached full history, fetching it once if concurrent callers miss."""
+        data = self.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(key, Lock())
+        with fetch_lock:
+            data = self.get(key)
+            if data is None:
+                data = fetch()
+                self.put(key, data)
+            return data
+
+    @staticmethod
+    def slice(
+        data: OHLCVData,
+        start: date,
+        end: date,
+        fields: Optional[List[str]] = None,
+    ) -> OHLCVData:
+        """Copy of a history sorted by date, sliced to [start, end]."""
+        return slice_ohlcv(data, start, end, fields)
+
+
+@dataclass
+class StockDetailsCache:
+    """
+    Persistent cache of StockDetails with a time-to-live, one JSON file per symbol
+    (`<root>/<symbol>.json`), keyed by the normalized symbol.
+    Universe tables are kept next to them (`<root>/universe_<market>.json`).
+    """
+
+    root: Union[str, Path]
+    ttl: timedelta = timedelta(days=7)
+
+    def __post_init__(self):
+        self.root = Path(self.root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, symbol: str) -> Path:
+        return Path(self.root) / f"{OHLCVCache.key(symbol)}.json"
+
+    def _read(self, path: Path) -> Optional[dict]:
+        if not path.is_file():
+            return None
+        try:
+            entry = json.loads(path.read_text())
+            fetched_at = datetime.fromisoformat(entry["fetched_at"])
+        except Exception as e:
+            logger.warning(f"StockDetailsCache: ignoring unreadable entry {path}: {e}")
+            return None
+        if datetime.now() - fetched_at > self.ttl:
+            return None
+        return entry
+
+    def _write(self, path: Path, entry: dict) -> None:
+        entry = {"fetched_at": datetime.now().isoformat(), **entry}
+        _write_text(path, json.dumps(entry, ensure_ascii=False))
+
+    def get(self, symbol: str) -> Optional[StockDetails]:
+        """Return the cached details of a symbol, or None if missing or expired."""
+        entry = self._read(self._path(symbol))
+        if entry is None:
+            return None
+        return StockDetails.model_validate(entry["details"])
+
+    def put(self, symbol: str, details: StockDetails) -> None:
+        self._write(self._path(symbol), {"details": details.model_dump(mode="json")})
+
+    def get_universe(self, market: UniverseMarket) -> Optional[StockUniverse]:
+        """Return the cached universe of a market, or None if missing or expired."""
+        entry = self._read(Path(self.root) / f"universe_{market}.json")
+        if entry is None:
+            return None
+        table = pd.read_json(io.StringIO(entry["table"]), orient="table")
+        return StockUniverse(market, table)
+
+    def put_universe(self, universe: StockUniverse) -> None:
+        self._write(
+            Path(self.root) / f"universe_{universe.market}.json",
+            {"table": universe.table.to_json(orient="table", date_format="iso")},
+        )
+
+    def invalidate(self, symbol: str) -> None:
+        path = self._path(symbol)
+        if path.is_file():
+            path.unlink()
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from datetime import date
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import List, Literal, Optional, Tuple, Union
+from typing import ClassVar, List, Literal, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
 
+import pandas as pd
 import re
 
+from .throttle import RetryPolicy, is_retryable_error
 from ..core import OHLCVData, StockDetails
 
 
@@ -23,6 +26,35 @@ class StockMarket(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
+# Exchange time zones, the host's local time is used for unknown markets
+MARKET_TIMEZONES = {
+    StockMarket.SZ: "Asia/Shanghai",
+    StockMarket.SH: "Asia/Shanghai",
+    StockMarket.KCB: "Asia/Shanghai",
+    StockMarket.ETF_SZ: "Asia/Shanghai",
+    StockMarket.ETF_SH: "Asia/Shanghai",
+    StockMarket.HK: "Asia/Hong_Kong",
+    StockMarket.US: "America/New_York",
+}
+
+
+def last_final_date(market: StockMarket, now: Optional[datetime] = None) -> date:
+    """
+    Date of the latest final daily bar of a market: the day before the current date
+    at the exchange, since the current day's bar may still change.
+
+    Args:
+      market: The market, dated in its exchange's time zone.
+      now: Optional current time, naive times being the host's local time.
+    """
+    tz = MARKET_TIMEZONES.get(market)
+    if now is None:
+        now = datetime.now(ZoneInfo(tz)) if tz else datetime.now()
+    elif tz:
+        now = now.astimezone(ZoneInfo(tz))
+    return now.date() - timedelta(days=1)
+
+
 def infer_stock_market(symbol: str) -> Tuple[str, StockMarket]:
     """
     Helper function to infer market from symbol.
@@ -73,6 +105,16 @@ class BaseFeed(ABC):
     """
 
     name: str
+    max_concurrency: int = 4  # max number of requests in flight to this provider
+    calls_per_minute: Optional[float] = None  # provider quota, None for unlimited
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+
+    # Markets whose endpoint ignores start/end and returns the full history
+    full_history_markets: ClassVar[Tuple[StockMarket, ...]] = ()
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether a failed call is worth retrying (network errors, rate limits)."""
+        return is_retryable_error(error)
 
     @classmethod
     @abstractmethod
@@ -126,3 +168,29 @@ class BaseFeed(ABC):
         Return stock details for a given symbol.
         """
         raise NotImplementedError
+
+    def get_universe(self, market: Literal["CN", "HK", "US"]) -> Optional[pd.DataFrame]:
+        """
+        Return all listings of a market ("CN", "HK" or "US") in bulk requests,
+        as a DataFrame with a `symbol` column and any of the universe columns
+        (see `dumbmoney.feeds.universe`). None if the feed can't list the market.
+        """
+        return None
+
+    def get_adj_factors(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Return the cumulative adjustment factors of a symbol, as a DataFrame indexed
+        by date with an `adj_factor` column, so that backward adjusted prices are
+        `raw * adj_factor`. None if the feed doesn't provide factors for the symbol.
+        """
+        return None
+
+    @property
+    def provides_adj_factors(self) -> bool:
+        """Whether the feed implements `get_adj_factors`, so that services skip it otherwise."""
+        return type(self).get_adj_factors is not BaseFeed.get_adj_factors
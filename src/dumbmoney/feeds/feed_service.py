@@ -1,8 +1,47 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import dataclass
 from datetime import date, datetime
-from typing import List, Sequence, Optional, Union
+from threading import BoundedSemaphore, Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from .feed import AdjustType, BaseFeed
-from ..core import OHLCVData, StockDetails
+import numpy as np
+import pandas as pd
+import time
+
+from .adjust import FACTORS_PARTITION, adjust_ohlcv
+from .cache import (
+    FULL_HISTORY_START,
+    FullHistoryCache,
+    OHLCVCache,
+    StockDetailsCache,
+    select_fields,
+    slice_ohlcv,
+)
+from .feed import AdjustType, BaseFeed, StockMarket, infer_stock_market
+from .routing import FeedRouter, HedgePolicy, HedgeStats
+from .singleflight import SingleFlight
+from .throttle import get_rate_limiter
+from .universe import StockUniverse, UniverseMarket, empty_universe, universe_market
+from ..core import OHLCVData, StockDetails, compact_ohlcv
 from ..logger import logger
 
 
@@ -16,13 +55,492 @@ def _normalize_date(d) -> date:
     raise ValueError(f"Invalid date type: {type(d)}")
 
 
-class DataFeedService:
+def _drift_window(
+    cache: OHLCVCache,
+    symbol: str,
+    adjust: AdjustType,
+    gap_start: date,
+    gap_end: date,
+    bars: int,
+) -> Tuple[date, date, Optional[OHLCVData]]:
+    """
+    Range to fetch for a gap in the cache, and the cached bars it re-fetches.
+
+    Forward adjusted prices change retroactively on corporate actions, so up to
+    `bars` cached bars on each side of the gap are fetched again to check them.
+    """
+    if adjust != "forward" or bars <= 0:
+        return gap_start, gap_end, None
+    overlap = cache.load_edges(symbol, adjust, gap_start, gap_end, bars)
+    if overlap is None or overlap.empty:
+        return gap_start, gap_end, None
+    return (
+        min(gap_start, overlap.index[0].date()),
+        max(gap_end, overlap.index[-1].date()),
+        overlap,
+    )
+
+
+def _adjustment_drifted(
+    stored: OHLCVData, fetched: OHLCVData, tolerance: float
+) -> bool:
+    """Compare the closes of the bars present in both series."""
+    common = stored.index.intersection(fetched.index)
+    if common.empty:
+        return False
+    return not np.allclose(
+        stored.loc[common, "close"].to_numpy(dtype="float64"),
+        fetched.loc[common, "close"].to_numpy(dtype="float64"),
+        rtol=tolerance,
+        atol=0.0,
+    )
+
+
+def _history_span(
+    cache: OHLCVCache, symbol: str, adjust: AdjustType, start: date, end: date
+) -> Tuple[date, date]:
+    """Span covering both the requested range and the cached ranges of a symbol."""
+    covered = cache.covered(symbol, adjust)
+    return (
+        min([start] + [s for s, _ in covered]),
+        max([end] + [e for _, e in covered]),
+    )
+
+
+# A plan yields (kind, start, end) requests to the feeds and is sent their results
+_Plan = Generator[Tuple[str, date, date], Any, Any]
+
+
+def _advance(
+    plan: _Plan, fetched: Any = None, error: Optional[Exception] = None
+) -> Tuple[bool, Any]:
+    """
+    Resume a plan with the result of its last request (or the error it raised).
+    Returns (False, next request), or (True, result) once the plan is done.
+    """
+    try:
+        if error is not None:
+            return False, plan.throw(error)
+        return False, plan.send(fetched)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+def _run_plan(plan: _Plan, fetchers: Mapping[str, Callable[[date, date], Any]]) -> Any:
+    """Run a plan, serving each of its requests with `fetchers[kind](start, end)`."""
+    done, step = _advance(plan)
+    while not done:
+        kind, start, end = step
+        try:
+            fetched = fetchers[kind](start, end)
+        except Exception as e:
+            done, step = _advance(plan, error=e)
+        else:
+            done, step = _advance(plan, fetched)
+    return step
+
+
+def _results(futures: Sequence[Future]) -> List[Any]:
+    """Wait for every future: its result, or the error it raised."""
+    results: List[Any] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+class _Attempts:
+    """Answers of the feeds tried in turn for one request."""
+
+    def __init__(self, call: str, symbol: str, start: date, end: date) -> None:
+        self.call = call
+        self.symbol = symbol
+        self.start = start
+        self.end = end
+        self.errors: List[str] = []
+        self.empty: Optional[OHLCVData] = None
+
+    def failed(self, feed: Any, error: BaseException) -> None:
+        self.errors.append(f"Feed {feed.name} failed: {error}")
+
+    def answered(self, feed: Any, df: OHLCVData) -> bool:
+        """Whether the answer of a feed is the result, otherwise keep trying."""
+        if not df.empty:
+            return True
+        # Keep trying: another feed may have data for this range
+        self.empty = df
+        self.errors.append(f"Feed {feed.name} returned no data")
+        return False
+
+    def error(self) -> RuntimeError:
+        return RuntimeError(
+            f"{self.call}: all feeds failed for symbol: {self.symbol} "
+            f"({self.start} → {self.end}): {'; '.join(self.errors) or 'no feed supports this market'}"
+        )
+
+    def result(self) -> OHLCVData:
+        """No feed had bars: an empty answer if any, otherwise raise every error."""
+        if self.empty is None:
+            raise self.error()
+        logger.debug(
+            f"{self.call}: no data for symbol: {self.symbol} ({self.start} → {self.end}): {'; '.join(self.errors)}"
+        )
+        return self.empty
+
+
+@dataclass
+class OHLCVResult:
+    """Outcome of fetching one symbol in a multi-symbol request."""
+
+    symbol: str
+    data: Optional[OHLCVData] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _FeedServiceBase:
+    """
+    State and logic shared by `DataFeedService` and `AsyncDataFeedService`, apart
+    from calling the feeds: the cache plans, merging the feeds' answers and the
+    universes kept for stock details. The services only differ in their I/O.
+    """
+
+    feeds: Sequence[Any]
+
+    def __init__(
+        self,
+        cache: Optional[OHLCVCache],
+        router: Optional[FeedRouter],
+        details_cache: Optional[StockDetailsCache],
+        history_cache: Optional[FullHistoryCache],
+        local_adjust: bool,
+        drift_check_bars: int,
+        drift_tolerance: float,
+    ) -> None:
+        self.cache = cache
+        self.details_cache = details_cache
+        # Full histories of endpoints that can't filter by date, see `BaseFeed.full_history_markets`
+        self.history_cache = history_cache or FullHistoryCache()
+        # Compute adjusted bars from "none" bars and adjustment factors
+        self.local_adjust = local_adjust
+        # Cached forward adjusted bars re-fetched to detect a new corporate action
+        self.drift_check_bars = drift_check_bars
+        self.drift_tolerance = drift_tolerance
+        # Universes loaded by `get_universe`, serving stock details lookups
+        self._universes: Dict[str, StockUniverse] = {}
+        # Keeps the priority order by default, but skips feeds with an open circuit breaker
+        self.router = router or FeedRouter(adaptive=False)
+
+    def _ohlcv_plan(
+        self,
+        symbol: str,
+        adjust: AdjustType,
+        start: date,
+        end: date,
+        fields: Optional[List[str]],
+    ) -> _Plan:
+        """
+        Serve bars from the cache, requesting only the ranges missing from it
+        ("bars", all fields). Forward adjusted bars around a gap are requested
+        again, and if their adjustment changed, the cached history is replaced.
+        """
+        assert self.cache is not None
+        for gap_start, gap_end in self.cache.missing_ranges(symbol, adjust, start, end):
+            fetch_start, fetch_end, overlap = _drift_window(
+                self.cache, symbol, adjust, gap_start, gap_end, self.drift_check_bars
+            )
+            df = yield "bars", fetch_start, fetch_end
+
+            if overlap is not None and _adjustment_drifted(
+                overlap, df, self.drift_tolerance
+            ):
+                logger.info(
+                    f"get_ohlcv: adjustment of {symbol} changed, refetching its history"
+                )
+                # Replace the cached bars, keeping the same covered span
+                span_start, span_end = _history_span(
+                    self.cache, symbol, adjust, start, end
+                )
+                df = yield "bars", span_start, span_end
+                self.cache.invalidate(symbol, adjust)
+                self.cache.store(symbol, adjust, df, span_start, span_end)
+                break
+
+            self.cache.store(symbol, adjust, df, gap_start, gap_end)
+
+        cached = self.cache.load(symbol, adjust, start, end, fields)
+        if cached is None:
+            # Nothing to fetch (e.g. weekend-only range) and nothing stored yet
+            cached = select_fields((yield "bars", start, end), fields)
+        return cached
+
+    def _adj_factors_plan(self, symbol: str, start: date, end: date) -> _Plan:
+        """Serve adjustment factors from the cache, requesting the missing ranges ("factors")."""
+        assert self.cache is not None
+        partition: Any = FACTORS_PARTITION
+        for gap_start, gap_end in self.cache.missing_ranges(
+            symbol, partition, start, end
+        ):
+            factors = yield "factors", gap_start, gap_end
+            if factors is None:
+                return None
+            self.cache.store(symbol, partition, factors, gap_start, gap_end)
+
+        cached = self.cache.load(symbol, partition, start, end)
+        if cached is None:
+            cached = yield "factors", start, end
+        return cached
+
+    def _local_adjust_plan(
+        self, symbol: str, start: date, end: date, adjust: AdjustType
+    ) -> _Plan:
+        """
+        Adjust the unadjusted bars ("bars") with the symbol's adjustment factors
+        ("factors"). Returns None to fall back to the providers' adjusted bars.
+        """
+        try:
+            # Factors up to today, since forward adjustment is relative to the latest one
+            factors = yield "factors", start, max(end, date.today())
+        except Exception as e:
+            logger.warning(
+                f"get_ohlcv: no adjustment factors for {symbol}, using the providers' adjusted bars: {e}"
+            )
+            return None
+        if factors is None or factors.empty:
+            return None
+        raw = yield "bars", start, end
+        return adjust_ohlcv(raw, factors, adjust)
+
+    def _known_details(self, symbol: str) -> Union[StockDetails, None]:
+        """Details of a symbol from `details_cache` or a loaded universe, if there."""
+        if self.details_cache is not None:
+            cached = self.details_cache.get(symbol)
+            if cached is not None:
+                return cached
+
+        universe = self._universes.get(universe_market(infer_stock_market(symbol)[1]))
+        if universe is not None and symbol in universe:
+            return universe.lookup(symbol)
+        return None
+
+    def _merge_details(
+        self, symbol: str, results: Sequence[Any]
+    ) -> Union[StockDetails, None]:
+        """Merge the details returned by each feed (or the error it raised) in priority order."""
+        errors: List[str] = []
+        details: Union[StockDetails, None] = None
+
+        for feed, result in zip(self.feeds, results):
+            if isinstance(result, BaseException):
+                errors.append(f"Feed {feed.name} failed: {result}")
+            elif result is not None:
+                details = result if details is None else details | result
+
+        if errors:
+            logger.warning(
+                f"get_stock_details: symbol: {symbol}, errors: {'; '.join(errors)}"
+            )
+
+        if details is not None and self.details_cache is not None:
+            self.details_cache.put(symbol, details)
+
+        return details
+
+    def _known_universe(self, market: UniverseMarket) -> Optional[StockUniverse]:
+        """The universe of a market loaded before, from memory or `details_cache`."""
+        universe = self._universes.get(market)
+        if universe is None and self.details_cache is not None:
+            universe = self.details_cache.get_universe(market)
+        if universe is not None:
+            self._universes[market] = universe
+        return universe
+
+    def _merge_universe(
+        self, market: UniverseMarket, results: Sequence[Any]
+    ) -> StockUniverse:
+        """Merge the listings returned by each feed (or the error it raised) in priority order."""
+        errors: List[str] = []
+        universe: Optional[StockUniverse] = None
+
+        for feed, result in zip(self.feeds, results):
+            if isinstance(result, BaseException):
+                errors.append(f"Feed {feed.name} failed: {result}")
+            elif result is not None and not result.empty:
+                new_universe = StockUniverse(market, result)
+                universe = new_universe if universe is None else universe | new_universe
+
+        if universe is None:
+            if errors:
+                raise RuntimeError(
+                    f"get_universe: all feeds failed for market: {market}: {'; '.join(errors)}"
+                )
+            logger.warning(f"get_universe: no feed can list market: {market}")
+            return StockUniverse(market, empty_universe())
+
+        if errors:
+            logger.warning(
+                f"get_universe: market: {market}, errors: {'; '.join(errors)}"
+            )
+
+        self._universes[market] = universe
+        if self.details_cache is not None:
+            self.details_cache.put_universe(universe)
+
+        logger.debug(f"get_universe: {len(universe)} listings for market: {market}")
+
+        return universe
+
+
+class DataFeedService(_FeedServiceBase):
     """Service to feed data using multiple providers (potentially)."""
 
-    def __init__(self, feeds: Sequence[BaseFeed]) -> None:
+    def __init__(
+        self,
+        feeds: Sequence[BaseFeed],
+        cache: Optional[OHLCVCache] = None,
+        router: Optional[FeedRouter] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        details_cache: Optional[StockDetailsCache] = None,
+        history_cache: Optional[FullHistoryCache] = None,
+        local_adjust: bool = False,
+        drift_check_bars: int = 5,
+        drift_tolerance: float = 1e-3,
+        coalesce: bool = True,
+    ) -> None:
         if not feeds:
             raise ValueError("At least one provider must be provided.")
+        super().__init__(
+            cache,
+            router,
+            details_cache,
+            history_cache,
+            local_adjust,
+            drift_check_bars,
+            drift_tolerance,
+        )
         self.feeds = list(feeds)
+        # Concurrent requests covered by a fetch in flight share its result
+        self.flights: Optional[SingleFlight] = SingleFlight() if coalesce else None
+        # Per-feed cap on requests in flight
+        self._slots: Dict[str, BoundedSemaphore] = {
+            feed.name: BoundedSemaphore(feed.max_concurrency) for feed in self.feeds
+        }
+        self.hedge_policy = hedge_policy or HedgePolicy()
+        self.hedge_stats = HedgeStats()
+        # Pools for fan-out and for hedged requests, created on first use. Hedged
+        # requests get their own, so that fan-out tasks can't starve it.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=sum(feed.max_concurrency for feed in self.feeds),
+                    thread_name_prefix="dumbmoney-service",
+                )
+            return self._executor
+
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=sum(feed.max_concurrency for feed in self.feeds),
+                    thread_name_prefix="dumbmoney-hedge",
+                )
+            return self._hedge_executor
+
+    def _call(
+        self,
+        feed: BaseFeed,
+        fn: Callable[..., Any],
+        market: Optional[StockMarket] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Call a feed method within the feed's concurrency cap and rate limit,
+        retrying retryable errors with jittered exponential backoff.
+        Outcomes are reported to the router when `market` is given, once per
+        call rather than per attempt.
+        """
+        if market is not None and not self.router.acquire(feed.name, market):
+            raise RuntimeError(f"trial call to half-open feed {feed.name} in flight")
+        limiter = get_rate_limiter(feed.name, feed.calls_per_minute)
+        attempt = 0
+        while True:
+            with self._slots[feed.name]:
+                if limiter is not None:
+                    limiter.acquire()
+                started = time.perf_counter()
+                try:
+                    result = fn(**kwargs)
+                except Exception as e:
+                    if attempt + 1 >= feed.retry.max_attempts or not feed.is_retryable(
+                        e
+                    ):
+                        if market is not None:
+                            self.router.record(feed.name, market, None, ok=False)
+                        raise
+                    error = e
+                else:
+                    if market is not None:
+                        self.router.record(
+                            feed.name, market, time.perf_counter() - started, ok=True
+                        )
+                    return result
+            delay = feed.retry.delay(attempt)
+            attempt += 1
+            logger.debug(
+                f"Feed {feed.name} failed ({error}), retrying in {delay:.2f}s (attempt {attempt + 1})"
+            )
+            time.sleep(delay)
+
+    def _call_get_ohlcv(
+        self,
+        feed: BaseFeed,
+        market: StockMarket,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType,
+        fields: Optional[List[str]],
+    ) -> OHLCVData:
+        """
+        Fetch bars from one feed. Endpoints returning the full history anyway are
+        downloaded once into `history_cache` and sliced for later requests.
+        """
+        if market not in feed.full_history_markets:
+            return self._call(
+                feed,
+                feed.get_ohlcv,
+                market=market,
+                symbol=symbol,
+                start=start,
+                end=end,
+                adjust=adjust,
+                fields=fields,
+            )
+
+        history = self.history_cache.get_or_fetch(
+            FullHistoryCache.key(feed.name, symbol, adjust),
+            lambda: self._call(
+                feed,
+                feed.get_ohlcv,
+                market=market,
+                symbol=symbol,
+                start=FULL_HISTORY_START,
+                end=date.today(),
+                adjust=adjust,
+                fields=None,
+            ),
+        )
+        return FullHistoryCache.slice(history, start, end, fields)
 
     def get_ohlcv(
         self,
@@ -31,54 +549,312 @@ class DataFeedService:
         end,
         adjust: AdjustType = "forward",
         fields: Optional[List[str]] = None,
+        hedge: bool = False,
+        compact: bool = False,
     ) -> OHLCVData:
+        """
+        Fetch OHLCV data of a symbol, trying the feeds in the router's order.
+
+        With `hedge=True`, if the first feed hasn't answered within its usual latency
+        (see `hedge_policy`), the request is also sent to the next capable feed and
+        the first answer wins.
+
+        With `local_adjust`, forward and backward adjusted bars are computed from
+        the unadjusted bars and the symbol's adjustment factors, falling back to
+        the providers' adjusted bars when no feed has factors for the symbol.
+
+        With `compact=True`, the bars are returned with compact dtypes (see `compact_ohlcv`).
+        """
+        if compact:
+            return compact_ohlcv(
+                self.get_ohlcv(symbol, start, end, adjust, fields, hedge)
+            )
+
         start_date = _normalize_date(start)
         end_date = _normalize_date(end)
 
-        errors: List[str] = []
+        if self.local_adjust and adjust != "none":
+            adjusted = _run_plan(
+                self._local_adjust_plan(symbol, start_date, end_date, adjust),
+                {
+                    "factors": lambda s, e: self.get_adj_factors(symbol, s, e),
+                    "bars": lambda s, e: self.get_ohlcv(
+                        symbol, s, e, "none", fields, hedge
+                    ),
+                },
+            )
+            if adjusted is not None:
+                return adjusted
+
+        if self.cache is None:
+            return self._fetch_ohlcv(
+                symbol, start_date, end_date, adjust, fields, hedge
+            )
+
+        return _run_plan(
+            self._ohlcv_plan(symbol, adjust, start_date, end_date, fields),
+            {"bars": lambda s, e: self._fetch_ohlcv(symbol, s, e, adjust, None, hedge)},
+        )
+
+    def get_adj_factors(self, symbol: str, start, end) -> Optional[pd.DataFrame]:
+        """
+        Return the cumulative adjustment factors of a symbol (see `BaseFeed.get_adj_factors`),
+        or None if no feed provides them. Factors are kept in `cache` if set,
+        so that only new rows are fetched later.
+        """
+        start_date = _normalize_date(start)
+        end_date = _normalize_date(end)
+
+        if self.cache is None:
+            return self._fetch_adj_factors(symbol, start_date, end_date)
+
+        return _run_plan(
+            self._adj_factors_plan(symbol, start_date, end_date),
+            {"factors": lambda s, e: self._fetch_adj_factors(symbol, s, e)},
+        )
+
+    def _fetch_adj_factors(
+        self, symbol: str, start: date, end: date
+    ) -> Optional[pd.DataFrame]:
+        _, market = infer_stock_market(symbol)
+        attempts = _Attempts("get_adj_factors", symbol, start, end)
 
-        for feed in self.feeds:
+        for feed in self.router.order(self.feeds, market):
+            if not feed.provides_adj_factors:
+                continue
             try:
-                df = feed.get_ohlcv(
-                    symbol=symbol,
-                    start=start_date,
-                    end=end_date,
-                    adjust=adjust,
-                    fields=fields,
+                factors = self._call(
+                    feed, feed.get_adj_factors, symbol=symbol, start=start, end=end
                 )
-                return df
             except Exception as e:
-                errors.append(f"Feed {feed.name} failed: {e}")
+                attempts.failed(feed, e)
+                continue
+            if factors is not None:
+                return factors
 
-        raise RuntimeError(
-            f"get_ohlcv: all feeds failed for symbol: {symbol} "
-            f"({start_date} → {end_date}): {'; '.join(errors)}"
+        if attempts.errors:
+            raise attempts.error()
+        return None
+
+    def _fetch_ohlcv(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType,
+        fields: Optional[List[str]],
+        hedge: bool = False,
+    ) -> OHLCVData:
+        if self.flights is None:
+            return self._fetch_ohlcv_from_feeds(
+                symbol, start, end, adjust, fields, hedge
+            )
+        # Fetch all fields, so that the result can be shared with any request
+        df = self.flights.do(
+            (OHLCVCache.key(symbol), adjust),
+            start,
+            end,
+            lambda: self._fetch_ohlcv_from_feeds(
+                symbol, start, end, adjust, None, hedge
+            ),
         )
+        return slice_ohlcv(df, start, end, fields)
 
-    def get_stock_details(
+    def _fetch_ohlcv_from_feeds(
         self,
         symbol: str,
-    ) -> Union[StockDetails, None]:
-        errors: List[str] = []
+        start: date,
+        end: date,
+        adjust: AdjustType,
+        fields: Optional[List[str]],
+        hedge: bool = False,
+    ) -> OHLCVData:
+        _, market = infer_stock_market(symbol)
+        feeds = self.router.order(self.feeds, market)
 
-        details: Union[StockDetails, None] = None
+        if hedge and len(feeds) > 1:
+            return self._fetch_ohlcv_hedged(
+                feeds, market, symbol, start, end, adjust, fields
+            )
 
-        for feed in self.feeds:
+        attempts = _Attempts("get_ohlcv", symbol, start, end)
+        for feed in feeds:
             try:
-                new_details = feed.get_stock_details(
-                    symbol=symbol,
+                df = self._call_get_ohlcv(
+                    feed, market, symbol, start, end, adjust, fields
                 )
-                if new_details is not None:
-                    if details is None:
-                        details = new_details
-                    else:
-                        details = details | new_details
             except Exception as e:
-                errors.append(f"Feed {feed.name} failed: {e}")
+                attempts.failed(feed, e)
+                continue
+            if attempts.answered(feed, df):
+                return df
 
-        if errors:
-            logger.warning(
-                f"get_stock_details: symbol: {symbol}, errors: {'; '.join(errors)}"
+        return attempts.result()
+
+    def _fetch_ohlcv_hedged(
+        self,
+        feeds: List[BaseFeed],
+        market: StockMarket,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType,
+        fields: Optional[List[str]],
+    ) -> OHLCVData:
+        policy = self.hedge_policy
+        executor = self._hedge_pool()
+        self.hedge_stats.record_request()
+
+        pending: Dict[Future, BaseFeed] = {}
+        launched_at: Dict[Future, float] = {}
+        hedged_feeds: List[BaseFeed] = []
+        attempts = _Attempts("get_ohlcv", symbol, start, end)
+        next_feed = 0
+
+        def launch() -> BaseFeed:
+            nonlocal next_feed
+            feed = feeds[next_feed]
+            next_feed += 1
+            future = executor.submit(
+                self._call_get_ohlcv, feed, market, symbol, start, end, adjust, fields
             )
+            pending[future] = feed
+            launched_at[future] = time.perf_counter()
+            return feed
 
-        return details
+        launch()
+        while pending:
+            timeout = None
+            if next_feed < len(feeds) and len(hedged_feeds) < policy.max_hedges:
+                # Wait for the latest request in flight up to its feed's usual latency
+                latest = max(pending, key=launched_at.__getitem__)
+                delay = policy.delay(
+                    self.router.latency_percentile(
+                        pending[latest].name, market, policy.percentile
+                    )
+                )
+                timeout = max(0.0, launched_at[latest] + delay - time.perf_counter())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Slower than usual: race it against the next feed
+                slow = pending[latest]
+                hedged_feeds.append(launch())
+                self.hedge_stats.record_fired()
+                logger.debug(
+                    f"get_ohlcv: {slow.name} slow for {symbol}, hedging with {hedged_feeds[-1].name}"
+                )
+                continue
+
+            for future in done:
+                feed = pending.pop(future)
+                try:
+                    df = future.result()
+                except Exception as e:
+                    attempts.failed(feed, e)
+                    continue
+                if not attempts.answered(feed, df):
+                    continue
+                # Requests still in flight finish in the background and are discarded
+                self.hedge_stats.record_win(
+                    feed.name, hedged=any(feed is f for f in hedged_feeds)
+                )
+                return df
+
+            if not pending and next_feed < len(feeds):
+                # Every request in flight failed: fall back to the next feed
+                launch()
+
+        return attempts.result()
+
+    def get_ohlcv_many(
+        self,
+        symbols: Iterable[str],
+        start,
+        end,
+        adjust: AdjustType = "forward",
+        fields: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        compact: bool = False,
+    ) -> Iterator[OHLCVResult]:
+        """
+        Fetch many symbols concurrently on a worker pool.
+
+        Results are yielded as each symbol finishes, in completion order. A failing symbol
+        yields a result carrying its error instead of aborting the whole batch.
+        Requests to each feed are capped by its `max_concurrency`.
+        """
+        if max_workers is None:
+            max_workers = sum(feed.max_concurrency for feed in self.feeds)
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="dumbmoney-feed"
+        )
+        try:
+            futures = {
+                executor.submit(
+                    self.get_ohlcv,
+                    symbol=symbol,
+                    start=start,
+                    end=end,
+                    adjust=adjust,
+                    fields=fields,
+                    compact=compact,
+                ): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    yield OHLCVResult(symbol=symbol, data=future.result())
+                except Exception as e:
+                    yield OHLCVResult(symbol=symbol, error=e)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_stock_details(
+        self,
+        symbol: str,
+    ) -> Union[StockDetails, None]:
+        """
+        Return the details of a symbol, merged from all feeds in priority order.
+        Feeds are queried concurrently; results are kept in `details_cache` if set.
+        Symbols of a universe loaded with `get_universe` are served from it.
+        """
+        known = self._known_details(symbol)
+        if known is not None:
+            return known
+
+        executor = self._pool()
+        futures = [
+            executor.submit(self._call, feed, feed.get_stock_details, symbol=symbol)
+            for feed in self.feeds
+        ]
+        return self._merge_details(symbol, _results(futures))
+
+    def get_universe(
+        self,
+        market: UniverseMarket,
+        refresh: bool = False,
+    ) -> StockUniverse:
+        """
+        Return all listings of a market ("CN", "HK" or "US"), using bulk requests
+        instead of one request per symbol. Feeds are queried concurrently and merged
+        in priority order.
+
+        The universe is kept in memory (and in `details_cache` if set) and serves
+        later `get_stock_details` calls for its symbols.
+        """
+        if not refresh:
+            universe = self._known_universe(market)
+            if universe is not None:
+                return universe
+
+        executor = self._pool()
+        futures = [
+            executor.submit(
+                self._call, feed, lambda feed=feed: feed.get_universe(market)
+            )
+            for feed in self.feeds
+        ]
+        return self._merge_universe(market, _results(futures))
@@ -0,0 +1,109 @@
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..core import OHLCVData, empty_ohlcv
+from ..core.data import _REQUIRED_COLS
+
+
+def dates_from_epoch_ms(values: Any, tz: Optional[str] = None) -> pd.DatetimeIndex:
+    """
+    Convert epoch milliseconds to a DatetimeIndex in one vectorized pass.
+    With `tz`, timestamps are converted to that timezone and truncated to the day
+    (e.g. daily bars stamped at the exchange's midnight).
+    """
+    if tz is None:
+        return pd.DatetimeIndex(pd.to_datetime(values, unit="ms"))
+    stamps = pd.to_datetime(values, unit="ms", utc=True)
+    return pd.DatetimeIndex(stamps).tz_convert(tz).tz_localize(None).normalize()
+
+
+def dates_from_strings(values: Any, format: Optional[str] = None) -> pd.DatetimeIndex:
+    """Parse date strings (or date objects) to a DatetimeIndex."""
+    return pd.DatetimeIndex(pd.to_datetime(values, format=format))
+
+
+def ohlcv_from_columns(
+    columns: Mapping[str, Any],
+    dates: pd.DatetimeIndex,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    fields: Optional[List[str]] = None,
+    rename: Optional[Mapping[str, str]] = None,
+) -> OHLCVData:
+    """
+    Build a normalized OHLCV DataFrame from column arrays in a single pass.
+
+    Rows are sorted by date and sliced to [start, end] by position, then each
+    selected column is copied once into the result, in the same layout as
+    `normalize_ohlcv` (required columns first, then the optional `fields`).
+
+    Args:
+      columns: Column name -> array-like of values, aligned with `dates`.
+      dates: Dates of the rows.
+      start, end: Optional inclusive date range to keep.
+      fields: Optional list of extra fields to include. If None, include all.
+      rename: Optional provider -> normalized column name mapping.
+    """
+    rename = rename or {}
+    named = {rename.get(name, name).lower(): values for name, values in columns.items()}
+    named.pop("date", None)
+
+    missing_cols = [col for col in _REQUIRED_COLS if col not in named]
+    if missing_cols:
+        raise ValueError(f"Data is missing required columns: {missing_cols}")
+
+    cols = list(_REQUIRED_COLS) + [
+        col
+        for col in named
+        if col not in _REQUIRED_COLS and (fields is None or col in fields)
+    ]
+
+    values = dates.values
+    order: Optional[np.ndarray] = None
+    if not dates.is_monotonic_increasing:
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+
+    lo = values.searchsorted(pd.Timestamp(start).to_datetime64()) if start else 0
+    hi = (
+        values.searchsorted(pd.Timestamp(end).to_datetime64(), side="right")
+        if end
+        else len(values)
+    )
+    if lo >= hi:
+        return empty_ohlcv()
+
+    rows = order[lo:hi] if order is not None else slice(lo, hi)
+    index = pd.DatetimeIndex(values[lo:hi], name="date")
+    data = {col: np.asarray(named[col])[rows] for col in cols}
+    return pd.DataFrame(data, index=index, copy=False)  # type: ignore
+
+
+def ohlcv_from_frame(
+    df: pd.DataFrame,
+    dates: pd.DatetimeIndex,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    fields: Optional[List[str]] = None,
+    rename: Optional[Mapping[str, str]] = None,
+    drop: Sequence[str] = (),
+) -> OHLCVData:
+    """Build a normalized OHLCV DataFrame from a provider DataFrame, see `ohlcv_from_columns`."""
+    columns = {name: df[name].to_numpy() for name in df.columns if name not in drop}
+    return ohlcv_from_columns(columns, dates, start, end, fields, rename)
+
+
+def columns_from_records(
+    records: Iterable[Any], names: Sequence[str]
+) -> Dict[str, np.ndarray]:
+    """
+    Gather attributes of provider records (e.g. SDK model objects) into column arrays,
+    without building an intermediate dict per record.
+    """
+    records = list(records)
+    return {
+        name: np.array([getattr(record, name) for record in records]) for name in names
+    }
@@ -1,4 +1,4 @@
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from functools import lru_cache
 from typing import List, Optional, Literal, Union
@@ -9,7 +9,9 @@ import pandas as pd
 from dumbmoney.core import StockDetails
 
 from .feed import AdjustType, BaseFeed, StockMarket
-from ..core import OHLCVData, normalize_ohlcv
+from .registry import MASSIVE_SPEC
+from .ingest import columns_from_records, dates_from_epoch_ms, ohlcv_from_columns
+from ..core import OHLCVData, empty_ohlcv
 from ..logger import logger
 
 from massive import RESTClient
@@ -29,18 +31,32 @@ def get_massive_client(api_key: Optional[str] = None) -> RESTClient:
 class MassiveFeed(BaseFeed):
     """Data feed backed by Massive."""
 
-    name: str = "Massive"
+    name: str = MASSIVE_SPEC.name
+    max_concurrency: int = MASSIVE_SPEC.max_concurrency
+    calls_per_minute: Optional[float] = MASSIVE_SPEC.calls_per_minute
 
     api_key: Optional[str] = field(default_factory=lambda: os.getenv("MASSIVE_KEY"))
     massive_client: RESTClient = field(init=False)
 
+    agg_fields = (
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "vwap",
+        "timestamp",
+        "transactions",
+        "otc",
+    )
+
     def __post_init__(self):
         self.massive_client = get_massive_client(self.api_key)
         logger.debug("MassiveFeed initialized.")
 
     @classmethod
     def markets(cls) -> Union[List[StockMarket], Literal["*"]]:
-        return [StockMarket.US]
+        return MASSIVE_SPEC.markets
 
     def get_ohlcv(
         self,
@@ -70,18 +86,14 @@ class MassiveFeed(BaseFeed):
         ):
             aggs.append(a)
 
-        df = pd.DataFrame([asdict(a) for a in aggs])
-
-        df["date"] = pd.to_datetime(
-            df["timestamp"].apply(lambda ts: datetime.fromtimestamp(ts / 1000).date())
-        )
+        if not aggs:
+            return empty_ohlcv()
 
-        # filter df by date range
-        df = df[
-            (df["date"] >= pd.to_datetime(start)) & (df["date"] <= pd.to_datetime(end))
-        ]
+        columns = columns_from_records(aggs, self.agg_fields)
+        # Daily bars are stamped at midnight New York time
+        dates = dates_from_epoch_ms(columns.pop("timestamp"), tz="America/New_York")
 
-        return normalize_ohlcv(pd.DataFrame(df), fields=fields)
+        return ohlcv_from_columns(columns, dates, start, end, fields=fields)
 
     def get_stock_details(self, symbol: str) -> Union[StockDetails, None]:
         try:
@@ -118,3 +130,24 @@ class MassiveFeed(BaseFeed):
             is_etf=details.type == "ETF",
             tags=[details.sic_description.strip()] if details.sic_description else [],
         )
+
+    def get_universe(self, market: Literal["CN", "HK", "US"]) -> Optional[pd.DataFrame]:
+        if market != "US":
+            return None
+
+        logger.debug("Massive: fetching all active US tickers")
+
+        # Paginated by the client, 1000 tickers per request
+        tickers = [
+            (t.ticker, t.name, t.primary_exchange, t.type)
+            for t in self.massive_client.list_tickers(
+                market="stocks", active=True, limit=1000
+            )
+        ]
+        if not tickers:
+            return None
+
+        df = pd.DataFrame(tickers, columns=["symbol", "name", "exchange", "type"])
+        df["exchange"] = df["exchange"].map({"XNYS": "NYSE", "XNAS": "NASDAQ"})
+        df["is_etf"] = df["type"] == "ETF"
+        return df
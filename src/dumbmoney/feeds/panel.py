@@ -0,0 +1,88 @@
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import pandas as pd
+
+from .cache import OHLCVCache
+from .feed import AdjustType
+from .feed_service import DataFeedService, _normalize_date
+from ..core import OHLCVData
+from ..core.panel import PANEL_FIELDS, OHLCVPanel, PanelStore
+from ..logger import logger
+
+
+def build_panel(
+    store: Union[PanelStore, str, Path],
+    symbols: Iterable[str],
+    start,
+    end,
+    adjust: AdjustType = "forward",
+    dates: Optional[pd.DatetimeIndex] = None,
+    fields: Sequence[str] = PANEL_FIELDS,
+    dtype="float64",
+    service: Optional[DataFeedService] = None,
+    cache: Optional[OHLCVCache] = None,
+) -> OHLCVPanel:
+    """
+    Build a panel store of `symbols` over [start, end], from the feeds through `service`
+    (the default service if None), or from `cache` only, without any request.
+
+    With `dates` (e.g. the trading calendar), each symbol is written as soon as it
+    arrives. Otherwise the panel is indexed by the union of the symbols' dates, so
+    all bars are held in memory until every symbol is loaded.
+    Symbols that fail or have no bars are kept, as all-NaN columns.
+    """
+    if not isinstance(store, PanelStore):
+        store = PanelStore(store)
+    symbols = list(dict.fromkeys(symbols))
+    start_date, end_date = _normalize_date(start), _normalize_date(end)
+
+    panel: Optional[OHLCVPanel] = None
+    if dates is not None:
+        dates = dates[
+            (dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))
+        ]
+        panel = store.create(dates, symbols, fields=fields, dtype=dtype)
+
+    frames: Dict[str, OHLCVData] = {}
+    for symbol, ohlcv in _load_bars(
+        symbols, start_date, end_date, adjust, list(fields), service, cache
+    ):
+        if panel is not None:
+            panel.write(symbol, ohlcv)
+        else:
+            frames[symbol] = ohlcv
+
+    if panel is None:
+        union = pd.DatetimeIndex([], name="date")
+        for ohlcv in frames.values():
+            union = union.union(ohlcv.index)
+        panel = store.create(union, symbols, fields=fields, dtype=dtype)
+        for symbol, ohlcv in frames.items():
+            panel.write(symbol, ohlcv)
+
+    panel.flush()
+    return store.open()
+
+
+def _load_bars(symbols, start, end, adjust, fields, service, cache):
+    if cache is not None:
+        for symbol in symbols:
+            ohlcv = cache.load(symbol, adjust, start, end, fields=fields)
+            if ohlcv is None or ohlcv.empty:
+                logger.warning(f"No cached bars for {symbol}, left empty in panel")
+                continue
+            yield symbol, ohlcv
+        return
+
+    if service is None:
+        from . import default_feed_service
+
+        service = default_feed_service()
+    for result in service.get_ohlcv_many(symbols, start, end, adjust, fields=fields):
+        if not result.ok:
+            logger.warning(
+                f"Failed to fetch {result.symbol}, left empty in panel: {result.error}"
+            )
+            continue
+        yield result.symbol, result.data
@@ -0,0 +1,205 @@
+from dataclasses import dataclass, field
+from datetime import date
+from threading import Lock
+from typing import Any, Callable, List, Literal, Optional, Tuple, Type, Union
+
+import importlib.util
+import os
+import time
+
+import pandas as pd
+
+from .feed import AdjustType, BaseFeed, StockMarket
+from .throttle import RetryPolicy
+from ..core import OHLCVData, StockDetails
+from ..lazy import record_import_time, timed_import
+
+
+@dataclass(frozen=True)
+class FeedSpec:
+    """
+    Declaration of a feed that is imported and built only when first used.
+
+    `target` is the feed class as "module:Class". The markets and throttling
+    settings are declared here so that feeds can be routed without importing
+    the provider SDK.
+    """
+
+    name: str
+    target: str
+    markets: Union[List[StockMarket], Literal["*"]] = "*"
+    full_history_markets: Tuple[StockMarket, ...] = ()
+    max_concurrency: int = 4
+    calls_per_minute: Optional[float] = None
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    adj_factors: bool = False  # whether the feed implements `get_adj_factors`
+    priority: int = 100  # lower is tried first
+    available: Callable[[], bool] = lambda: True  # cheap check, e.g. credentials set
+    build: Optional[Callable[[Type[BaseFeed]], BaseFeed]] = None  # default: cls()
+
+    def load_class(self) -> Type[BaseFeed]:
+        module, _, attr = self.target.partition(":")
+        return getattr(timed_import(module), attr)
+
+
+@dataclass(init=False)
+class LazyFeed(BaseFeed):
+    """
+    Stand-in for a registered feed, importing and building it on first use.
+
+    Each instance belongs to a subclass made for its spec, so that the class-level
+    settings (`markets`, `full_history_markets`) are the spec's.
+    """
+
+    spec: FeedSpec
+
+    def __new__(cls, spec: FeedSpec):
+        if cls is LazyFeed:
+            cls = type(
+                f"Lazy{spec.name}Feed",
+                (cls,),
+                {"spec": spec, "full_history_markets": spec.full_history_markets},
+            )
+        return super().__new__(cls)
+
+    def __init__(self, spec: FeedSpec):
+        super().__init__(
+            name=spec.name,
+            max_concurrency=spec.max_concurrency,
+            calls_per_minute=spec.calls_per_minute,
+            retry=spec.retry,
+        )
+        self.spec = spec
+        self._feed: Optional[BaseFeed] = None
+        self._lock = Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._feed is not None
+
+    @property
+    def feed(self) -> BaseFeed:
+        """The actual feed, imported and built on first access."""
+        if self._feed is None:
+            with self._lock:
+                if self._feed is None:
+                    started = time.perf_counter()
+                    cls = self.spec.load_class()
+                    feed = self.spec.build(cls) if self.spec.build else cls()  # type: ignore
+                    record_import_time(
+                        f"feed:{self.name}", time.perf_counter() - started
+                    )
+                    self._feed = feed
+        return self._feed
+
+    @classmethod
+    def markets(cls) -> Union[List[StockMarket], Literal["*"]]:
+        return cls.spec.markets
+
+    def is_retryable(self, error: Exception) -> bool:
+        if self._feed is None:
+            return super().is_retryable(error)
+        return self._feed.is_retryable(error)
+
+    def get_ohlcv(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType = "forward",
+        fields: Optional[List[str]] = None,
+    ) -> OHLCVData:
+        return self.feed.get_ohlcv(
+            symbol=symbol, start=start, end=end, adjust=adjust, fields=fields
+        )
+
+    def get_stock_details(self, symbol: str) -> Union[StockDetails, None]:
+        return self.feed.get_stock_details(symbol=symbol)
+
+    def get_universe(self, market: Literal["CN", "HK", "US"]) -> Optional[pd.DataFrame]:
+        return self.feed.get_universe(market)
+
+    def get_adj_factors(
+        self, symbol: str, start: date, end: date
+    ) -> Optional[pd.DataFrame]:
+        return self.feed.get_adj_factors(symbol=symbol, start=start, end=end)
+
+    @property
+    def provides_adj_factors(self) -> bool:
+        return self.spec.adj_factors
+
+
+_registry: List[FeedSpec] = []
+
+
+def register_feed(spec: FeedSpec) -> None:
+    """Register a feed, replacing any feed registered under the same name."""
+    _registry[:] = [s for s in _registry if s.name != spec.name] + [spec]
+
+
+def registered_feeds() -> List[FeedSpec]:
+    """Return the registered feeds, by priority."""
+    return sorted(_registry, key=lambda spec: spec.priority)
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _build_tiger(cls: Any) -> BaseFeed:
+    from .tiger import TigerConfig
+
+    return cls(
+        config=TigerConfig(
+            private_key=os.getenv("TIGER_PRIVATE_KEY", ""),
+            tiger_id=os.getenv("TIGER_ID", ""),
+            account=os.getenv("TIGER_ACCOUNT", ""),
+            license=os.getenv("TIGER_LICENSE", ""),
+        )
+    )
+
+
+# Settings of the built-in feeds, also the defaults of the feed classes
+TIGER_SPEC = FeedSpec(
+    name="Tiger",
+    target="dumbmoney.feeds.tiger:TigerFeed",
+    calls_per_minute=60,
+    priority=10,
+    available=lambda: bool(os.getenv("TIGER_ID")) and _installed("tigeropen"),
+    build=_build_tiger,
+)
+MASSIVE_SPEC = FeedSpec(
+    name="Massive",
+    target="dumbmoney.feeds.massive:MassiveFeed",
+    markets=[StockMarket.US],
+    max_concurrency=2,
+    calls_per_minute=5,  # free tier quota
+    priority=20,
+    available=lambda: bool(os.getenv("MASSIVE_KEY")),
+)
+TUSHARE_SPEC = FeedSpec(
+    name="Tushare",
+    target="dumbmoney.feeds.tushare:TushareFeed",
+    markets=[
+        StockMarket.SH,
+        StockMarket.SZ,
+        StockMarket.KCB,
+        StockMarket.HK,
+        StockMarket.ETF_SH,
+        StockMarket.ETF_SZ,
+    ],
+    calls_per_minute=500,
+    adj_factors=True,
+    priority=30,
+    available=lambda: bool(os.getenv("TUSHARE_TOKEN")),
+)
+AKSHARE_SPEC = FeedSpec(
+    name="Akshare",
+    target="dumbmoney.feeds.akshare:AkshareFeed",
+    # stock_zh_kcb_daily always downloads the full listing history
+    full_history_markets=(StockMarket.KCB,),
+    priority=40,
+)
+
+for _spec in (TIGER_SPEC, MASSIVE_SPEC, TUSHARE_SPEC, AKSHARE_SPEC):
+    register_feed(_spec)
@@ -0,0 +1,395 @@
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import builtins
+import json
+import os
+import random
+import time
+
+import pandas as pd
+
+from .cache import OHLCVCache, _tmp_path, slice_ohlcv
+from .feed import AdjustType, BaseFeed, StockMarket
+from .registry import registered_feeds
+from .throttle import RetryPolicy
+from ..core import OHLCVData, StockDetails
+
+
+def _connection_reset() -> Exception:
+    return ConnectionError("Connection reset by peer")
+
+
+def _rate_limited() -> Exception:
+    return RuntimeError("429 Too Many Requests")
+
+
+class ReplayMiss(LookupError):
+    """Raised by a ReplayFeed for a call that wasn't recorded."""
+
+
+@dataclass(frozen=True)
+class ReplayProfile:
+    """Simulated behaviour of a provider: latency and error distributions per call."""
+
+    latency: float = 0.0  # median seconds per call
+    jitter: float = 0.0  # sigma of the log-normal latency, 0 for a constant latency
+    error_rate: float = 0.0  # probability of a call failing
+    errors: Tuple[Callable[[], Exception], ...] = (_connection_reset, _rate_limited)
+    seed: Optional[int] = None
+
+    def sample_latency(self, rng: random.Random) -> float:
+        if self.latency <= 0:
+            return 0.0
+        if self.jitter <= 0:
+            return self.latency
+        return self.latency * rng.lognormvariate(0.0, self.jitter)
+
+    def sample_error(self, rng: random.Random) -> Optional[Exception]:
+        if self.error_rate <= 0 or rng.random() >= self.error_rate:
+            return None
+        return rng.choice(self.errors)()
+
+
+def _values_to_json(name: Any, values: Union[pd.Index, pd.Series]) -> dict:
+    return {"name": name, "dtype": str(values.dtype), "values": values.tolist()}
+
+
+def _values_from_json(column: dict) -> pd.Index:
+    if column["dtype"].startswith("datetime64"):
+        return pd.DatetimeIndex(pd.to_datetime(column["values"]), name=column["name"])
+    return pd.Index(column["values"], dtype=column["dtype"], name=column["name"])
+
+
+def _frame_to_json(df: Optional[pd.DataFrame]) -> Optional[str]:
+    """
+    Encode a frame column by column. Floats are written by `json` in their shortest
+    repr, which reads back to the same value (pandas' `to_json` rounds them).
+    """
+    if df is None:
+        return None
+    data = {
+        "index": _values_to_json(df.index.name, df.index),
+        "columns": [_values_to_json(col, df[col]) for col in df.columns],
+    }
+    return json.dumps(data, ensure_ascii=False, default=lambda value: value.isoformat())
+
+
+def _frame_from_json(data: Optional[str]) -> Optional[pd.DataFrame]:
+    if data is None:
+        return None
+    decoded = json.loads(data)
+    index = _values_from_json(decoded["index"])
+    columns = [_values_from_json(column) for column in decoded["columns"]]
+    return pd.DataFrame({col.name: col.to_numpy() for col in columns}, index=index)
+
+
+def _error_to_json(error: Exception) -> dict:
+    return {"type": type(error).__name__, "message": str(error)}
+
+
+def _error_from_json(error: dict) -> Exception:
+    """Rebuild a recorded error, as the same type if it's a builtin exception."""
+    cls = getattr(builtins, error["type"], None)
+    if isinstance(cls, type) and issubclass(cls, Exception):
+        return cls(error["message"])
+    return RuntimeError(f"{error['type']}: {error['message']}")
+
+
+def _write_json(path: Path, entry: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(path)
+    tmp.write_text(json.dumps(entry, ensure_ascii=False))
+    os.replace(tmp, path)
+
+
+def _ohlcv_path(root: Path, symbol: str, adjust: str, start: date, end: date) -> Path:
+    return root / "ohlcv" / f"{OHLCVCache.key(symbol)}_{adjust}_{start}_{end}.json"
+
+
+def _adj_factors_path(root: Path, symbol: str, start: date, end: date) -> Path:
+    return root / "adj_factors" / f"{OHLCVCache.key(symbol)}_{start}_{end}.json"
+
+
+def _index_ohlcv(root: Path) -> Dict[Tuple[str, str], List[Tuple[date, date, Path]]]:
+    """Recorded OHLCV ranges by (symbol key, adjust), parsed from `_ohlcv_path` names."""
+    index: Dict[Tuple[str, str], List[Tuple[date, date, Path]]] = {}
+    for path in sorted((root / "ohlcv").glob("*.json")):
+        key, adjust, start, end = path.stem.rsplit("_", 3)
+        index.setdefault((key, adjust), []).append(
+            (date.fromisoformat(start), date.fromisoformat(end), path)
+        )
+    return index
+
+
+class _Recorded:
+    """Default of the ReplayFeed throttling settings: use the recorded value."""
+
+    def __repr__(self) -> str:
+        return "<recorded>"
+
+
+_RECORDED: Any = _Recorded()
+
+
+@dataclass(init=False)
+class RecordingFeed(BaseFeed):
+    """
+    Wrapper of a feed saving every response (and error) under `<root>/<feed name>`,
+    to be served back by `ReplayFeed` without network access or credentials.
+    """
+
+    feed: BaseFeed
+    root: Path
+
+    def __init__(self, feed: BaseFeed, root: Union[str, Path]):
+        super().__init__(
+            name=feed.name,
+            max_concurrency=feed.max_concurrency,
+            calls_per_minute=feed.calls_per_minute,
+            retry=feed.retry,
+        )
+        self.feed = feed
+        self.root = Path(root) / feed.name
+        self.full_history_markets = feed.full_history_markets  # type: ignore
+        markets = feed.markets()
+        meta = {
+            "name": feed.name,
+            "markets": markets if markets == "*" else [m.value for m in markets],
+            "full_history_markets": [m.value for m in feed.full_history_markets],
+            "max_concurrency": feed.max_concurrency,
+            "calls_per_minute": feed.calls_per_minute,
+            "retry": asdict(feed.retry),
+            "adj_factors": feed.provides_adj_factors,
+        }
+        _write_json(self.root / "feed.json", meta)
+
+    def markets(self) -> Union[List[StockMarket], Literal["*"]]:  # type: ignore
+        return self.feed.markets()
+
+    def is_retryable(self, error: Exception) -> bool:
+        return self.feed.is_retryable(error)
+
+    @property
+    def provides_adj_factors(self) -> bool:
+        return self.feed.provides_adj_factors
+
+    def _record(self, path: Path, call: Callable[[], Any], encode: Callable) -> Any:
+        try:
+            result = call()
+        except Exception as e:
+            _write_json(path, {"error": _error_to_json(e)})
+            raise
+        _write_json(path, {"result": encode(result)})
+        return result
+
+    def get_ohlcv(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType = "forward",
+        fields: Optional[List[str]] = None,
+    ) -> OHLCVData:
+        return self._record(
+            _ohlcv_path(self.root, symbol, adjust, start, end),
+            lambda: self.feed.get_ohlcv(
+                symbol=symbol, start=start, end=end, adjust=adjust, fields=fields
+            ),
+            _frame_to_json,
+        )
+
+    def get_stock_details(self, symbol: str) -> Union[StockDetails, None]:
+        return self._record(
+            self.root / "details" / f"{OHLCVCache.key(symbol)}.json",
+            lambda: self.feed.get_stock_details(symbol=symbol),
+            lambda details: details.model_dump(mode="json") if details else None,
+        )
+
+    def get_universe(self, market: Literal["CN", "HK", "US"]) -> Optional[pd.DataFrame]:
+        return self._record(
+            self.root / "universe" / f"{market}.json",
+            lambda: self.feed.get_universe(market),
+            _frame_to_json,
+        )
+
+    def get_adj_factors(
+        self, symbol: str, start: date, end: date
+    ) -> Optional[pd.DataFrame]:
+        return self._record(
+            _adj_factors_path(self.root, symbol, start, end),
+            lambda: self.feed.get_adj_factors(symbol=symbol, start=start, end=end),
+            _frame_to_json,
+        )
+
+
+@dataclass(init=False)
+class ReplayFeed(BaseFeed):
+    """
+    Feed serving the responses saved by `RecordingFeed` under `<root>/<name>`.
+
+    An OHLCV request is served by a recording of the same range, or sliced from a
+    recording covering it; anything else raises `ReplayMiss`. Recorded errors are
+    raised again. `profile` adds simulated latency and errors to every call, so
+    that the service, caches and concurrent paths can be benchmarked offline.
+    Throttling settings default to the recorded ones, `calls_per_minute=None`
+    lifts the recorded quota. The recordings are indexed when the feed is created.
+    """
+
+    root: Path
+    profile: ReplayProfile
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        name: str,
+        profile: Optional[ReplayProfile] = None,
+        max_concurrency: int = _RECORDED,
+        calls_per_minute: Optional[float] = _RECORDED,
+        retry: RetryPolicy = _RECORDED,
+    ):
+        self.root = Path(root) / name
+        meta_path = self.root / "feed.json"
+        if not meta_path.is_file():
+            raise FileNotFoundError(f"No recording of feed {name!r} in {root}")
+        meta = json.loads(meta_path.read_text())
+        if max_concurrency is _RECORDED:
+            max_concurrency = meta["max_concurrency"]
+        if calls_per_minute is _RECORDED:
+            calls_per_minute = meta["calls_per_minute"]
+        if retry is _RECORDED:
+            retry = RetryPolicy(**meta["retry"])
+        super().__init__(
+            name=name,
+            max_concurrency=max_concurrency,
+            calls_per_minute=calls_per_minute,
+            retry=retry,
+        )
+        self.profile = profile or ReplayProfile()
+        self.full_history_markets = tuple(  # type: ignore
+            StockMarket(m) for m in meta["full_history_markets"]
+        )
+        self._markets = (
+            "*" if meta["markets"] == "*" else [StockMarket(m) for m in meta["markets"]]
+        )
+        self._adj_factors = meta.get("adj_factors", False)
+        self._ohlcv = _index_ohlcv(self.root)
+        self._rng = random.Random(self.profile.seed)
+        self._rng_lock = Lock()
+        self._entries: Dict[Path, dict] = {}
+        self._entries_lock = Lock()
+
+    def markets(self) -> Union[List[StockMarket], Literal["*"]]:  # type: ignore
+        return self._markets
+
+    @property
+    def provides_adj_factors(self) -> bool:
+        return self._adj_factors
+
+    def _simulate(self) -> None:
+        with self._rng_lock:
+            latency = self.profile.sample_latency(self._rng)
+            error = self.profile.sample_error(self._rng)
+        if latency:
+            time.sleep(latency)
+        if error is not None:
+            raise error
+
+    def _entry(self, path: Path) -> Optional[dict]:
+        """A recorded entry, decoded once and kept in memory."""
+        with self._entries_lock:
+            if path not in self._entries:
+                if not path.is_file():
+                    return None
+                entry = json.loads(path.read_text())
+                if isinstance(entry.get("result"), str):
+                    entry["result"] = _frame_from_json(entry["result"])
+                self._entries[path] = entry
+            return self._entries[path]
+
+    def _replay(self, path: Path, call: str) -> Any:
+        self._simulate()
+        entry = self._entry(path)
+        if entry is None:
+            raise ReplayMiss(f"{self.name}: no recording of {call}")
+        if "error" in entry:
+            raise _error_from_json(entry["error"])
+        return entry["result"]
+
+    def _covering_ohlcv(
+        self, symbol: str, adjust: str, start: date, end: date
+    ) -> Optional[Path]:
+        recorded = self._ohlcv.get((OHLCVCache.key(symbol), adjust), [])
+        for first, last, path in recorded:
+            if (first, last) == (start, end):
+                return path
+        for first, last, path in recorded:
+            if first <= start and end <= last:
+                return path
+        return None
+
+    def get_ohlcv(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+        adjust: AdjustType = "forward",
+        fields: Optional[List[str]] = None,
+    ) -> OHLCVData:
+        path = self._covering_ohlcv(symbol, adjust, start, end) or _ohlcv_path(
+            self.root, symbol, adjust, start, end
+        )
+        data = self._replay(path, f"get_ohlcv({symbol}, {start}, {end}, {adjust})")
+        return slice_ohlcv(data, start, end, fields)
+
+    def get_stock_details(self, symbol: str) -> Union[StockDetails, None]:
+        details = self._replay(
+            self.root / "details" / f"{OHLCVCache.key(symbol)}.json",
+            f"get_stock_details({symbol})",
+        )
+        return StockDetails.model_validate(details) if details else None
+
+    def get_universe(self, market: Literal["CN", "HK", "US"]) -> Optional[pd.DataFrame]:
+        universe = self._replay(
+            self.root / "universe" / f"{market}.json", f"get_universe({market})"
+        )
+        return None if universe is None else universe.copy()
+
+    def get_adj_factors(
+        self, symbol: str, start: date, end: date
+    ) -> Optional[pd.DataFrame]:
+        factors = self._replay(
+            _adj_factors_path(self.root, symbol, start, end),
+            f"get_adj_factors({symbol}, {start}, {end})",
+        )
+        return None if factors is None else factors.copy()
+
+
+def replay_feeds(
+    root: Union[str, Path],
+    profiles: Optional[Mapping[str, ReplayProfile]] = None,
+) -> List[ReplayFeed]:
+    """
+    ReplayFeeds of every feed recorded under `root`, in the registered feeds' priority
+    order, with the simulated behaviour of `profiles[feed name]` if given.
+    """
+    profiles = profiles or {}
+    priorities = {spec.name: spec.priority for spec in registered_feeds()}
+    names = sorted(
+        (path.parent.name for path in Path(root).glob("*/feed.json")),
+        key=lambda name: (priorities.get(name, 100), name),
+    )
+    return [ReplayFeed(root, name, profile=profiles.get(name)) for name in names]
@@ -0,0 +1,281 @@
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import time
+
+from .feed import StockMarket
+from ..logger import logger
+
+
+FeedT = TypeVar("FeedT")
+
+
+@dataclass
+class FeedStats:
+    """Running latency and error statistics of a feed for one market."""
+
+    calls: int = 0
+    failures: int = 0
+    latency: Optional[float] = None  # EWMA of successful call latency, in seconds
+    error_rate: float = 0.0  # EWMA of failures (0.0 - 1.0)
+    samples: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=100)
+    )  # recent successful call latencies
+
+    def record(self, latency: Optional[float], ok: bool, alpha: float) -> None:
+        self.calls += 1
+        if ok and latency is not None:
+            self.latency = (
+                latency
+                if self.latency is None
+                else alpha * latency + (1 - alpha) * self.latency
+            )
+            self.samples.append(latency)
+        else:
+            self.failures += 1
+        self.error_rate = alpha * (0.0 if ok else 1.0) + (1 - alpha) * self.error_rate
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile (q in 0.0 - 1.0) of the recent successful calls."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def score(self) -> float:
+        """Expected cost of a call, lower is better. Unreliable feeds are penalized."""
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(1.0 - self.error_rate, 0.05)
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Skip a failing feed for a cooldown period after consecutive failures.
+
+    After the cooldown, a single trial call is let through (half-open) while other
+    callers keep skipping the feed: its success closes the breaker, its failure
+    opens it for another cooldown. The trial is claimed when the call is actually
+    sent (`claim`), not when feeds are ranked (`allow`). A trial without an outcome
+    for a whole cooldown (e.g. a cancelled call) is replaced by a new one.
+    """
+
+    failure_threshold: int = 3
+    cooldown: float = 60.0  # seconds
+
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    trial_started_at: Optional[float] = None  # half-open trial call in flight
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def _trial_in_flight(self, now: float) -> bool:
+        return (
+            self.trial_started_at is not None
+            and now - self.trial_started_at < self.cooldown
+        )
+
+    def allow(self, now: float) -> bool:
+        """Whether the feed should be tried, without claiming the trial call."""
+        if self.opened_at is None:
+            return True
+        if now - self.opened_at < self.cooldown:
+            return False
+        return not self._trial_in_flight(now)
+
+    def claim(self, now: float) -> bool:
+        """
+        Claim a call about to be sent, as the trial call if half-open.
+        Returns False if another caller's trial is in flight.
+        """
+        if self.opened_at is None or now - self.opened_at < self.cooldown:
+            # Closed, or called as a last resort during the cooldown
+            return True
+        if self._trial_in_flight(now):
+            return False
+        self.trial_started_at = now
+        return True
+
+    def record(self, ok: bool, now: float) -> bool:
+        """Record a call outcome, returning True if the breaker just opened."""
+        trial = self.trial_started_at is not None
+        self.trial_started_at = None
+        if ok:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            return False
+        self.consecutive_failures += 1
+        if trial:
+            # The trial failed: open again for a whole cooldown
+            self.opened_at = now
+            return True
+        if (
+            self.opened_at is None
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.opened_at = now
+            return True
+        return False
+
+
+class FeedRouter:
+    """
+    Order feeds for a request based on per-feed, per-market statistics.
+
+    Feeds that don't support the market are dropped. Feeds with an open circuit
+    breaker are moved to the end, as a last resort. With `adaptive=True`, the
+    remaining feeds are ranked by observed latency and error rate; feeds without
+    enough samples are tried first so that every feed gets measured.
+    Otherwise the configured priority order is kept.
+    """
+
+    def __init__(
+        self,
+        adaptive: bool = True,
+        alpha: float = 0.2,
+        min_calls: int = 3,
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.adaptive = adaptive
+        self.alpha = alpha
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._stats: Dict[Tuple[str, StockMarket], FeedStats] = {}
+        self._breakers: Dict[Tuple[str, StockMarket], CircuitBreaker] = {}
+        self._lock = Lock()
+
+    def _breaker(self, name: str, market: StockMarket) -> CircuitBreaker:
+        key = (name, market)
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker(
+                failure_threshold=self.failure_threshold, cooldown=self.cooldown
+            )
+        return self._breakers[key]
+
+    def order(self, feeds: Sequence[FeedT], market: StockMarket) -> List[FeedT]:
+        """Return the feeds supporting `market`, in the order they should be tried."""
+        candidates = [
+            feed
+            for feed in feeds
+            if feed.markets() == "*" or market in feed.markets()  # type: ignore
+        ]
+        now = self._clock()
+        healthy: List[FeedT] = []
+        tripped: List[FeedT] = []
+        with self._lock:
+            for feed in candidates:
+                if self._breaker(feed.name, market).allow(now):  # type: ignore
+                    healthy.append(feed)
+                else:
+                    tripped.append(feed)
+
+            if self.adaptive:
+
+                def rank(feed) -> float:
+                    s = self._stats.get((feed.name, market))
+                    if s is None or s.calls < self.min_calls:
+                        return 0.0
+                    return s.score()
+
+                # sorted() is stable, so ties keep the priority order
+                healthy = sorted(healthy, key=rank)
+
+        return healthy + tripped
+
+    def acquire(self, name: str, market: StockMarket) -> bool:
+        """
+        Claim a call to a feed right before sending it. Returns False if the feed
+        is half-open and another caller's trial call is in flight.
+        """
+        now = self._clock()
+        with self._lock:
+            return self._breaker(name, market).claim(now)
+
+    def record(
+        self, name: str, market: StockMarket, latency: Optional[float], ok: bool
+    ) -> None:
+        """Record the outcome of a call to a feed."""
+        now = self._clock()
+        with self._lock:
+            stats = self._stats.setdefault((name, market), FeedStats())
+            stats.record(latency, ok, self.alpha)
+            if self._breaker(name, market).record(ok, now):
+                logger.warning(
+                    f"Feed {name} tripped for market {market.value}: skipping it for {self.cooldown:.0f}s"
+                )
+
+    def stats(self) -> Dict[Tuple[str, StockMarket], FeedStats]:
+        """Snapshot of the statistics, keyed by (feed name, market)."""
+        with self._lock:
+            return {
+                key: FeedStats(**{**vars(value), "samples": deque(value.samples)})
+                for key, value in self._stats.items()
+            }
+
+    def latency_percentile(
+        self, name: str, market: StockMarket, q: float
+    ) -> Optional[float]:
+        """Latency percentile of a feed for a market, None until it has enough samples."""
+        with self._lock:
+            stats = self._stats.get((name, market))
+            if stats is None or len(stats.samples) < self.min_calls:
+                return None
+            return stats.percentile(q)
+
+    def is_open(self, name: str, market: StockMarket) -> bool:
+        with self._lock:
+            return self._breaker(name, market).is_open
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """
+    When to send a hedged request: if the latest request in flight hasn't been
+    answered within its feed's `percentile` latency, measured from its launch, the
+    same request goes to the next capable feed.
+    """
+
+    percentile: float = 0.95
+    min_delay: float = 0.05  # seconds, lower bound of the hedge delay
+    default_delay: float = 2.0  # seconds, used until the primary feed has samples
+    max_hedges: int = 1  # max number of extra requests per call
+
+    def delay(self, latency: Optional[float]) -> float:
+        if latency is None:
+            return self.default_delay
+        return max(self.min_delay, latency)
+
+
+@dataclass
+class HedgeStats:
+    """Counters of hedged requests."""
+
+    requests: int = 0  # requests made in hedged mode
+    fired: int = 0  # hedges sent because the primary was slow
+    hedge_wins: int = 0  # requests answered by a hedge rather than the first feed
+    wins: Dict[str, int] = field(default_factory=dict)  # answers per feed name
+
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_fired(self) -> None:
+        with self._lock:
+            self.fired += 1
+
+    def record_win(self, name: str, hedged: bool) -> None:
+        with self._lock:
+            self.wins[name] = self.wins.get(name, 0) + 1
+            if hedged:
+                self.hedge_wins += 1
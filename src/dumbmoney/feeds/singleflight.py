@@ -0,0 +1,161 @@
+from dataclasses import dataclass, field
+from datetime import date
+from threading import Event, Lock
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+import asyncio
+import weakref
+
+
+T = TypeVar("T")
+FlightT = TypeVar("FlightT", bound="_Flight")
+
+
+@dataclass
+class _Flight:
+    """A fetch in progress for a date range."""
+
+    start: date
+    end: date
+
+
+@dataclass
+class _ThreadFlight(_Flight):
+    done: Event = field(default_factory=Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _TaskFlight(_Flight):
+    task: Optional[asyncio.Future] = None
+
+
+class _Flights(Generic[FlightT]):
+    """In-flight fetches per key, matched by date range containment."""
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, List[FlightT]] = {}
+        self.leaders = 0  # fetches actually run
+        self.followers = 0  # requests served by a fetch already in flight
+
+    def find(self, key: Hashable, start: date, end: date) -> Optional[FlightT]:
+        for flight in self._flights.get(key, []):
+            if flight.start <= start and end <= flight.end:
+                return flight
+        return None
+
+    def add(self, key: Hashable, flight: FlightT) -> None:
+        self._flights.setdefault(key, []).append(flight)
+
+    def remove(self, key: Hashable, flight: FlightT) -> None:
+        flights = self._flights[key]
+        flights.remove(flight)
+        if not flights:
+            del self._flights[key]
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent fetches across threads: a request whose date range is
+    covered by a fetch already in flight for the same key waits for that fetch
+    and shares its result, instead of calling the provider again.
+    The result is shared as is: callers take copies of it sliced to their own
+    range (see `slice_ohlcv`) before modifying it.
+    """
+
+    def __init__(self) -> None:
+        self._flights: _Flights[_ThreadFlight] = _Flights()
+        self._lock = Lock()
+
+    @property
+    def leaders(self) -> int:
+        return self._flights.leaders
+
+    @property
+    def followers(self) -> int:
+        return self._flights.followers
+
+    def do(self, key: Hashable, start: date, end: date, fetch: Callable[[], T]) -> T:
+        """Run `fetch()` for [start, end], or wait for a flight covering that range."""
+        leader: Optional[_ThreadFlight] = None
+        with self._lock:
+            flight = self._flights.find(key, start, end)
+            if flight is not None:
+                self._flights.followers += 1
+            else:
+                flight = _ThreadFlight(start, end)
+                self._flights.add(key, flight)
+                self._flights.leaders += 1
+                leader = flight
+
+        if flight is not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fetch()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.remove(key, flight)
+            flight.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Asyncio counterpart of `SingleFlight`, coalescing fetches across tasks.
+
+    The fetch runs as a task of its own, awaited by every caller through
+    `asyncio.shield`: a cancelled caller (e.g. timed out by `asyncio.wait_for`)
+    stops waiting without cancelling the fetch the other callers share.
+    """
+
+    def __init__(self) -> None:
+        # Futures are bound to a loop, so keep one set of flights per loop
+        self._loops: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        start: date,
+        end: date,
+        fetch: Callable[[], Awaitable[T]],
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        flights: _Flights[_TaskFlight] = self._loops.setdefault(loop, _Flights())
+
+        flight = flights.find(key, start, end)
+        if flight is not None and flight.task is not None:
+            self.followers += 1
+        else:
+            flight = _TaskFlight(start, end, task=asyncio.ensure_future(fetch()))
+            flights.add(key, flight)
+            self.leaders += 1
+
+            def done(task: asyncio.Future, flight: _TaskFlight = flight) -> None:
+                flights.remove(key, flight)
+                if not task.cancelled():
+                    # Retrieved even if every caller detached, avoid "never retrieved" warnings
+                    task.exception()
+
+            flight.task.add_done_callback(done)
+
+        return await asyncio.shield(flight.task)  # type: ignore
@@ -0,0 +1,130 @@
+from pathlib import Path
+from typing import List, Optional, Union
+
+import json
+import numpy as np
+import pandas as pd
+
+from ..core import OHLCVData
+
+
+PathLike = Union[str, Path]
+
+
+def _require_pyarrow(fmt: str) -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            f'{fmt} support requires pyarrow. Install it with `pip install "dumbmoney[cache]"`.'
+        ) from e
+
+
+def _check_file(filepath: PathLike, fmt: str) -> None:
+    if not Path(filepath).exists():
+        raise FileNotFoundError(f"{fmt} file not found: {filepath}")
+
+
+def export_ohlcv_to_parquet(ohlcv: OHLCVData, filepath: PathLike) -> None:
+    """Save OHLCV data as Parquet, keeping dtypes and the date index exactly."""
+    _require_pyarrow("Parquet")
+    ohlcv.to_parquet(filepath, index=True)
+
+
+def load_ohlcv_from_parquet(
+    filepath: PathLike,
+    columns: Optional[List[str]] = None,
+    memory_map: bool = True,
+) -> OHLCVData:
+    """Load OHLCV data saved by `export_ohlcv_to_parquet`, optionally only some columns."""
+    _require_pyarrow("Parquet")
+    _check_file(filepath, "Parquet")
+    return pd.read_parquet(filepath, columns=columns, memory_map=memory_map)  # type: ignore
+
+
+def export_ohlcv_to_feather(ohlcv: OHLCVData, filepath: PathLike) -> None:
+    """Save OHLCV data as uncompressed Feather, which can be memory-mapped."""
+    _require_pyarrow("Feather")
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = pa.Table.from_pandas(ohlcv, preserve_index=True)
+    feather.write_feather(table, str(filepath), compression="uncompressed")
+
+
+def load_ohlcv_from_feather(
+    filepath: PathLike,
+    columns: Optional[List[str]] = None,
+    memory_map: bool = True,
+) -> OHLCVData:
+    """
+    Load OHLCV data saved by `export_ohlcv_to_feather`. With `memory_map`, numeric
+    columns without nulls are backed by the mapped file rather than copied.
+    """
+    _require_pyarrow("Feather")
+    _check_file(filepath, "Feather")
+    import pyarrow.feather as feather
+
+    if columns is not None:
+        schema = feather.read_table(str(filepath), columns=[], memory_map=True).schema
+        index_cols = [
+            col
+            for col in (schema.pandas_metadata or {}).get("index_columns", [])
+            if isinstance(col, str)
+        ]
+        columns = index_cols + [col for col in columns if col not in index_cols]
+    table = feather.read_table(str(filepath), columns=columns, memory_map=memory_map)
+    return table.to_pandas(split_blocks=True)  # type: ignore
+
+
+def export_ohlcv_to_npy(ohlcv: OHLCVData, dirpath: PathLike) -> None:
+    """
+    Save OHLCV data as a directory of NumPy arrays: `index.npy`, one `<column>.npy`
+    per column, and `meta.json`. Only numeric, boolean and datetime columns are supported.
+    """
+    # Anything else (object, category, string, tz-aware...) would be pickled, which
+    # np.load can't memory-map
+    unsupported = [
+        col
+        for col, dtype in ohlcv.dtypes.items()
+        if not isinstance(dtype, np.dtype) or dtype.kind not in "biufmM"
+    ]
+    if unsupported:
+        raise ValueError(
+            f"Columns {unsupported} can't be saved as .npy, use Parquet or Feather instead."
+        )
+    path = Path(dirpath)
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / "index.npy", ohlcv.index.to_numpy())
+    for col in ohlcv.columns:
+        np.save(path / f"{col}.npy", ohlcv[col].to_numpy())
+    meta = {"index_name": ohlcv.index.name, "columns": list(ohlcv.columns)}
+    (path / "meta.json").write_text(json.dumps(meta))
+
+
+def load_ohlcv_from_npy(
+    dirpath: PathLike,
+    columns: Optional[List[str]] = None,
+    memory_map: bool = True,
+) -> OHLCVData:
+    """
+    Load OHLCV data saved by `export_ohlcv_to_npy`. With `memory_map`, columns are
+    read-only views of the mapped files: pages are only read when touched, and
+    the frame should be copied before being modified.
+    """
+    path = Path(dirpath)
+    _check_file(path / "meta.json", "NumPy")
+    meta = json.loads((path / "meta.json").read_text())
+    mmap_mode = "r" if memory_map else None
+
+    cols = meta["columns"] if columns is None else columns
+    missing = [col for col in cols if col not in meta["columns"]]
+    if missing:
+        raise KeyError(f"Columns not found in {dirpath}: {missing}")
+
+    index = pd.DatetimeIndex(
+        np.load(path / "index.npy", mmap_mode=mmap_mode), name=meta["index_name"]
+    )
+    data = {col: np.load(path / f"{col}.npy", mmap_mode=mmap_mode) for col in cols}
+    # copy=False keeps one block per column, backed by its array
+    return pd.DataFrame(data, index=index, columns=cols, copy=False)  # type: ignore
@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple
+
+import asyncio
+import random
+import time
+
+
+# Substrings of provider error messages signalling a quota/rate limit hit
+_RATE_LIMIT_MARKERS = (
+    "429",
+    "too many requests",
+    "rate limit",
+    "最多访问",  # tushare: 抱歉，您每分钟最多访问该接口xxx次
+    "访问频率",
+)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Default classification of provider errors worth retrying:
+    network failures, timeouts and rate limit responses.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        from requests.exceptions import ConnectionError as RequestsConnectionError
+        from requests.exceptions import Timeout
+
+        if isinstance(error, (RequestsConnectionError, Timeout)):
+            return True
+    except ImportError:
+        pass
+    message = str(error).lower()
+    return any(marker in message for marker in _RATE_LIMIT_MARKERS)
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `calls_per_minute` calls on average,
+    with bursts of up to `burst` calls.
+
+    Callers reserve a token and sleep for the returned delay outside the lock,
+    so the same limiter serves both threads and asyncio tasks.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if calls_per_minute <= 0:
+            raise ValueError("calls_per_minute must be positive.")
+        self.rate = calls_per_minute / 60.0  # tokens per second
+        # Default burst: one second worth of calls, at least one
+        self.capacity = float(burst) if burst else max(1.0, self.rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = Lock()
+
+    def reserve(self) -> float:
+        """Take a token, returning how many seconds to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a call is allowed."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait on the event loop until a call is allowed."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_limiters: Dict[Tuple[str, float], RateLimiter] = {}
+_limiters_lock = Lock()
+
+
+def get_rate_limiter(
+    name: str, calls_per_minute: Optional[float]
+) -> Optional[RateLimiter]:
+    """
+    Return the process-wide rate limiter of a provider, so that every service
+    using the same provider shares its quota.
+    """
+    if not calls_per_minute:
+        return None
+    with _limiters_lock:
+        key = (name, calls_per_minute)
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(calls_per_minute)
+        return _limiters[key]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Jittered exponential backoff for retryable provider errors."""
+
+    max_attempts: int = 3
+    base_delay: float = 1.0  # seconds
+    max_delay: float = 30.0  # seconds
+    jitter: float = 0.5  # fraction of the delay that is randomized
+
+    def delay(self, attempt: int) -> float:
+        """Backoff delay after the given (0-based) failed attempt."""
+        delay = min(self.max_delay, self.base_delay * (2**attempt))
+        return delay * (1.0 - self.jitter * random.random())
@@ -1,5 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import date
+from datetime import date, timedelta
 from functools import lru_cache
 from typing import Optional, List, Union, Literal
 
@@ -14,8 +15,12 @@ from tigeropen.common.consts import (
 from tigeropen.tiger_open_config import TigerOpenClientConfig
 from tigeropen.quote.quote_client import QuoteClient
 
-from .feed import AdjustType, BaseFeed, StockMarket
-from ..core import OHLCVData, StockDetails, normalize_ohlcv
+from .feed import AdjustType, BaseFeed, StockMarket, infer_stock_market
+from .registry import TIGER_SPEC
+from .throttle import get_rate_limiter
+from .universe import market_exchange
+from .ingest import dates_from_epoch_ms, ohlcv_from_frame
+from ..core import OHLCVData, StockDetails, empty_ohlcv
 from ..logger import logger
 
 
@@ -57,7 +62,9 @@ class TigerFeed(BaseFeed):
 
     config: Optional[TigerConfig] = field(default=None)
 
-    name: str = "Tiger"
+    name: str = TIGER_SPEC.name
+    max_concurrency: int = TIGER_SPEC.max_concurrency
+    calls_per_minute: Optional[float] = TIGER_SPEC.calls_per_minute
 
     tiger_client: QuoteClient = field(init=False)
 
@@ -65,6 +72,10 @@ class TigerFeed(BaseFeed):
         "time": "date",
     }
 
+    details_batch_size: int = 50  # max symbols per get_stock_details request
+    page_limit: int = 1000  # max bars per get_bars request
+    page_concurrency: int = 2  # date windows of a long range fetched in parallel
+
     adjust_map = {
         "none": QuoteRight.NR,
         "forward": None,
@@ -87,7 +98,7 @@ class TigerFeed(BaseFeed):
 
     @classmethod
     def markets(cls) -> Union[List[StockMarket], Literal["*"]]:
-        return "*"
+        return TIGER_SPEC.markets
 
     def get_ohlcv(
         self,
@@ -106,23 +117,86 @@ class TigerFeed(BaseFeed):
             f"Tiger: fetching {symbol} from {start_str} to {end_str} with adjust={adjust}"
         )
 
-        bars = self.tiger_client.get_bars(
-            symbols=code,
-            period=BarPeriod.DAY,
-            begin_time=start_str,
-            end_time=end_str,
-            right=self.adjust_map[adjust],
+        # Page tokens chain requests, so long ranges are split into date windows
+        # of at most `page_limit` days (hence bars) that can be fetched in parallel.
+        # Windows share their boundary day, duplicates are dropped below.
+        windows = []
+        cursor = start
+        while True:
+            window_end = min(end, cursor + timedelta(days=self.page_limit))
+            windows.append((cursor, window_end))
+            if window_end >= end:
+                break
+            cursor = window_end
+
+        right = self.adjust_map[adjust]
+        if len(windows) == 1:
+            pages = self._get_bars_pages(code, start, end, right, first=True)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.page_concurrency, len(windows))
+            ) as executor:
+                window_pages = executor.map(
+                    lambda i: self._get_bars_pages(
+                        code, *windows[i], right, first=(i == 0)
+                    ),
+                    range(len(windows)),
+                )
+                pages = [page for window in window_pages for page in window]
+
+        if not pages:
+            return empty_ohlcv()
+
+        # Single concatenation of all pages
+        bars = pd.concat(pages, ignore_index=True)
+        bars = bars.drop_duplicates(subset="time", keep="last")
+
+        return ohlcv_from_frame(
+            bars,
+            dates_from_epoch_ms(bars["time"].to_numpy()),
+            fields=fields,
+            rename=self.rename_map,
+            drop=("next_page_token",),
         )
 
-        df = bars.rename(columns=self.rename_map)
-        df["date"] = pd.to_datetime(df["date"], unit="ms")
-
-        if df["next_page_token"].notnull().any():
-            logger.warning(
-                f"Data for {symbol} from Tiger has more pages. Only the first page is fetched."
+    def _get_bars_pages(
+        self,
+        code: str,
+        start: date,
+        end: date,
+        right: Optional[QuoteRight],
+        first: bool = False,
+    ) -> List[pd.DataFrame]:
+        """
+        Fetch the daily bars of a date window, following `next_page_token`.
+        Requests beyond the first one of a call take a token from the feed's rate limiter.
+        """
+        limiter = get_rate_limiter(self.name, self.calls_per_minute)
+        pages: List[pd.DataFrame] = []
+        page_token = None
+        while True:
+            if limiter is not None and not (first and page_token is None):
+                limiter.acquire()
+            bars = self.tiger_client.get_bars(
+                symbols=code,
+                period=BarPeriod.DAY,
+                begin_time=start.strftime("%Y-%m-%d"),
+                end_time=end.strftime("%Y-%m-%d"),
+                right=right,
+                limit=self.page_limit,
+                page_token=page_token,
             )
-
-        return normalize_ohlcv(pd.DataFrame(df), fields=fields)
+            if bars is None or bars.empty:
+                break
+            pages.append(bars)
+            page_token = (
+                bars["next_page_token"].iloc[-1]
+                if "next_page_token" in bars.columns
+                else None
+            )
+            if not page_token or pd.isna(page_token):
+                break
+        return pages
 
     def get_stock_details(self, symbol: str) -> Union[StockDetails, None]:
         try:
@@ -178,3 +252,44 @@ class TigerFeed(BaseFeed):
             is_etf=dict_details.get("etf", 0) != 0,
             tags=tags,
         )
+
+    def get_universe(self, market: Literal["CN", "HK", "US"]) -> Optional[pd.DataFrame]:
+        if market == "US":
+            return None
+
+        logger.debug(f"Tiger: fetching all listings of {market}")
+
+        tiger_market = Market.HK if market == "HK" else Market.CN
+        codes = self.tiger_client.get_symbols(market=tiger_market)
+        if not codes:
+            return None
+
+        # The service throttles the first request, the batches take their own tokens
+        limiter = get_rate_limiter(self.name, self.calls_per_minute)
+        frames = []
+        for i in range(0, len(codes), self.details_batch_size):
+            batch = codes[i : i + self.details_batch_size]
+            if limiter is not None:
+                limiter.acquire()
+            details = self.tiger_client.get_stock_details(batch, lang="zh_CN")
+            if details is not None and not details.empty:
+                frames.append(details)
+
+        if not frames:
+            return None
+
+        df = pd.concat(frames, ignore_index=True)
+        markets = df["symbol"].map(
+            lambda code: infer_stock_market(f"{code}.HK" if market == "HK" else code)[1]
+        )
+        return pd.DataFrame(
+            {
+                "symbol": df["symbol"],
+                "name": df.get("name"),
+                "exchange": markets.map(market_exchange),
+                "listing_date": pd.to_datetime(df.get("listing_date"), unit="ms"),
+                "total_shares": df.get("shares"),
+                "float_shares": df.get("float_shares"),
+                "is_etf": df.get("etf", 0) != 0,
+            }
+        )
@@ -6,8 +6,12 @@ from typing import List, Optional, Literal, Union
 import os
 import pandas as pd
 
-from .feed import AdjustType, BaseFeed, StockMarket
-from ..core import OHLCVData, StockDetails, normalize_ohlcv
+from .adjust import empty_factors
+from .feed import AdjustType, BaseFeed, StockMarket, infer_stock_market
+from .registry import TUSHARE_SPEC
+from .universe import market_exchange
+from .ingest import dates_from_strings, ohlcv_from_frame
+from ..core import OHLCVData, StockDetails, empty_ohlcv
 from ..logger import logger
 
 import tushare as ts
@@ -28,7 +32,9 @@ def get_tushare_pro(api_token: Optional[str] = None) -> DataApi:
 class TushareFeed(BaseFeed):
     """Data feed backed by Tushare."""
 
-    name: str = "Tushare"
+    name: str = TUSHARE_SPEC.name
+    max_concurrency: int = TUSHARE_SPEC.max_concurrency
+    calls_per_minute: Optional[float] = TUSHARE_SPEC.calls_per_minute
 
     api_token: Optional[str] = field(default_factory=lambda: os.getenv("TUSHARE_TOKEN"))
     pro: DataApi = field(init=False)
@@ -50,14 +56,7 @@ class TushareFeed(BaseFeed):
 
     @classmethod
     def markets(cls) -> Union[List[StockMarket], Literal["*"]]:
-        return [
-            StockMarket.SH,
-            StockMarket.SZ,
-            StockMarket.KCB,
-            StockMarket.HK,
-            StockMarket.ETF_SH,
-            StockMarket.ETF_SZ,
-        ]
+        return TUSHARE_SPEC.markets
 
     def get_ohlcv(
         self,
@@ -97,15 +96,17 @@ class TushareFeed(BaseFeed):
                 end_date=end_str,
             )
 
-        df = df.rename(columns=self.rename_map)
-        df["date"] = pd.to_datetime(df["date"])
-
-        # filter df by date range
-        df = df[
-            (df["date"] >= pd.to_datetime(start)) & (df["date"] <= pd.to_datetime(end))
-        ]
-
-        return normalize_ohlcv(pd.DataFrame(df), fields=fields)
+        if df is None or df.empty:
+            return empty_ohlcv()
+
+        return ohlcv_from_frame(
+            df,
+            dates_from_strings(df["trade_date"], format="%Y%m%d"),
+            start,
+            end,
+            fields=fields,
+            rename=self.rename_map,
+        )
 
     def get_stock_details(self, symbol: str) -> Union[StockDetails, None]:
         try:
@@ -148,3 +149,78 @@ class TushareFeed(BaseFeed):
             if pd.notna(df.iloc[0]["industry"])
             else [],
         )
+
+    def get_universe(self, market: Literal["CN", "HK", "US"]) -> Optional[pd.DataFrame]:
+        if market != "CN":
+            return None
+
+        logger.debug("Tushare: fetching all listed A-shares and ETFs")
+
+        # One request for all listed stocks, one for all exchange-traded funds
+        stocks = self.pro.stock_basic(
+            list_status="L",
+            fields="ts_code,name,industry,exchange,list_date",
+        )
+        funds = self.pro.fund_basic(
+            market="E",
+            status="L",
+            fields="ts_code,name,list_date",
+        )
+
+        frames = []
+        if stocks is not None and not stocks.empty:
+            stocks = stocks.assign(is_etf=False)
+            frames.append(stocks)
+        if funds is not None and not funds.empty:
+            markets = funds["ts_code"].map(lambda c: infer_stock_market(c)[1])
+            funds = funds[markets.isin([StockMarket.ETF_SH, StockMarket.ETF_SZ])]
+            funds = funds.assign(
+                is_etf=True,
+                exchange=markets[funds.index].map(market_exchange),
+            )
+            frames.append(funds)
+
+        if not frames:
+            return None
+
+        df = pd.concat(frames, ignore_index=True)
+        df["symbol"] = df["ts_code"].str.split(".").str[0]
+        df["listing_date"] = pd.to_datetime(
+            df["list_date"], format="%Y%m%d", errors="coerce"
+        )
+        return df
+
+    def get_adj_factors(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+    ) -> Optional[pd.DataFrame]:
+        code, market = self.check_symbol(symbol)
+
+        logger.debug(f"Tushare: fetching adjustment factors of {symbol}")
+
+        ts_code = f"{code}.{market.value.split('_')[-1]}"
+        start_str = start.strftime("%Y%m%d")
+        end_str = end.strftime("%Y%m%d")
+
+        if market in [StockMarket.SH, StockMarket.SZ, StockMarket.KCB]:
+            df = self.pro.adj_factor(
+                ts_code=ts_code, start_date=start_str, end_date=end_str
+            )
+        elif market in [StockMarket.ETF_SH, StockMarket.ETF_SZ]:
+            df = self.pro.fund_adj(
+                ts_code=ts_code, start_date=start_str, end_date=end_str
+            )
+        else:
+            return None
+
+        if df is None or df.empty:
+            return empty_factors()
+
+        return pd.DataFrame(
+            {"adj_factor": df["adj_factor"].to_numpy(dtype="float64")},
+            index=pd.DatetimeIndex(
+                pd.to_datetime(df["trade_date"], format="%Y%m%d"), name="date"
+            ),
+        ).sort_index()
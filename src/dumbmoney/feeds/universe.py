@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+from typing import List, Literal, Optional
+
+import pandas as pd
+
+from .feed import StockMarket, infer_stock_market
+from ..core import StockDetails
+
+
+UniverseMarket = Literal["CN", "HK", "US"]
+
+# Columns of a universe table, indexed by code ("600519", "00700", "AAPL")
+UNIVERSE_DTYPES = {
+    "name": "object",
+    "exchange": "object",
+    "listing_date": "datetime64[ns]",
+    "total_shares": "float64",
+    "float_shares": "float64",
+    "is_etf": "bool",
+    "industry": "object",
+}
+
+_EXCHANGES = ("NYSE", "NASDAQ", "HKEX", "SSE", "SZSE")
+
+
+def universe_market(market: StockMarket) -> Optional[UniverseMarket]:
+    """Return the universe a market belongs to, None for unknown markets."""
+    if market == StockMarket.US:
+        return "US"
+    if market == StockMarket.HK:
+        return "HK"
+    if market == StockMarket.UNKNOWN:
+        return None
+    return "CN"
+
+
+def market_exchange(market: StockMarket) -> Optional[str]:
+    """Return the exchange of a CN/HK market."""
+    if market in [StockMarket.SH, StockMarket.ETF_SH, StockMarket.KCB]:
+        return "SSE"
+    if market in [StockMarket.SZ, StockMarket.ETF_SZ]:
+        return "SZSE"
+    if market == StockMarket.HK:
+        return "HKEX"
+    return None
+
+
+def normalize_code(code: str, market: UniverseMarket) -> str:
+    code = code.strip().upper()
+    return code.zfill(5) if market == "HK" else code
+
+
+def empty_universe() -> pd.DataFrame:
+    """Return an empty universe table."""
+    return normalize_universe(pd.DataFrame(), "CN")
+
+
+def normalize_universe(df: pd.DataFrame, market: UniverseMarket) -> pd.DataFrame:
+    """
+    Normalize a listings table to the universe columns.
+
+    The code is taken from a `symbol` column, or the index if there is none.
+    Missing columns are filled with nulls, unknown columns are dropped.
+    """
+    if "symbol" in df.columns:
+        df = df.set_index("symbol")
+    df = df.reindex(columns=list(UNIVERSE_DTYPES))
+    df.index = pd.Index(
+        [normalize_code(str(code), market) for code in df.index], name="symbol"
+    )
+    df["exchange"] = df["exchange"].where(df["exchange"].isin(_EXCHANGES), None)
+    df["is_etf"] = df["is_etf"].fillna(False)
+    df = df.astype(UNIVERSE_DTYPES)
+    df = df[~df.index.duplicated(keep="first")]
+    return df.sort_index()
+
+
+@dataclass
+class StockUniverse:
+    """
+    All listings of a market, as a single table indexed by code.
+    Lookups build a `StockDetails` for one symbol on demand.
+    """
+
+    market: UniverseMarket
+    table: pd.DataFrame
+
+    def __post_init__(self):
+        self.table = normalize_universe(self.table, self.market)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._code(symbol) in self.table.index
+
+    def _code(self, symbol: str) -> Optional[str]:
+        code, market = infer_stock_market(symbol)
+        if universe_market(market) != self.market:
+            return None
+        return normalize_code(code, self.market)
+
+    def symbols(self) -> List[str]:
+        """Return the codes of all listings."""
+        return self.table.index.tolist()
+
+    def lookup(self, symbol: str) -> Optional[StockDetails]:
+        """Return the details of a symbol, or None if it isn't listed."""
+        code = self._code(symbol)
+        if code is None or code not in self.table.index:
+            return None
+        row = self.table.loc[code]
+        return StockDetails(
+            symbol=code,
+            name=row["name"] if pd.notna(row["name"]) else "",
+            market=self.market,
+            exchange=row["exchange"] if pd.notna(row["exchange"]) else None,
+            listing_date=row["listing_date"].date()
+            if pd.notna(row["listing_date"])
+            else None,
+            total_shares=int(row["total_shares"])
+            if pd.notna(row["total_shares"])
+            else None,
+            float_shares=int(row["float_shares"])
+            if pd.notna(row["float_shares"])
+            else None,
+            is_etf=bool(row["is_etf"]),
+            tags=[row["industry"].strip()] if pd.notna(row["industry"]) else [],
+        )
+
+    def merge(self, other: "StockUniverse") -> "StockUniverse":
+        """
+        Merge two universes of the same market, preferring non-null values from self.
+        """
+        if other.market != self.market:
+            raise ValueError(
+                f"Cannot merge universes of {self.market} and {other.market}."
+            )
+        return StockUniverse(self.market, self.table.combine_first(other.table))
+
+    def __or__(self, other: "StockUniverse") -> "StockUniverse":
+        return self.merge(other)
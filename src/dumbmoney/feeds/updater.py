@@ -0,0 +1,183 @@
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import json
+import os
+
+from .cache import FULL_HISTORY_START, _tmp_path
+from .feed import AdjustType, infer_stock_market, last_final_date
+from .feed_service import DataFeedService, _normalize_date
+from ..logger import logger
+
+
+@dataclass
+class ManifestEntry:
+    """Update state of one symbol."""
+
+    checked_through: Optional[date] = None  # bars are stored up to this date
+    last_bar: Optional[date] = None  # date of the latest stored bar
+    updated_at: Optional[datetime] = None
+    error: Optional[str] = None  # last failure, cleared on success
+    failures: int = 0  # consecutive failed updates
+
+    def to_json(self) -> dict:
+        return {
+            key: value.isoformat() if isinstance(value, (date, datetime)) else value
+            for key, value in asdict(self).items()
+        }
+
+    @classmethod
+    def from_json(cls, entry: dict) -> "ManifestEntry":
+        def parse(key: str, type_):
+            value = entry.get(key)
+            return type_.fromisoformat(value) if value else None
+
+        return cls(
+            checked_through=parse("checked_through", date),
+            last_bar=parse("last_bar", date),
+            updated_at=parse("updated_at", datetime),
+            error=entry.get("error"),
+            failures=entry.get("failures", 0),
+        )
+
+
+@dataclass
+class UpdateManifest:
+    """Update state of a universe, kept as one JSON file written atomically."""
+
+    path: Union[str, Path]
+    entries: Dict[str, ManifestEntry] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+        if self.path.is_file():
+            raw = json.loads(self.path.read_text())
+            self.entries = {
+                symbol: ManifestEntry.from_json(entry)
+                for symbol, entry in raw["symbols"].items()
+            }
+
+    def get(self, symbol: str) -> ManifestEntry:
+        return self.entries.setdefault(symbol, ManifestEntry())
+
+    def save(self) -> None:
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        raw = {
+            "symbols": {
+                symbol: entry.to_json() for symbol, entry in self.entries.items()
+            }
+        }
+        tmp = _tmp_path(path)
+        tmp.write_text(json.dumps(raw, ensure_ascii=False))
+        os.replace(tmp, path)
+
+
+@dataclass
+class UpdateReport:
+    updated: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)  # already up to date
+    failed: Dict[str, str] = field(default_factory=dict)
+    new_bars: int = 0
+    aborted: bool = False  # stopped after too many consecutive failures
+
+
+@dataclass
+class UniverseUpdater:
+    """
+    Keep the cached histories of a universe up to date, fetching only the bars
+    added since each symbol's last update.
+
+    Progress is tracked in an `UpdateManifest` and checkpointed every
+    `checkpoint_every` symbols, so an interrupted run resumes where it stopped.
+    Bars fetched after the last checkpoint are already in the cache and aren't
+    requested again. After `max_consecutive_failures` failures in a row (e.g.
+    provider quota exhausted) the run stops, to be resumed later.
+    """
+
+    service: DataFeedService
+    manifest: UpdateManifest
+    adjust: AdjustType = "forward"
+    history_start: date = FULL_HISTORY_START  # start of newly added symbols
+    checkpoint_every: int = 50
+    max_consecutive_failures: int = 20
+    max_workers: Optional[int] = None
+
+    def __post_init__(self):
+        if self.service.cache is None:
+            raise ValueError("UniverseUpdater needs a DataFeedService with a cache")
+
+    def _start(self, symbol: str) -> date:
+        checked_through = self.manifest.get(symbol).checked_through
+        if checked_through is None:
+            return self.history_start
+        return checked_through + timedelta(days=1)
+
+    def update(self, symbols: Iterable[str], end=None) -> UpdateReport:
+        """Fetch the bars of `symbols` up to `end` (today by default) that aren't stored yet."""
+        end_date = _normalize_date(end) if end is not None else date.today()
+
+        report = UpdateReport()
+        starts: Dict[str, date] = {}
+        for symbol in dict.fromkeys(symbols):
+            start = self._start(symbol)
+            if start > end_date:
+                report.skipped.append(symbol)
+            else:
+                starts[symbol] = start
+
+        # Symbols last updated together share a start date, fetch them in batches
+        pending = sorted(starts, key=starts.__getitem__)
+        done = 0
+        consecutive_failures = 0
+        try:
+            for start, batch in groupby(pending, key=starts.__getitem__):
+                for result in self.service.get_ohlcv_many(
+                    list(batch),
+                    start,
+                    end_date,
+                    adjust=self.adjust,
+                    max_workers=self.max_workers,
+                ):
+                    entry = self.manifest.get(result.symbol)
+                    entry.updated_at = datetime.now()
+                    if result.ok:
+                        consecutive_failures = 0
+                        # The exchange's current bar may not be final, like in the cache
+                        entry.checked_through = min(
+                            end_date,
+                            last_final_date(infer_stock_market(result.symbol)[1]),
+                        )
+                        entry.error = None
+                        entry.failures = 0
+                        if result.data is not None and not result.data.empty:
+                            entry.last_bar = result.data.index[-1].date()
+                            report.new_bars += len(result.data)
+                        report.updated.append(result.symbol)
+                    else:
+                        consecutive_failures += 1
+                        entry.error = str(result.error)
+                        entry.failures += 1
+                        report.failed[result.symbol] = str(result.error)
+
+                    done += 1
+                    if done % self.checkpoint_every == 0:
+                        self.manifest.save()
+                    if consecutive_failures >= self.max_consecutive_failures:
+                        logger.warning(
+                            f"UniverseUpdater: {consecutive_failures} failures in a row, "
+                            f"stopping with {len(pending) - done} symbols left"
+                        )
+                        report.aborted = True
+                        return report
+        finally:
+            self.manifest.save()
+
+        logger.info(
+            f"UniverseUpdater: {len(report.updated)} updated, {len(report.skipped)} "
+            f"up to date, {len(report.failed)} failed, {report.new_bars} new bars"
+        )
+        return report
@@ -1,10 +1,24 @@
+from .cache import (
+    IndicatorCache,
+    IndicatorCacheStats,
+    get_indicator_cache,
+    set_indicator_cache,
+)
+from .context import ComputeContext
 from .indicator import Indicator
+from .indicator_set import IndicatorSet
 from .moving_average import MovingAverage
 from .macd import MACD
 from .rsi import RSI
 
 __all__ = [
+    "ComputeContext",
     "Indicator",
+    "IndicatorSet",
+    "IndicatorCache",
+    "IndicatorCacheStats",
+    "get_indicator_cache",
+    "set_indicator_cache",
     "MovingAverage",
     "MACD",
     "RSI",
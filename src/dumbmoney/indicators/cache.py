@@ -0,0 +1,184 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+from threading import Lock, get_ident
+from typing import TYPE_CHECKING, Callable, Optional, Union
+
+import json
+import os
+
+import pandas as pd
+
+from .context import ComputeContext
+from ..core import OHLCVData
+from ..logger import logger
+
+if TYPE_CHECKING:
+    from .indicator import Indicator
+
+
+@dataclass
+class IndicatorCacheStats:
+    hits: int = 0  # served from memory
+    disk_hits: int = 0  # served from the on-disk tier
+    misses: int = 0  # computed
+    evictions: int = 0  # dropped from memory to stay within `max_bytes`
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / requests if requests else 0.0
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator values, keyed by a fingerprint of the indicator (class,
+    params, inputs and output names) and of its input columns and dates.
+
+    Entries are kept in memory up to `max_bytes`, least recently used first out.
+    With `root`, values are also written to disk (Parquet, requires pyarrow) and
+    reloaded from there after being evicted or in a later session.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        root: Optional[Union[str, Path]] = None,
+    ) -> None:
+        if root is not None:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    'The on-disk IndicatorCache requires pyarrow. Install it with `pip install "dumbmoney[cache]"`.'
+                ) from e
+            root = Path(root).expanduser()
+            root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.root = root
+        self._entries: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._bytes = 0
+        self._stats = IndicatorCacheStats()
+        self._lock = Lock()
+
+    @staticmethod
+    def key(
+        indicator: "Indicator",
+        ohlcv: OHLCVData,
+        context: Optional[ComputeContext] = None,
+    ) -> str:
+        """
+        Fingerprint of an indicator computed on some data. The input columns are
+        fingerprinted once per `context`, for indicators computed together.
+        """
+        cls = type(indicator)
+        digest = blake2b(digest_size=20)
+        spec = {
+            "class": f"{cls.__module__}.{cls.__qualname__}",
+            "params": indicator.params,
+            "inputs": indicator.inputs,
+            "output_names": indicator.output_names,
+        }
+        digest.update(json.dumps(spec, sort_keys=True, default=repr).encode())
+        if context is None:
+            context = ComputeContext(ohlcv)
+        digest.update(context.fingerprint())
+        for col in indicator.inputs:
+            digest.update(context.fingerprint(col))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return Path(self.root) / key[:2] / f"{key}.parquet"  # type: ignore
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return cached values, from memory or disk, or None."""
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return values.copy()
+
+        if self.root is not None and self._path(key).is_file():
+            try:
+                values = pd.read_parquet(self._path(key))
+            except Exception as e:
+                logger.warning(f"IndicatorCache: ignoring unreadable entry {key}: {e}")
+            else:
+                with self._lock:
+                    self._stats.disk_hits += 1
+                self._remember(key, values)
+                return values.copy()
+
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    def put(self, key: str, values: pd.DataFrame) -> None:
+        values = values.copy()
+        self._remember(key, values)
+        if self.root is not None:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{get_ident()}.tmp")
+            values.to_parquet(tmp, index=True)
+            os.replace(tmp, path)
+
+    def _remember(self, key: str, values: pd.DataFrame) -> None:
+        size = int(values.memory_usage(index=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= int(previous.memory_usage(index=True).sum())
+            self._entries[key] = values
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= int(evicted.memory_usage(index=True).sum())
+                self._stats.evictions += 1
+
+    def get_or_compute(
+        self, key: str, compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        values = self.get(key)
+        if values is None:
+            values = compute()
+            self.put(key, values)
+        return values
+
+    def stats(self) -> IndicatorCacheStats:
+        with self._lock:
+            return IndicatorCacheStats(
+                hits=self._stats.hits,
+                disk_hits=self._stats.disk_hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop the in-memory entries and reset the stats. The on-disk tier is kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats = IndicatorCacheStats()
+
+
+_default_cache: Optional[IndicatorCache] = None
+
+
+def get_indicator_cache() -> Optional[IndicatorCache]:
+    """The cache consulted by `Indicator.compute`, None if caching is disabled."""
+    return _default_cache
+
+
+def set_indicator_cache(cache: Optional[IndicatorCache]) -> None:
+    """Replace the cache consulted by `Indicator.compute`, or disable caching with None."""
+    global _default_cache
+    _default_cache = cache
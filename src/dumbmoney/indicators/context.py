@@ -0,0 +1,95 @@
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .kernels import ewm_mean
+
+# A node is addressed by its input column name, or by the key it was computed under
+Source = Union[str, Tuple[Hashable, ...]]
+
+
+class ComputeContext:
+    """
+    Intermediate results of indicators computed on the same data (input columns,
+    differences, gains and losses, rolling and exponential means), so that each is
+    computed once however many indicators need it.
+
+    Values are 2-D arrays, time × series: `inputs` maps column names to such arrays,
+    1-D arrays or Series (e.g. an OHLCVData), read the first time they are needed.
+    """
+
+    def __init__(self, inputs: Mapping[str, Any]) -> None:
+        self.inputs = inputs
+        self._nodes: Dict[Source, np.ndarray] = {}
+        self._fingerprints: Dict[Optional[str], bytes] = {}
+        self.computed = 0  # nodes computed
+        self.reused = 0  # requests served from an already computed node
+
+    def node(self, key: Tuple[Hashable, ...], compute: Callable[[], np.ndarray]):
+        """Value of the node `key`, computed with `compute` the first time."""
+        if key in self._nodes:
+            self.reused += 1
+        else:
+            self._nodes[key] = compute()
+            self.computed += 1
+        return self._nodes[key]
+
+    def get(self, source: Source) -> np.ndarray:
+        """An input column by name, or a node already computed by its key."""
+        if isinstance(source, str):
+            return self.node(("column", source), lambda: self._read(source))
+        return self._nodes[source]
+
+    def fingerprint(self, col: Optional[str] = None) -> bytes:
+        """Digest of an input column, or of the index (dates) of `inputs` with None."""
+        if col not in self._fingerprints:
+            values = self.inputs.index if col is None else self.inputs[col]  # type: ignore
+            digest = blake2b(digest_size=20)
+            digest.update(str(values.dtype).encode())
+            array = np.ascontiguousarray(values.to_numpy())
+            if array.dtype == object:
+                digest.update(repr(array.tolist()).encode())
+            else:
+                digest.update(array.view(np.uint8).data)
+            self._fingerprints[col] = digest.digest()
+        return self._fingerprints[col]
+
+    def _read(self, col: str) -> np.ndarray:
+        values = np.asarray(self.inputs[col], dtype="float64")
+        return values[:, None] if values.ndim == 1 else values
+
+    def diff(self, source: Source) -> np.ndarray:
+        return self.node(
+            ("diff", source), lambda: pd.DataFrame(self.get(source)).diff().to_numpy()
+        )
+
+    def gain(self, source: Source) -> np.ndarray:
+        """Positive differences, 0 for falls."""
+        return self.node(
+            ("gain", source),
+            lambda: pd.DataFrame(self.diff(source)).clip(lower=0.0).to_numpy(),
+        )
+
+    def loss(self, source: Source) -> np.ndarray:
+        """Negated negative differences, 0 for rises."""
+        return self.node(
+            ("loss", source),
+            lambda: -pd.DataFrame(self.diff(source)).clip(upper=0.0).to_numpy(),
+        )
+
+    def rolling_mean(self, source: Source, window: int) -> np.ndarray:
+        """Mean of the last `window` values, NaN until there are `window` of them."""
+        return self.node(
+            ("rolling_mean", source, window),
+            lambda: (
+                pd.DataFrame(self.get(source)).rolling(window=window).mean().to_numpy()
+            ),
+        )
+
+    def ewm(self, source: Source, alpha: float) -> np.ndarray:
+        """Exponentially weighted mean, see `kernels.ewm_mean`."""
+        return self.node(
+            ("ewm", source, alpha), lambda: ewm_mean(self.get(source), alpha)
+        )
@@ -1,10 +1,23 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
 
-from ..core import OHLCVData
+from .cache import get_indicator_cache
+from .context import ComputeContext
+from ..core import OHLCVData, OHLCVPanel
 
 
 @dataclass(frozen=True)
@@ -13,6 +26,11 @@ class Indicator(ABC):
     Base class for all indicators.
     """
 
+    # Whether results may be served from the indicator cache. Indicators whose values
+    # depend on anything besides their class, params, inputs and output names must
+    # set this to False.
+    cacheable: ClassVar[bool] = True
+
     name: str
     inputs: List[str] = field(
         default_factory=list
@@ -26,6 +44,10 @@ class Indicator(ABC):
 
     ohlcv_data: Optional[OHLCVData] = field(init=False, default=None)
     indicator_values: Optional[pd.DataFrame] = field(init=False, default=None)
+    # state of update()/extend(): takes the input values of a bar, returns the outputs
+    _stream: Optional[Callable[..., Sequence[float]]] = field(
+        init=False, default=None, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         # default: single output with the same name as the indicator
@@ -46,29 +68,227 @@ class Indicator(ABC):
             )
         return self.indicator_values
 
-    def compute(self, ohlcv: OHLCVData) -> pd.DataFrame:
+    def compute(
+        self, ohlcv: OHLCVData, context: Optional[ComputeContext] = None
+    ) -> pd.DataFrame:
         """
         Compute indicator values given OHLCV data.
 
         Args:
           ohlcv (OHLCVData): OHLCVData used to compute the indicator.
+          context (ComputeContext, optional): Intermediate results on `ohlcv` shared
+            with other indicators, see `IndicatorSet`.
 
         Returns:
           pd.DataFrame: DataFrame indexed like `ohlcv` with indicator values.
+
+        With an indicator cache set (see `set_indicator_cache`), values are looked up
+        there first, so identical computations on identical data run only once.
         """
-        indicator_values = self._compute(ohlcv)
+        cache = get_indicator_cache() if self.cacheable else None
+        key = None
+        if cache is not None:
+            try:
+                key = cache.key(self, ohlcv, context)
+            except KeyError:
+                key = None  # e.g. missing input column, left for _compute to report
 
-        # Rename columns if multiple outputs
-        if isinstance(self.output_names, list) and len(self.output_names) == len(
-            indicator_values.columns
-        ):
-            indicator_values.columns = self.output_names
+        indicator_values = cache.get(key) if cache and key else None
+        if indicator_values is None:
+            if context is not None:
+                try:
+                    indicator_values = self._compute_frame(ohlcv, context)
+                except NotImplementedError:
+                    pass
+            if indicator_values is None:
+                indicator_values = self._compute(ohlcv)
+
+            # Rename columns if multiple outputs
+            if isinstance(self.output_names, list) and len(self.output_names) == len(
+                indicator_values.columns
+            ):
+                indicator_values.columns = self.output_names
+            if cache and key:
+                cache.put(key, indicator_values)
 
         # Store the computed values and input data
         object.__setattr__(self, "ohlcv_data", ohlcv)
         object.__setattr__(self, "indicator_values", indicator_values)
+        object.__setattr__(self, "_stream", None)
         return self.values
 
+    def update(self, bar: Union[pd.Series, Mapping[str, float]]) -> Dict[str, float]:
+        """
+        Append one bar and return the indicator values at it.
+
+        Args:
+          bar: The new bar, e.g. a row of OHLCVData, with (at least) the input columns.
+
+        Returns:
+          Dict[str, float]: Indicator values at the bar, by output name.
+
+        Bars continue the data of the last `compute()`, if any. Indicators with a
+        streaming implementation (`_start_stream`) take constant time per bar, the
+        others recompute their whole history. `values` isn't updated.
+        """
+        stream = self._stream or self._open_stream()
+        outputs = stream(*(float(bar[col]) for col in self.inputs))
+        return dict(zip(self._output_columns(len(outputs)), outputs))
+
+    def extend(self, bars: OHLCVData) -> pd.DataFrame:
+        """
+        Append bars, as `update` would one by one.
+
+        Returns:
+          pd.DataFrame: DataFrame indexed like `bars` with indicator values.
+        """
+        stream = self._stream or self._open_stream()
+        inputs = [bars[col].to_numpy(dtype="float64").tolist() for col in self.inputs]
+        rows = [stream(*values) for values in zip(*inputs)]
+        columns = self._output_columns(
+            len(rows[0]) if rows else len(self.output_names or [])
+        )
+        return pd.DataFrame(rows, index=bars.index, columns=columns, dtype="float64")
+
+    def _open_stream(self) -> Callable[..., Sequence[float]]:
+        history: List[List[float]] = [[] for _ in self.inputs]
+        if self.ohlcv_data is not None:
+            history = [
+                self.ohlcv_data[col].to_numpy(dtype="float64").tolist()
+                for col in self.inputs
+            ]
+
+        try:
+            stream = self._start_stream()
+            for values in zip(*history):
+                stream(*values)
+        except NotImplementedError:
+            columns = dict(zip(self.inputs, history))
+
+            def stream(*values: float) -> Sequence[float]:
+                for col, value in zip(self.inputs, values):
+                    columns[col].append(value)
+                return self._compute(pd.DataFrame(columns)).iloc[-1].tolist()
+
+        object.__setattr__(self, "_stream", stream)
+        return stream
+
+    def _start_stream(self) -> Callable[..., Sequence[float]]:
+        """
+        Start computing indicator values bar by bar. Optional, for `update`.
+
+        Returns:
+          A function taking the input values of the next bar, in the order of
+          `inputs`, and returning the outputs at that bar. The values must equal
+          those `_compute` gives on the same bars.
+        """
+        raise NotImplementedError
+
+    def _output_columns(self, count: int) -> List[str]:
+        names = self.output_names or []
+        if len(names) != count:
+            names = [f"{self.name.lower()}_{i}" for i in range(count)]
+        return list(names)
+
+    def compute_panel(
+        self, data: Union[OHLCVPanel, Mapping[str, OHLCVData]]
+    ) -> OHLCVPanel:
+        """
+        Compute indicator values for many symbols at once.
+
+        Args:
+          data: A panel, or OHLCVData by symbol (aligned on the union of their dates).
+
+        Returns:
+          OHLCVPanel: One (date × symbol) array per output name.
+
+        Each symbol is computed over its own bars only, as `compute` would: dates on
+        which an input is missing (before listing, after delisting, suspensions) are
+        skipped, and NaN in the result. Values of all symbols are packed into 2-D
+        arrays and computed together by `_compute_arrays`, if the indicator has it.
+        """
+        if not isinstance(data, OHLCVPanel):
+            data = OHLCVPanel.from_frames(dict(data), fields=self.inputs)
+        inputs = {col: data.values(col) for col in self.inputs}
+
+        # Move the bars of each symbol to the top of its column, in date order
+        valid = np.ones(data.shape, dtype=bool)
+        for values in inputs.values():
+            valid &= ~np.isnan(values)
+        rows, cols = np.nonzero(valid)
+        packed_rows = (np.cumsum(valid, axis=0) - 1)[rows, cols]
+        packed: Dict[str, np.ndarray] = {}
+        for col, values in inputs.items():
+            packed[col] = np.full(data.shape, np.nan)
+            packed[col][packed_rows, cols] = values[rows, cols]
+
+        try:
+            outputs = self._compute_arrays(packed)
+        except NotImplementedError:
+            outputs = self._compute_columns(packed, valid.sum(axis=0))
+
+        arrays: Dict[str, np.ndarray] = {}
+        for name, values in zip(self._output_columns(len(outputs)), outputs):
+            arrays[name] = np.full(data.shape, np.nan)
+            arrays[name][rows, cols] = values[packed_rows, cols]
+        return OHLCVPanel(data.dates, list(data.symbols), arrays)
+
+    def _compute_columns(
+        self, packed: Dict[str, np.ndarray], counts: np.ndarray
+    ) -> List[np.ndarray]:
+        """Fallback of `compute_panel`, computing one symbol at a time with `_compute`."""
+        shape = next(iter(packed.values())).shape
+        outputs: List[np.ndarray] = []
+        for j, n in enumerate(counts):
+            frame = pd.DataFrame({col: values[:n, j] for col, values in packed.items()})
+            values = self._compute(frame).to_numpy()  # type: ignore
+            if not outputs:
+                outputs = [np.full(shape, np.nan) for _ in range(values.shape[1])]
+            for k, output in enumerate(outputs):
+                output[:n, j] = values[:, k]
+        return outputs
+
+    def _compute_arrays(self, inputs: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        """
+        Compute indicator values of many series at once. Optional, for `compute_panel`.
+        Computed with `_compute_nodes` by default.
+
+        Args:
+          inputs: (time × series) array of each input column.
+
+        Returns:
+          List[np.ndarray]: (time × series) array of each output.
+        """
+        return self._compute_nodes(ComputeContext(inputs))
+
+    def _compute_nodes(self, context: ComputeContext) -> List[np.ndarray]:
+        """
+        Compute indicator values from the intermediate results of `context`, which
+        other indicators on the same data reuse. Optional, for `IndicatorSet`.
+
+        Returns:
+          List[np.ndarray]: (time × series) array of each output.
+        """
+        raise NotImplementedError
+
+    def _compute_frame(
+        self, ohlcv: OHLCVData, context: Optional[ComputeContext] = None
+    ) -> pd.DataFrame:
+        """`_compute` through `_compute_arrays`, or `_compute_nodes` with a context."""
+        if context is None:
+            inputs = {
+                col: ohlcv[col].to_numpy(dtype="float64")[:, None]
+                for col in self.inputs
+            }
+            outputs = self._compute_arrays(inputs)
+        else:
+            outputs = self._compute_nodes(context)
+        names = self._output_columns(len(outputs))
+        return pd.DataFrame(
+            {name: values[:, 0] for name, values in zip(names, outputs)},
+            index=ohlcv.index,
+        )
+
     @abstractmethod
     def _compute(self, ohlcv: OHLCVData) -> pd.DataFrame:
         """
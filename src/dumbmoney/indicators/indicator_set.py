@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .context import ComputeContext
+from .indicator import Indicator
+from ..core import OHLCVData
+
+
+@dataclass
+class IndicatorSet:
+    """
+    Indicators computed together on the same data, sharing their intermediate
+    results: each input column is read once, and differences, gains and losses,
+    rolling and exponential means needed by several indicators (e.g. the EMAs of an
+    EMA indicator and of MACD) are computed once.
+
+    Results equal those of computing each indicator on its own. Indicators without
+    `_compute_nodes` are computed on their own.
+    """
+
+    indicators: List[Indicator] = field(default_factory=list)
+    context: Optional[ComputeContext] = field(init=False, default=None, repr=False)
+
+    def __iter__(self) -> Iterator[Indicator]:
+        return iter(self.indicators)
+
+    def __len__(self) -> int:
+        return len(self.indicators)
+
+    def compute(self, ohlcv: OHLCVData) -> List[pd.DataFrame]:
+        """
+        Compute every indicator on `ohlcv`.
+
+        Returns:
+          List[pd.DataFrame]: Values of each indicator, in order. They are also set
+          on the indicators, as `compute` does.
+        """
+        self.context = ComputeContext(ohlcv)
+        return [indicator.compute(ohlcv, self.context) for indicator in self]
+
+    @property
+    def values(self) -> Dict[str, pd.DataFrame]:
+        """Values of the last `compute`, by indicator name."""
+        return {indicator.name: indicator.values for indicator in self}
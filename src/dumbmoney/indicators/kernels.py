@@ -0,0 +1,282 @@
+"""
+First-order recursive filters shared by the indicators, on NumPy arrays.
+
+Each kernel takes a 1-D array, or a 2-D array with time on axis 0 and one column
+per series. The loops are compiled with numba when it is installed
+(`pip install "dumbmoney[fast]"`). Otherwise 1-D inputs run as a plain Python
+loop over floats and 2-D inputs step through time with vectorized row updates.
+All paths perform the same floating point operations in the same order, so they
+give identical results, equal to pandas' for `ewm_mean`.
+
+`EWMean` and `RollingMean` are streaming counterparts, taking one value at a time
+in constant time. They reproduce pandas' `ewm().mean()` and `rolling().mean()`
+exactly, so a series built bar by bar equals the one computed at once.
+"""
+
+from collections import deque
+from typing import Deque, Optional, Union
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional dependency
+    njit = None
+
+
+NUMBA_AVAILABLE = njit is not None
+
+_MIN_ROW_VECTORIZED_COLUMNS = 32
+
+
+def ewm_alpha(
+    span: Optional[float] = None,
+    com: Optional[float] = None,
+    alpha: Optional[float] = None,
+) -> float:
+    """Smoothing factor from a span, center of mass or alpha, computed as pandas does."""
+    if alpha is not None:
+        return float(alpha)
+    if span is not None:
+        com = (span - 1) / 2.0
+    if com is None:
+        raise ValueError("One of span, com or alpha is required")
+    return 1.0 / (1.0 + com)
+
+
+def _ewm_mean_1d(x, alpha, adjust, out):
+    # Same recursion as pandas' ewm().mean() with ignore_na=False, min_periods=0
+    n = len(x)
+    if n == 0:
+        return
+    new_wt = 1.0 if adjust else alpha
+    old_wt_factor = 1.0 - alpha
+    old_wt = 1.0
+    weighted = x[0]
+    out[0] = weighted
+    for i in range(1, n):
+        cur = x[i]
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                if adjust:
+                    old_wt += new_wt
+                else:
+                    old_wt = 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+
+
+def _smma_1d(x, period, seed, start, out):
+    n = len(x)
+    for i in range(min(start, n)):
+        out[i] = np.nan
+    if start >= n:
+        return
+    prev = seed
+    out[start] = prev
+    for i in range(start + 1, n):
+        prev = (prev * (period - 1) + x[i]) / period
+        out[i] = prev
+
+
+def _ewm_mean_2d(x, alpha, adjust, out):
+    new_wt = 1.0 if adjust else alpha
+    old_wt_factor = 1.0 - alpha
+    old_wt = np.ones(x.shape[1])
+    weighted = x[0].copy()
+    out[0] = weighted
+    for i in range(1, len(x)):
+        cur = x[i]
+        started = weighted == weighted
+        observed = cur == cur
+        old_wt = np.where(started, old_wt * old_wt_factor, old_wt)
+        update = started & observed & (weighted != cur)
+        blended = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+        weighted = np.where(update, blended, weighted)
+        reset = old_wt + new_wt if adjust else 1.0
+        old_wt = np.where(started & observed, reset, old_wt)
+        weighted = np.where(~started & observed, cur, weighted)
+        out[i] = weighted
+
+
+def _smma_2d(x, period, seed, start, out):
+    out[:] = np.nan
+    rows = np.arange(len(x))
+    for j in np.unique(start):
+        if j >= len(x):
+            continue
+        cols = start == j
+        prev = seed[cols]
+        out[j, cols] = prev
+        for i in rows[j + 1 :]:
+            prev = (prev * (period - 1) + x[i, cols]) / period
+            out[i, cols] = prev
+
+
+if njit is not None:
+    _ewm_mean_1d = njit(cache=True, nogil=True)(_ewm_mean_1d)
+    _smma_1d = njit(cache=True, nogil=True)(_smma_1d)
+
+    @njit(cache=True, nogil=True)
+    def _ewm_mean_2d(x, alpha, adjust, out):  # noqa: F811
+        for j in range(x.shape[1]):
+            _ewm_mean_1d(x[:, j], alpha, adjust, out[:, j])
+
+    @njit(cache=True, nogil=True)
+    def _smma_2d(x, period, seed, start, out):  # noqa: F811
+        for j in range(x.shape[1]):
+            _smma_1d(x[:, j], period, seed[j], start[j], out[:, j])
+
+
+def _as_float_array(values) -> np.ndarray:
+    x = np.asarray(values, dtype="float64")
+    if x.ndim not in (1, 2):
+        raise ValueError(f"Expected a 1-D or 2-D array, got {x.ndim} dimensions")
+    return x
+
+
+def _by_column(x: np.ndarray) -> bool:
+    # Without numba, stepping through time with row updates only pays off with
+    # many columns: a few columns run faster as 1-D loops
+    return njit is None and x.shape[1] < _MIN_ROW_VECTORIZED_COLUMNS
+
+
+def ewm_mean(values, alpha: float, adjust: bool = False) -> np.ndarray:
+    """
+    Exponentially weighted mean along axis 0, identical to pandas'
+    `ewm(alpha=alpha, adjust=adjust).mean()`. NaNs are skipped and the last
+    mean is carried over them.
+    """
+    x = _as_float_array(values)
+    out = np.empty_like(x)
+    if len(x) == 0:
+        return out
+    if x.ndim == 2 and _by_column(x):
+        for j in range(x.shape[1]):
+            out[:, j] = ewm_mean(x[:, j], alpha, adjust)
+    elif x.ndim == 2:
+        _ewm_mean_2d(x, alpha, adjust, out)
+    elif njit is not None:
+        _ewm_mean_1d(x, alpha, adjust, out)
+    else:
+        result = [0.0] * len(x)
+        _ewm_mean_1d(x.tolist(), alpha, adjust, result)
+        out[:] = result
+    return out
+
+
+def smma(
+    values,
+    period: int,
+    seed: Union[float, np.ndarray],
+    start: Union[int, np.ndarray],
+) -> np.ndarray:
+    """
+    Wilder's smoothed moving average (SMMA, RMA) along axis 0:
+    `out[start] = seed`, then `out[i] = (out[i - 1] * (period - 1) + values[i]) / period`.
+    Values before `start` are NaN. For 2-D values, `seed` and `start` may be given per column.
+    """
+    x = _as_float_array(values)
+    out = np.empty_like(x)
+    if x.ndim == 2:
+        columns = x.shape[1]
+        seeds = np.broadcast_to(np.asarray(seed, dtype="float64"), (columns,))
+        starts = np.broadcast_to(np.asarray(start, dtype="int64"), (columns,))
+        if _by_column(x):
+            for j in range(columns):
+                out[:, j] = smma(x[:, j], period, seeds[j], starts[j])
+        else:
+            _smma_2d(x, period, np.ascontiguousarray(seeds), starts.copy(), out)
+    elif njit is not None:
+        _smma_1d(x, period, float(seed), int(start), out)
+    else:
+        result = [0.0] * len(x)
+        _smma_1d(x.tolist(), period, float(seed), int(start), result)
+        out[:] = result
+    return out
+
+
+class EWMean:
+    """Streaming `ewm_mean`: `update` takes the next value and returns the next mean."""
+
+    def __init__(self, alpha: float, adjust: bool = False) -> None:
+        self.new_wt = 1.0 if adjust else alpha
+        self.old_wt_factor = 1.0 - alpha
+        self.adjust = adjust
+        self.old_wt = 1.0
+        self.weighted = math.nan
+
+    def update(self, value: float) -> float:
+        # One iteration of `_ewm_mean_1d`; the first value is taken as is
+        if self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if value == value:
+                if self.weighted != value:
+                    self.weighted = (
+                        self.old_wt * self.weighted + self.new_wt * value
+                    ) / (self.old_wt + self.new_wt)
+                if self.adjust:
+                    self.old_wt += self.new_wt
+                else:
+                    self.old_wt = 1.0
+        elif value == value:
+            self.weighted = value
+        return self.weighted
+
+
+class RollingMean:
+    """
+    Streaming mean of the last `window` values, NaN until `window` non-NaN values
+    are in the window. Same compensated running sum as pandas' `rolling().mean()`.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.values: Deque[float] = deque()
+        self.nobs = 0
+        self.neg_ct = 0  # values with the sign bit set, to clamp rounding errors
+        self.sum = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.same_ct = 0  # trailing run of identical values
+        self.prev = math.nan
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                y = -old - self.compensation_remove
+                t = self.sum + y
+                self.compensation_remove = t - self.sum - y
+                self.sum = t
+                if math.copysign(1.0, old) < 0:
+                    self.neg_ct -= 1
+        if value == value:
+            self.nobs += 1
+            y = value - self.compensation_add
+            t = self.sum + y
+            self.compensation_add = t - self.sum - y
+            self.sum = t
+            if math.copysign(1.0, value) < 0:
+                self.neg_ct += 1
+            self.same_ct = self.same_ct + 1 if value == self.prev else 1
+            self.prev = value
+
+        if self.nobs < self.window or self.nobs == 0:
+            return math.nan
+        if self.same_ct >= self.nobs:
+            return self.prev
+        mean = self.sum / self.nobs
+        if self.neg_ct == 0 and mean < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and mean > 0:
+            return 0.0
+        return mean
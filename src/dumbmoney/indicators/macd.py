@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from typing import List, Union
+from typing import Callable, List, Sequence, Union
 
+import numpy as np
 import pandas as pd
 
+from .context import ComputeContext
 from .indicator import Indicator
+from .kernels import EWMean, ewm_alpha
 from ..core import OHLCVData
 
 
@@ -31,22 +34,33 @@ class MACD(Indicator):
         )
 
     def _compute(self, ohlcv: OHLCVData) -> pd.DataFrame:
-        col_data = ohlcv[self.inputs[0]]
+        return self._compute_frame(ohlcv)
 
-        ema_short = col_data.ewm(span=self.params["short"], adjust=False).mean()
-        ema_long = col_data.ewm(span=self.params["long"], adjust=False).mean()
-        macd_line = ema_short - ema_long
-        signal_line = macd_line.ewm(span=self.params["signal"], adjust=False).mean()
+    def _output_columns(self, count: int) -> List[str]:
+        if self.output_names and len(self.output_names) == count:
+            return list(self.output_names)
+        return ["macd", "signal", "histogram"]
+
+    def _compute_nodes(self, context: ComputeContext) -> List[np.ndarray]:
+        col = self.inputs[0]
+        short, long = self.params["short"], self.params["long"]
+
+        ema_short = context.ewm(col, ewm_alpha(span=short))
+        ema_long = context.ewm(col, ewm_alpha(span=long))
+        line = ("macd", col, short, long)
+        macd_line = context.node(line, lambda: ema_short - ema_long)
+        signal_line = context.ewm(line, ewm_alpha(span=self.params["signal"]))
         histogram = macd_line - signal_line
+        return [macd_line, signal_line, histogram]
 
-        output_names = self.output_names
-        if not output_names or len(output_names) != 3:
-            output_names = ["macd", "signal", "histogram"]
+    def _start_stream(self) -> Callable[..., Sequence[float]]:
+        ema_short = EWMean(ewm_alpha(span=self.params["short"]))
+        ema_long = EWMean(ewm_alpha(span=self.params["long"]))
+        ema_signal = EWMean(ewm_alpha(span=self.params["signal"]))
 
-        return pd.DataFrame(
-            {
-                output_names[0]: macd_line,
-                output_names[1]: signal_line,
-                output_names[2]: histogram,
-            }
-        )
+        def step(value: float) -> Sequence[float]:
+            macd_line = ema_short.update(value) - ema_long.update(value)
+            signal_line = ema_signal.update(macd_line)
+            return macd_line, signal_line, macd_line - signal_line
+
+        return step
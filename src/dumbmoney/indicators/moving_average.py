@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from typing import Literal, Union
+from typing import Callable, List, Literal, Sequence, Union
 
+import numpy as np
 import pandas as pd
 
+from .context import ComputeContext
 from .indicator import Indicator
+from .kernels import EWMean, RollingMean, ewm_alpha
 from ..core import OHLCVData
 
 
@@ -27,13 +30,23 @@ class MovingAverage(Indicator):
         )
 
     def _compute(self, ohlcv: OHLCVData) -> pd.DataFrame:
-        col_data = ohlcv[self.inputs[0]]
+        return self._compute_frame(ohlcv)
+
+    def _compute_nodes(self, context: ComputeContext) -> List[np.ndarray]:
+        col = self.inputs[0]
 
         if self.params["ma_type"] == "SMA":
-            series = col_data.rolling(window=self.params["window"]).mean()
+            return [context.rolling_mean(col, self.params["window"])]
         elif self.params["ma_type"] == "EMA":
-            series = col_data.ewm(span=self.params["window"], adjust=False).mean()
+            return [context.ewm(col, ewm_alpha(span=self.params["window"]))]
         else:
             raise ValueError(f"Unsupported MA type: {self.params['ma_type']}")
 
-        return pd.DataFrame(series)
+    def _start_stream(self) -> Callable[..., Sequence[float]]:
+        if self.params["ma_type"] == "SMA":
+            mean = RollingMean(self.params["window"])
+        elif self.params["ma_type"] == "EMA":
+            mean = EWMean(ewm_alpha(span=self.params["window"]))
+        else:
+            raise ValueError(f"Unsupported MA type: {self.params['ma_type']}")
+        return lambda value: (mean.update(value),)
@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from typing import Union
+from typing import Callable, List, Sequence, Union
 
+import numpy as np
 import pandas as pd
 
+from .context import ComputeContext
 from .indicator import Indicator
+from .kernels import RollingMean, smma
 from ..core import OHLCVData
 
 
@@ -26,42 +29,61 @@ class RSI(Indicator):
         )
 
     def _compute(self, ohlcv: OHLCVData) -> pd.DataFrame:
-        # Use Wilder's smoothing method for average gain and loss
-        col_data = ohlcv[self.inputs[0]]
+        return self._compute_frame(ohlcv)
 
-        delta = col_data.diff()
-        gain = delta.clip(lower=0.0)
-        loss = -delta.clip(upper=0.0)
+    def _compute_nodes(self, context: ComputeContext) -> List[np.ndarray]:
+        # Use Wilder's smoothing method for average gain and loss
+        col = self.inputs[0]
+        gain = context.gain(col)
+        loss = context.loss(col)
 
         period = self.params["window"]
 
         # 1) Calculate the initial average gain and loss
-        avg_gain = gain.rolling(window=period, min_periods=period).mean()
-        avg_loss = loss.rolling(window=period, min_periods=period).mean()
-
-        # Create full-length arrays for smoothed values
-        avg_gain_w = avg_gain.copy()
-        avg_loss_w = avg_loss.copy()
-
-        # 2) Apply Wilder's smoothing method
-        for i in range(period + 1, len(col_data)):
-            # previous smoothed value
-            prev_avg_gain = avg_gain_w.iat[i - 1]
-            prev_avg_loss = avg_loss_w.iat[i - 1]
+        avg_gain = context.rolling_mean(("gain", col), period)
+        avg_loss = context.rolling_mean(("loss", col), period)
 
-            current_gain = gain.iat[i]
-            current_loss = loss.iat[i]
-
-            avg_gain_w.iat[i] = (prev_avg_gain * (period - 1) + current_gain) / period
-            avg_loss_w.iat[i] = (prev_avg_loss * (period - 1) + current_loss) / period
+        # 2) Apply Wilder's smoothing method from there. The first bar has no
+        # change, so the first average (and the smoothing) starts at bar `period`
+        if len(gain) > period:
+            avg_gain = smma(gain, period, avg_gain[period], period)
+            avg_loss = smma(loss, period, avg_loss[period], period)
 
         # 3) Calculate RSI
-        rs = avg_gain_w / avg_loss_w
-        rsi = 100 - (100 / (1 + rs))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = avg_gain / avg_loss
+            rsi = 100 - (100 / (1 + rs))
 
         # Handle edge cases where avg_loss is zero
-        rsi = rsi.where(avg_loss_w != 0)
-        rsi = rsi.mask((avg_loss_w == 0) & (avg_gain_w > 0), 100.0)
-        rsi = rsi.mask((avg_loss_w == 0) & (avg_gain_w == 0), 50.0)
+        rsi = np.where(avg_loss != 0, rsi, np.nan)
+        rsi = np.where((avg_loss == 0) & (avg_gain > 0), 100.0, rsi)
+        rsi = np.where((avg_loss == 0) & (avg_gain == 0), 50.0, rsi)
+
+        return [rsi]
 
-        return pd.DataFrame(rsi)
+    def _start_stream(self) -> Callable[..., Sequence[float]]:
+        period = self.params["window"]
+        # Averages are simple means over the first `period` changes, then smoothed
+        first_gain, first_loss = RollingMean(period), RollingMean(period)
+        state = {"bars": 0, "prev": np.nan, "avg_gain": np.nan, "avg_loss": np.nan}
+
+        def step(value: float) -> Sequence[float]:
+            delta = value - state["prev"]
+            state["prev"] = value
+            gain = 0.0 if delta < 0 else delta  # as clip(), NaN stays NaN
+            loss = -(0.0 if delta > 0 else delta)
+
+            if state["bars"] <= period:
+                avg_gain, avg_loss = first_gain.update(gain), first_loss.update(loss)
+            else:
+                avg_gain = (state["avg_gain"] * (period - 1) + gain) / period
+                avg_loss = (state["avg_loss"] * (period - 1) + loss) / period
+            state.update(bars=state["bars"] + 1, avg_gain=avg_gain, avg_loss=avg_loss)
+
+            if avg_loss != 0:
+                return (100 - (100 / (1 + avg_gain / avg_loss)),)
+            if avg_gain > 0:
+                return (100.0,)
+            return (50.0 if avg_gain == 0 else np.nan,)
+
+        return step
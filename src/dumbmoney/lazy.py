@@ -0,0 +1,35 @@
+from types import ModuleType
+from typing import Dict
+
+import importlib
+import sys
+import time
+
+from .logger import logger
+
+
+_import_times: Dict[str, float] = {}
+
+
+def record_import_time(name: str, seconds: float) -> None:
+    _import_times[name] = seconds
+    logger.debug(f"Loaded {name} in {seconds * 1000:.1f} ms")
+
+
+def timed_import(name: str) -> ModuleType:
+    """Import a module on demand, recording how long the first import took."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    record_import_time(name, time.perf_counter() - started)
+    return module
+
+
+def import_times() -> Dict[str, float]:
+    """
+    Return how long (in seconds) each lazily loaded module or feed took to load,
+    e.g. {"dumbmoney.feeds": 0.61, "feed:Tushare": 0.35}.
+    """
+    return dict(_import_times)
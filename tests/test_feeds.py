@@ -1,9 +1,16 @@
 import os
+import numpy as np
 import pandas as pd
 import asyncio
 import pytest
+import threading
+import time
 
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
 
 from dumbmoney import (
     get_ohlcv,
@@ -11,7 +18,28 @@ from dumbmoney import (
     export_ohlcv_to_csv,
     get_stock_details,
 )
-from tests import OUTPUT_DIR
+from dumbmoney.core import StockDetails, empty_ohlcv, normalize_ohlcv
+from dumbmoney.feeds.throttle import RateLimiter, RetryPolicy
+from dumbmoney.feeds import (
+    AsyncDataFeedService,
+    BaseFeed,
+    DataFeedService,
+    FeedRouter,
+    FullHistoryCache,
+    OHLCVCache,
+    StockDetailsCache,
+)
+from dumbmoney.feeds.feed import StockMarket
+from dumbmoney.feeds.routing import HedgePolicy
+from dumbmoney.feeds.storage import (
+    export_ohlcv_to_feather,
+    export_ohlcv_to_npy,
+    export_ohlcv_to_parquet,
+    load_ohlcv_from_feather,
+    load_ohlcv_from_npy,
+    load_ohlcv_from_parquet,
+)
+from tests import INPUT_DIR, OUTPUT_DIR
 
 
 symbols = [
@@ -109,3 +137,1099 @@ async def test_get_stock_details():
         # rate limit
         print("waiting for 6 seconds to respect rate limits...")
         await asyncio.sleep(6)
+
+
+@dataclass
+class StubFeed(BaseFeed):
+    """
+    Offline feed for the service tests, recording the calls it receives.
+
+    Bars are business days priced by their day of the year, so that overlapping
+    requests agree; forward adjusted prices are multiplied by `scale`. Each call
+    takes `delay` seconds, `failing` symbols raise a connection error and the first
+    `flaky` bar requests a rate limit error. Calls are not retried unless `retry`
+    says so. Details, CN listings, adjustment factors (a dividend on `dividend`
+    raising the cumulative factor to 1.1) and full KCB histories are served when
+    configured.
+    """
+
+    name: str = "Stub"
+    retry: RetryPolicy = field(default_factory=lambda: RetryPolicy(max_attempts=1))
+    delay: float = 0.0
+    failing: List[str] = field(default_factory=list)
+    flaky: int = 0
+    scale: float = 1.0
+    details: Optional[StockDetails] = None
+    listings: Optional[pd.DataFrame] = None
+    dividend: Optional[date] = None
+    full_history: Optional[Tuple[date, date]] = None  # returned for any KCB request
+    calls: List[tuple] = field(default_factory=list)
+    factor_calls: List[tuple] = field(default_factory=list)
+    in_flight: int = 0
+    max_in_flight: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        if self.full_history is not None:
+            self.full_history_markets = (StockMarket.KCB,)
+
+    @classmethod
+    def markets(cls):
+        return "*"
+
+    def _call(self, *call):
+        with self.lock:
+            self.calls.append(call)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def get_ohlcv(self, symbol, start, end, adjust="forward", fields=None):
+        if self.full_history is not None and symbol.startswith("688"):
+            assert start <= self.full_history[0]
+            start, end = self.full_history
+        self._call(symbol, start, end, adjust)
+        if symbol in self.failing:
+            raise ConnectionError(f"{symbol} unavailable")
+        if len(self.calls) <= self.flaky:
+            raise RuntimeError("429 Too Many Requests")
+        index = pd.bdate_range(start, end, name="date")
+        if index.empty:
+            return empty_ohlcv()
+        close = pd.Series(index.dayofyear, index=index, dtype="float64")
+        if adjust == "forward":
+            close = close * self.scale
+        df = pd.DataFrame(
+            {
+                "open": close,
+                "high": close + 1,
+                "low": close - 1,
+                "close": close,
+                "volume": 1000.0,
+                "amount": close * 1000,
+            },
+            index=index,
+        )
+        return normalize_ohlcv(df, fields=fields)
+
+    def get_stock_details(self, symbol):
+        self._call(symbol, None, None)
+        return self.details
+
+    def get_universe(self, market):
+        if self.listings is None:
+            return None
+        self._call(market, None, None)
+        return self.listings if market == "CN" else None
+
+    def get_adj_factors(self, symbol, start, end):
+        if self.dividend is None:
+            return None
+        self.factor_calls.append((start, end))
+        index = pd.bdate_range(start, end, name="date")
+        factor = [1.0 if day < pd.Timestamp(self.dividend) else 1.1 for day in index]
+        return pd.DataFrame({"adj_factor": factor}, index=index)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """An empty on-disk OHLCV cache."""
+    pytest.importorskip("pyarrow")
+    return OHLCVCache(tmp_path / "cache")
+
+
+def test_ohlcv_cache_gap_filling(cache):
+    feed = StubFeed()
+    # Without re-fetching cached bars to check for adjustment drift
+    service = DataFeedService(feeds=[feed], cache=cache, drift_check_bars=0)
+
+    first = service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31")
+    assert len(feed.calls) == 1
+
+    # Same range is served from the cache, symbol suffix is optional
+    again = service.get_ohlcv("600519", "2024-01-01", "2024-03-31")
+    assert len(feed.calls) == 1
+    pd.testing.assert_frame_equal(first, again, check_freq=False)
+
+    # Only the missing tail is fetched
+    extended = service.get_ohlcv("600519.SH", "2024-02-01", "2024-06-30", fields=[])
+    assert feed.calls[-1][1:3] == (date(2024, 4, 1), date(2024, 6, 30))
+    assert list(extended.columns) == ["open", "high", "low", "close", "volume"]
+    assert extended.index.min() == pd.Timestamp("2024-02-01")
+    assert extended.index.max() == pd.Timestamp("2024-06-28")
+
+    # Weekend-only gaps are not fetched
+    calls = len(feed.calls)
+    service.get_ohlcv("600519.SH", "2024-06-29", "2024-06-30")
+    assert len(feed.calls) == calls
+
+
+def test_last_final_date():
+    from zoneinfo import ZoneInfo
+
+    from dumbmoney.feeds.feed import last_final_date
+
+    # 02:00 in Beijing is still the previous afternoon in New York
+    now = datetime(2024, 3, 5, 2, 0, tzinfo=ZoneInfo("Asia/Shanghai"))
+    assert last_final_date(StockMarket.SH, now) == date(2024, 3, 4)
+    assert last_final_date(StockMarket.HK, now) == date(2024, 3, 4)
+    assert last_final_date(StockMarket.US, now) == date(2024, 3, 3)
+    assert last_final_date(StockMarket.UNKNOWN, datetime(2024, 3, 5)) == date(
+        2024, 3, 4
+    )
+
+
+def test_ohlcv_many_concurrency():
+    feed = StubFeed(delay=0.05, max_concurrency=3, failing=["000002.SZ"])
+    service = DataFeedService(feeds=[feed])
+    symbols = [f"{600000 + i}.SH" for i in range(12)] + ["000002.SZ"]
+
+    results = list(
+        service.get_ohlcv_many(symbols, "2024-01-01", "2024-01-31", max_workers=8)
+    )
+
+    assert sorted(r.symbol for r in results) == sorted(symbols)
+    assert feed.max_in_flight == 3
+    failed = [r for r in results if not r.ok]
+    assert [r.symbol for r in failed] == ["000002.SZ"]
+    assert "unavailable" in str(failed[0].error)
+    assert all(not r.data.empty for r in results if r.ok)
+
+
+@pytest.mark.asyncio
+async def test_async_feed_service():
+    feed = StubFeed(delay=0.05, max_concurrency=4, failing=["000002.SZ"])
+    service = AsyncDataFeedService(feeds=[feed])
+    symbols = [f"{600000 + i}.SH" for i in range(8)] + ["000002.SZ"]
+
+    started = time.perf_counter()
+    results = [
+        r async for r in service.get_ohlcv_many(symbols, "2024-01-01", "2024-01-31")
+    ]
+    elapsed = time.perf_counter() - started
+
+    assert sorted(r.symbol for r in results) == sorted(symbols)
+    assert [r.symbol for r in results if not r.ok] == ["000002.SZ"]
+    assert feed.max_in_flight == 4
+    assert elapsed < 0.05 * len(symbols)  # calls overlap instead of running serially
+
+    df = await service.get_ohlcv("600000.SH", date(2024, 1, 1), date(2024, 1, 31))
+    assert not df.empty
+
+
+def test_rate_limiter_token_bucket():
+    now = [0.0]
+    limiter = RateLimiter(calls_per_minute=120, burst=2, clock=lambda: now[0])
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(0.5)  # 2 calls per second
+    now[0] += 10.0
+    assert limiter.reserve() == 0.0  # refilled, capped at burst
+
+
+def test_retry_with_backoff():
+    retry = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02)
+    feed = StubFeed(flaky=2, retry=retry)
+    service = DataFeedService(feeds=[feed])
+    df = service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    assert not df.empty
+    assert len(feed.calls) == 3
+
+    # Non-retryable errors fall through to the next feed immediately
+    broken = StubFeed(name="Broken", failing=["600000.SH"], retry=retry)
+    broken.is_retryable = lambda error: False
+    backup = StubFeed(name="Backup")
+    service = DataFeedService(feeds=[broken, backup])
+    service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    assert len(broken.calls) == 1 and len(backup.calls) == 1
+
+    # Retries of one request count as a single failure for the circuit breaker
+    broken.is_retryable = lambda error: True
+    router = FeedRouter(failure_threshold=3)
+    service = DataFeedService(feeds=[broken, backup], router=router)
+    service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    assert len(broken.calls) == 4
+    assert router.stats()[("Broken", StockMarket.SH)].failures == 1
+    assert not router.is_open("Broken", StockMarket.SH)
+
+
+def test_adaptive_routing_and_circuit_breaker():
+    slow = StubFeed(name="Slow", delay=0.05)
+    fast = StubFeed(name="Fast")
+    router = FeedRouter(adaptive=True, min_calls=2)
+    service = DataFeedService(feeds=[slow, fast], router=router)
+
+    for _ in range(2):  # unmeasured feeds keep the priority order
+        service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    for _ in range(2):
+        router.record("Fast", StockMarket.SH, 0.001, ok=True)
+
+    calls = len(slow.calls)
+    service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    assert len(slow.calls) == calls  # the fast feed is preferred now
+    assert router.stats()[("Slow", StockMarket.SH)].latency >= 0.05
+
+    # A feed failing repeatedly is skipped during the cooldown
+    now = [0.0]
+    router = FeedRouter(adaptive=False, failure_threshold=2, clock=lambda: now[0])
+    down = StubFeed(name="Down", failing=["600000.SH"])
+    backup = StubFeed(name="Backup")
+    service = DataFeedService(feeds=[down, backup], router=router)
+    for _ in range(4):
+        service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    assert len(down.calls) == 2
+    assert len(backup.calls) == 4
+    assert router.is_open("Down", StockMarket.SH)
+
+    # Cooldown elapsed: a single trial call goes through, concurrent callers skip the feed
+    now[0] += 61.0
+    down.delay = 0.1
+    service = DataFeedService(feeds=[down, backup], router=router, coalesce=False)
+    threads = [
+        threading.Thread(
+            target=service.get_ohlcv, args=("600000.SH", "2024-01-01", "2024-01-31")
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(down.calls) == 3
+    assert len(backup.calls) == 8
+
+    # The trial failed: open for another cooldown, then closed by a successful trial
+    now[0] += 30.0
+    service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    assert len(down.calls) == 3
+    now[0] += 31.0
+    down.failing = []
+    service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    assert len(down.calls) == 4
+    assert not router.is_open("Down", StockMarket.SH)
+
+    # Ranking a half-open feed behind the serving one doesn't use up its trial
+    for _ in range(2):
+        router.record("Down", StockMarket.SH, None, ok=False)
+    now[0] += 61.0
+    service = DataFeedService(feeds=[backup, down], router=router)
+    service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    assert len(down.calls) == 4
+    assert router.order([down, backup], StockMarket.SH) == [down, backup]
+    service = DataFeedService(feeds=[down, backup], router=router)
+    service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31")
+    assert len(down.calls) == 5
+    assert not router.is_open("Down", StockMarket.SH)
+
+
+def test_hedged_requests():
+    stalled = StubFeed(name="Stalled", delay=0.5)
+    quick = StubFeed(name="Quick")
+    service = DataFeedService(
+        feeds=[stalled, quick],
+        hedge_policy=HedgePolicy(default_delay=0.05),
+    )
+
+    started = time.perf_counter()
+    df = service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31", hedge=True)
+    assert time.perf_counter() - started < 0.4
+    assert not df.empty
+    assert service.hedge_stats.fired == 1
+    assert service.hedge_stats.hedge_wins == 1
+    assert service.hedge_stats.wins == {"Quick": 1}
+
+    # A primary answering in time doesn't trigger a hedge
+    service = DataFeedService(
+        feeds=[quick, stalled], hedge_policy=HedgePolicy(default_delay=0.2)
+    )
+    service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31", hedge=True)
+    assert service.hedge_stats.fired == 0
+    assert service.hedge_stats.wins == {"Quick": 1}
+
+    # After a failure, the fallback feed is waited for up to its own usual latency
+    broken = StubFeed(name="Broken", failing=["600000.SH"])
+    slow = StubFeed(name="Slow", delay=0.2)
+    router = FeedRouter(adaptive=False)
+    for _ in range(3):
+        router.record("Slow", StockMarket.SH, 0.5, ok=True)
+    service = DataFeedService(
+        feeds=[broken, slow, quick],
+        router=router,
+        hedge_policy=HedgePolicy(default_delay=0.05),
+    )
+    service.get_ohlcv("600000.SH", "2024-01-01", "2024-01-31", hedge=True)
+    assert service.hedge_stats.fired == 0
+    assert service.hedge_stats.wins == {"Slow": 1}
+
+
+def test_record_replay(tmp_path):
+    from dumbmoney.feeds import RecordingFeed, ReplayFeed, ReplayProfile, replay_feeds
+    from dumbmoney.feeds.replay import ReplayMiss
+
+    feed = StubFeed(failing=["601318.SH"], scale=1 / 3, calls_per_minute=6000)
+    recording = DataFeedService(feeds=[RecordingFeed(feed, tmp_path)])
+    expected = recording.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31")
+    with pytest.raises(RuntimeError):
+        recording.get_ohlcv("601318.SH", "2024-01-01", "2024-03-31")
+
+    # Served offline, exactly as recorded, from the recorded range or one covering the request
+    (replay,) = replay_feeds(tmp_path)
+    assert (replay.name, replay.markets()) == ("Stub", "*")
+    assert replay.provides_adj_factors
+    service = DataFeedService(feeds=[replay])
+    pd.testing.assert_frame_equal(
+        service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31"),
+        expected,
+        check_exact=True,
+        check_freq=False,
+    )
+    pd.testing.assert_frame_equal(
+        service.get_ohlcv("600519.SH", "2024-02-01", "2024-02-29"),
+        expected.loc["2024-02"],
+        check_freq=False,
+    )
+    with pytest.raises(RuntimeError, match="unavailable"):
+        service.get_ohlcv("601318.SH", "2024-01-01", "2024-03-31")
+    with pytest.raises(ReplayMiss):
+        replay.get_ohlcv("000001.SZ", date(2024, 1, 1), date(2024, 1, 31))
+
+    # Throttling settings default to the recorded ones, None lifts the quota
+    assert replay.calls_per_minute == 6000
+    assert ReplayFeed(tmp_path, "Stub", calls_per_minute=None).calls_per_minute is None
+
+    # Simulated latency and errors
+    slow = ReplayFeed(tmp_path, "Stub", profile=ReplayProfile(latency=0.05))
+    started = time.perf_counter()
+    slow.get_ohlcv("600519.SH", date(2024, 1, 1), date(2024, 3, 31))
+    assert time.perf_counter() - started >= 0.05
+
+    fast_retry = RetryPolicy(max_attempts=20, base_delay=0.001, max_delay=0.001)
+    flaky = ReplayFeed(
+        tmp_path,
+        "Stub",
+        profile=ReplayProfile(error_rate=0.5, seed=7),
+        retry=fast_retry,
+    )
+    service = DataFeedService(feeds=[flaky])
+    pd.testing.assert_frame_equal(
+        service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31"),
+        expected,
+        check_freq=False,
+    )
+
+    down = ReplayFeed(
+        tmp_path, "Stub", profile=ReplayProfile(error_rate=1.0), retry=fast_retry
+    )
+    with pytest.raises(RuntimeError, match="429|Connection reset"):
+        DataFeedService(feeds=[down]).get_ohlcv("600519.SH", "2024-01-01", "2024-03-31")
+
+
+def test_replay_encoding():
+    from dumbmoney.feeds.replay import _frame_from_json, _frame_to_json
+
+    df = pd.DataFrame(
+        {
+            "close": [0.1 + 0.2, 1 / 3, 1e-300, np.nan],
+            "volume": [1, 2, 3, 4],
+            "name": ["a", None, "c", "d"],
+            "listing_date": pd.to_datetime(["2001-08-27", None, "1991-04-03", None]),
+            "is_etf": [True, False, True, False],
+        },
+        index=pd.DatetimeIndex(pd.bdate_range("2024-01-01", periods=4), name="date"),
+    )
+    decoded = _frame_from_json(_frame_to_json(df))
+    pd.testing.assert_frame_equal(decoded, df, check_exact=True, check_freq=False)
+
+
+def test_universe_updater(tmp_path, cache):
+    from dumbmoney.feeds import UniverseUpdater, UpdateManifest
+
+    symbols = ["600519.SH", "000001.SZ", "300750.SZ"]
+    feed = StubFeed()
+    service = DataFeedService(feeds=[feed], cache=cache, drift_check_bars=0)
+
+    def updater():
+        # Reloaded from disk each time, as after a restart
+        return UniverseUpdater(
+            service,
+            UpdateManifest(tmp_path / "manifest.json"),
+            history_start=date(2024, 1, 1),
+            checkpoint_every=1,
+            max_consecutive_failures=2,
+        )
+
+    report = updater().update(symbols, end="2024-03-29")
+    assert sorted(report.updated) == sorted(symbols)
+    assert {call[1] for call in feed.calls} == {date(2024, 1, 1)}
+    manifest = UpdateManifest(tmp_path / "manifest.json")
+    assert manifest.get("600519.SH").checked_through == date(2024, 3, 29)
+    assert manifest.get("600519.SH").last_bar == date(2024, 3, 29)
+
+    # Only the new bars are fetched, and up-to-date symbols are skipped
+    feed.calls.clear()
+    report = updater().update(symbols + ["601318.SH"], end="2024-04-30")
+    starts = {call[0]: call[1] for call in feed.calls}
+    assert starts == {
+        "600519.SH": date(2024, 3, 30),
+        "000001.SZ": date(2024, 3, 30),
+        "300750.SZ": date(2024, 3, 30),
+        "601318.SH": date(2024, 1, 1),
+    }
+    assert report.new_bars == 3 * 22 + len(pd.bdate_range("2024-01-01", "2024-04-30"))
+    feed.calls.clear()
+    assert updater().update(symbols, end="2024-04-30").skipped == symbols
+    assert feed.calls == []
+
+    # A run failing repeatedly stops, and the next run resumes the pending symbols
+    more = ["000002.SZ", "000063.SZ", "000100.SZ"]
+    feed.failing = more
+    report = updater().update(more, end="2024-04-30")
+    assert report.aborted and len(report.failed) == 2
+    feed.failing = []
+    report = updater().update(symbols + more, end="2024-04-30")
+    assert sorted(report.updated) == sorted(more)
+    assert UpdateManifest(tmp_path / "manifest.json").get("000002.SZ").error is None
+
+
+def test_compact_ohlcv():
+    from dumbmoney.core import compact_ohlcv
+
+    ohlcv = load_ohlcv_from_csv(os.path.join(INPUT_DIR, "AAPL_US.csv"))
+    compact = compact_ohlcv(ohlcv)
+    assert (compact[["open", "high", "low", "close"]].dtypes == "float32").all()
+    assert compact["volume"].dtype == "int32"
+    assert compact.memory_usage().sum() < 0.6 * ohlcv.memory_usage().sum()
+    assert (compact["close"].astype("float64") - ohlcv["close"]).abs().max() < 5e-4
+    assert (compact["volume"] == ohlcv["volume"]).all()
+
+    # Dtypes are only narrowed when the values fit
+    df = ohlcv.head(3).assign(
+        close=[712345.67, 712400.01, 712399.99],
+        volume=[1.0, np.nan, 3.0],
+        exchange=["XNAS", "XNAS", "XNAS"],
+    )
+    compact = normalize_ohlcv(df, compact=True)
+    assert compact["close"].dtype == "float64"
+    assert compact["open"].dtype == "float32"
+    assert compact["volume"].dtype == "float64"
+    assert compact["exchange"].dtype == "category"
+
+    service = DataFeedService(feeds=[StubFeed()])
+    bars = service.get_ohlcv("600519.SH", "2024-01-01", "2024-01-31", compact=True)
+    assert bars["close"].dtype == "float32"
+    assert bars["volume"].dtype == "int32"
+    assert bars["amount"].dtype == "float32"
+
+
+def test_binary_storage_round_trip(tmp_path):
+    ohlcv = load_ohlcv_from_csv(os.path.join(INPUT_DIR, "AAPL_US.csv"))
+
+    formats = [
+        (export_ohlcv_to_parquet, load_ohlcv_from_parquet, "aapl.parquet"),
+        (export_ohlcv_to_feather, load_ohlcv_from_feather, "aapl.feather"),
+        (export_ohlcv_to_npy, load_ohlcv_from_npy, "aapl_npy"),
+    ]
+    for export, load, name in formats:
+        path = tmp_path / name
+        export(ohlcv, path)
+        pd.testing.assert_frame_equal(load(path), ohlcv)
+        pd.testing.assert_frame_equal(
+            load(path, columns=["close", "volume"]), ohlcv[["close", "volume"]]
+        )
+        pd.testing.assert_frame_equal(load(path, memory_map=False), ohlcv)
+
+    # Memory-mapped .npy columns are read-only views of the files
+    mapped = load_ohlcv_from_npy(tmp_path / "aapl_npy", columns=["close"])
+    assert isinstance(mapped["close"].values.base, np.memmap)
+    assert not mapped["close"].values.flags.writeable
+
+    with pytest.raises(ValueError):
+        export_ohlcv_to_npy(ohlcv.assign(name="AAPL"), tmp_path / "object_npy")
+
+    # Compacted frames: narrowed numeric dtypes are kept, categories are rejected
+    from dumbmoney.core import compact_ohlcv
+
+    compact = compact_ohlcv(ohlcv)
+    export_ohlcv_to_npy(compact, tmp_path / "compact_npy")
+    pd.testing.assert_frame_equal(
+        load_ohlcv_from_npy(tmp_path / "compact_npy", memory_map=False), compact
+    )
+    compact = compact_ohlcv(ohlcv.assign(exchange="XNAS"))
+    assert compact["exchange"].dtype == "category"
+    with pytest.raises(ValueError, match="exchange"):
+        export_ohlcv_to_npy(compact, tmp_path / "category_npy")
+    assert not (tmp_path / "category_npy").exists()
+    with pytest.raises(FileNotFoundError):
+        load_ohlcv_from_npy(tmp_path / "missing")
+
+
+def test_panel_store(tmp_path, cache):
+    from dumbmoney.core import PanelStore
+    from dumbmoney.core.panel import PANEL_FIELDS
+    from dumbmoney.feeds import build_panel
+
+    symbols = ["600519.SH", "000001.SZ", "300750.SZ", "601318.SH"]
+    feed = StubFeed(failing=["601318.SH"])
+    service = DataFeedService(feeds=[feed], cache=cache)
+    panel = build_panel(
+        tmp_path / "panel", symbols, "2024-01-01", "2024-03-31", service=service
+    )
+
+    dates = pd.bdate_range("2024-01-01", "2024-03-31", name="date")
+    assert panel.shape == (len(dates), len(symbols))
+    assert isinstance(panel.values("close"), np.memmap)
+    expected = service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31")
+    pd.testing.assert_frame_equal(
+        panel.symbol("600519.SH"), expected[list(PANEL_FIELDS)], check_freq=False
+    )
+    assert panel["close"]["601318.SH"].isna().all()  # failed symbol left empty
+
+    # Date ranges and runs of symbols are views of the mapped arrays
+    sub = panel.select("2024-02-01", "2024-02-29", symbols=symbols[:2])
+    assert sub.shape == (len(dates[dates.month == 2]), 2)
+    assert np.shares_memory(sub.values("close"), panel.values("close"))
+    gathered = panel.select("2024-02-01", "2024-02-29", symbols=symbols[2::-2])
+    pd.testing.assert_frame_equal(
+        gathered["close"], panel["close"].loc["2024-02", symbols[2::-2]]
+    )
+    with pytest.raises(KeyError):
+        panel.select(symbols=["000002.SZ"])
+
+    # From the cache only, on a given calendar
+    calls = len(feed.calls)
+    cached = build_panel(
+        PanelStore(tmp_path / "cached"),
+        symbols[:3],
+        "2024-01-01",
+        "2024-03-31",
+        dates=pd.bdate_range("2023-12-01", "2024-06-30", name="date"),
+        cache=service.cache,
+    )
+    assert len(feed.calls) == calls
+    pd.testing.assert_frame_equal(cached["close"], panel["close"][symbols[:3]])
+
+
+def test_stock_details_cache(tmp_path):
+    primary = StubFeed(
+        name="Primary",
+        delay=0.2,
+        details=StockDetails(
+            symbol="600519", name="贵州茅台", market="CN", is_etf=False
+        ),
+    )
+    secondary = StubFeed(
+        name="Secondary",
+        delay=0.2,
+        details=StockDetails(
+            symbol="600519",
+            name="Kweichow Moutai",
+            market="CN",
+            exchange="SSE",
+            total_shares=1256197800,
+            is_etf=False,
+        ),
+    )
+    cache = StockDetailsCache(tmp_path)
+    service = DataFeedService(feeds=[primary, secondary], details_cache=cache)
+
+    # Feeds are queried concurrently, merged in priority order
+    started = time.perf_counter()
+    details = service.get_stock_details("600519.SH")
+    assert time.perf_counter() - started < 0.35
+    assert details is not None
+    assert details.name == "贵州茅台"
+    assert details.exchange == "SSE"
+    assert details.total_shares == 1256197800
+
+    # Served from the persistent cache, also by a new service
+    service = DataFeedService(feeds=[primary, secondary], details_cache=cache)
+    assert service.get_stock_details("600519") == details
+    assert len(primary.calls) == 1 and len(secondary.calls) == 1
+
+    # Concurrent writers of an entry don't clash on their temporary files
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: cache.put("600519.SH", details), range(32)))
+    assert cache.get("600519") == details
+    assert not list(tmp_path.rglob("*.tmp"))
+
+    # Expired entries are fetched again
+    expired = StockDetailsCache(tmp_path, ttl=timedelta(0))
+    assert expired.get("600519.SH") is None
+    service = DataFeedService(feeds=[primary, secondary], details_cache=expired)
+    assert service.get_stock_details("600519.SH") == details
+    assert len(primary.calls) == 2
+
+
+def test_stock_universe(tmp_path):
+    primary = StubFeed(
+        name="Primary",
+        listings=pd.DataFrame(
+            {
+                "symbol": ["600519", "000001", "510300"],
+                "name": ["贵州茅台", "平安银行", "沪深300ETF"],
+                "exchange": ["SSE", "SZSE", "SSE"],
+                "listing_date": pd.to_datetime(["2001-08-27", "1991-04-03", None]),
+                "industry": ["白酒", "银行", None],
+                "is_etf": [False, False, True],
+            }
+        ),
+    )
+    secondary = StubFeed(
+        name="Secondary",
+        listings=pd.DataFrame(
+            {"symbol": ["600519", "688235"], "total_shares": [1256197800, 9.9e8]}
+        ),
+    )
+    cache = StockDetailsCache(tmp_path)
+    service = DataFeedService(feeds=[primary, secondary], details_cache=cache)
+
+    universe = service.get_universe("CN")
+    assert len(universe) == 4
+    assert len(primary.calls) == 1 and len(secondary.calls) == 1
+
+    # Lookups are served from the universe, merged in priority order
+    details = service.get_stock_details("600519.SH")
+    assert details is not None
+    assert details.name == "贵州茅台"
+    assert details.total_shares == 1256197800
+    assert details.listing_date == date(2001, 8, 27)
+    assert details.tags == ["白酒"]
+    assert service.get_stock_details("510300").is_etf
+    assert len(primary.calls) == 1
+    assert "0700.HK" not in universe
+
+    # The universe is persisted with the details cache
+    service = DataFeedService(feeds=[primary, secondary], details_cache=cache)
+    reloaded = service.get_universe("CN")
+    assert reloaded.symbols() == universe.symbols()
+    assert reloaded.lookup("000001.SZ") == universe.lookup("000001")
+    assert len(primary.calls) == 1
+
+    # Markets no feed can list yield an empty universe
+    assert len(service.get_universe("US")) == 0
+
+    # The async service merges and serves lookups the same way
+    async def lookup_async(service):
+        universe = await service.get_universe("CN")
+        return universe, await service.get_stock_details("600519.SH")
+
+    calls = len(primary.calls)
+    service = AsyncDataFeedService(feeds=[primary, secondary])
+    async_universe, async_details = asyncio.run(lookup_async(service))
+    assert async_universe.symbols() == universe.symbols()
+    assert async_details == details
+    assert len(primary.calls) == calls + 1
+
+
+class FakeTigerClient:
+    """
+    Serves daily bars in pages of `page_size`, chained by `next_page_token`,
+    and the listings of `codes`.
+    """
+
+    def __init__(self, page_size, codes=()):
+        self.page_size = page_size
+        self.codes = list(codes)
+        self.requests = []
+
+    def get_symbols(self, market):
+        return self.codes
+
+    def get_stock_details(self, symbols, lang):
+        self.requests.append(tuple(symbols))
+        return pd.DataFrame({"symbol": symbols, "name": symbols, "shares": 1e9})
+
+    def get_bars(self, symbols, period, begin_time, end_time, right, limit, page_token):
+        self.requests.append((begin_time, end_time, page_token))
+        dates = pd.bdate_range(begin_time, end_time)
+        offset = int(page_token or 0)
+        page = dates[offset : offset + min(limit, self.page_size)]
+        more = offset + len(page) < len(dates)
+        return pd.DataFrame(
+            {
+                "symbol": symbols,
+                "time": page.asi8 // 10**6,
+                "open": 1.0,
+                "high": 1.0,
+                "low": 1.0,
+                "close": 1.0,
+                "volume": 100,
+                "next_page_token": str(offset + len(page)) if more else None,
+            }
+        )
+
+
+def test_tiger_pagination(monkeypatch):
+    tiger = pytest.importorskip("dumbmoney.feeds.tiger")
+    client = FakeTigerClient(page_size=100)
+    monkeypatch.setattr(tiger, "get_tiger_client", lambda *args: client)
+    config = tiger.TigerConfig(private_key="", tiger_id="", account="", license="")
+    expected = pd.bdate_range("2020-01-01", "2024-12-31")
+
+    # Pages of one window are followed through next_page_token
+    feed = tiger.TigerFeed(config=config, calls_per_minute=None)
+    df = feed.get_ohlcv("002594.SZ", date(2020, 1, 1), date(2024, 12, 31))
+    assert df.index.equals(pd.DatetimeIndex(expected, name="date"))
+    assert len(client.requests) > 2
+
+    # Long ranges are split into windows, overlapping days are dropped
+    client.requests.clear()
+    feed = tiger.TigerFeed(config=config, calls_per_minute=None, page_limit=365)
+    df = feed.get_ohlcv("002594.SZ", date(2020, 1, 1), date(2024, 12, 31))
+    assert df.index.equals(pd.DatetimeIndex(expected, name="date"))
+    assert len({(begin, end) for begin, end, _ in client.requests}) == 6
+
+
+def test_tiger_universe_throttling(monkeypatch):
+    tiger = pytest.importorskip("dumbmoney.feeds.tiger")
+    client = FakeTigerClient(page_size=100, codes=[f"{600000 + i}" for i in range(120)])
+    monkeypatch.setattr(tiger, "get_tiger_client", lambda *args: client)
+    tokens = []
+    monkeypatch.setattr(
+        tiger,
+        "get_rate_limiter",
+        lambda name, calls_per_minute: SimpleNamespace(
+            acquire=lambda: tokens.append(name)
+        ),
+    )
+    config = tiger.TigerConfig(private_key="", tiger_id="", account="", license="")
+
+    # Each details batch of the listing takes a token from the feed's limiter
+    universe = tiger.TigerFeed(config=config).get_universe("CN")
+    assert len(universe) == 120
+    assert len(client.requests) == 3
+    assert len(tokens) == 3
+
+
+def test_akshare_missing_date_column(monkeypatch):
+    akshare = pytest.importorskip("dumbmoney.feeds.akshare")
+    bars = pd.DataFrame({"开盘": [1.0], "收盘": [1.0]})
+    monkeypatch.setattr(akshare.ak, "stock_zh_a_hist", lambda **kwargs: bars)
+
+    with pytest.raises(ValueError, match="no date column"):
+        akshare.AkshareFeed().get_ohlcv(
+            "600519.SH", date(2024, 1, 1), date(2024, 1, 31)
+        )
+
+
+def test_columnar_ingest():
+    from dumbmoney.feeds.ingest import (
+        dates_from_epoch_ms,
+        dates_from_strings,
+        ohlcv_from_frame,
+    )
+
+    raw = pd.DataFrame(
+        {
+            "trade_date": ["20240105", "20240102", "20240104", "20240103", "20240108"],
+            "open": [5.0, 2.0, 4.0, 3.0, 6.0],
+            "high": [5.5, 2.5, 4.5, 3.5, 6.5],
+            "low": [4.5, 1.5, 3.5, 2.5, 5.5],
+            "close": [5.2, 2.2, 4.2, 3.2, 6.2],
+            "vol": [500, 200, 400, 300, 600],
+            "amount": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+    rename = {"trade_date": "date", "vol": "volume"}
+    df = ohlcv_from_frame(
+        raw,
+        dates_from_strings(raw["trade_date"], format="%Y%m%d"),
+        date(2024, 1, 3),
+        date(2024, 1, 5),
+        rename=rename,
+    )
+
+    # Same result as renaming, filtering and normalizing the frame
+    legacy = raw.rename(columns=rename)
+    legacy["date"] = pd.to_datetime(legacy["date"])
+    legacy = legacy[(legacy["date"] >= "2024-01-03") & (legacy["date"] <= "2024-01-05")]
+    pd.testing.assert_frame_equal(df, normalize_ohlcv(legacy))
+
+    df = ohlcv_from_frame(
+        raw, dates_from_strings(raw["trade_date"]), rename=rename, fields=[]
+    )
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+    assert ohlcv_from_frame(
+        raw,
+        dates_from_strings(raw["trade_date"]),
+        date(2025, 1, 1),
+        date(2025, 2, 1),
+        rename=rename,
+    ).empty
+
+    # Bars stamped at midnight New York time keep their trading date
+    stamps = [1704171600000, 1704776400000, 1720411200000]  # EST and EDT midnights
+    assert list(dates_from_epoch_ms(stamps, tz="America/New_York")) == list(
+        pd.to_datetime(["2024-01-02", "2024-01-09", "2024-07-08"])
+    )
+
+
+def test_full_history_cache():
+    # KCB endpoints returning the whole listing history
+    feed = StubFeed(delay=0.05, full_history=(date(2019, 7, 22), date(2024, 12, 31)))
+    clock = [0.0]
+    service = DataFeedService(
+        feeds=[feed], history_cache=FullHistoryCache(ttl=60, clock=lambda: clock[0])
+    )
+
+    # Concurrent sub-range requests share one download, then slice it
+    threads = [
+        threading.Thread(
+            target=service.get_ohlcv,
+            args=("688981.SH", f"2024-0{month}-01", f"2024-0{month}-28"),
+        )
+        for month in range(1, 6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    df = service.get_ohlcv("688981", "2024-03-01", "2024-03-31", fields=[])
+    assert len(feed.calls) == 1
+    assert df.index[0] == pd.Timestamp("2024-03-01")
+    assert df.index[-1] == pd.Timestamp("2024-03-29")
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+
+    # Slices are copies, changing them leaves the cached history as is
+    df.loc[:, "close"] = 0.0
+    again = service.get_ohlcv("688981", "2024-03-01", "2024-03-31")
+    assert (again["close"] > 0).all()
+
+    # Other markets pass their range through, expired histories are downloaded again
+    service.get_ohlcv("600519.SH", "2024-03-01", "2024-03-31")
+    assert feed.calls[-1][1:3] == (date(2024, 3, 1), date(2024, 3, 31))
+    clock[0] = 61.0
+    service.get_ohlcv("688981.SH", "2024-03-01", "2024-03-31")
+    assert len(feed.calls) == 3
+
+    # Also across the tasks of the async service
+    async def fetch_async(service):
+        return await asyncio.gather(
+            *(
+                service.get_ohlcv("688981.SH", f"2024-0{month}-01", f"2024-0{month}-28")
+                for month in range(1, 6)
+            )
+        )
+
+    feed.calls.clear()
+    results = asyncio.run(fetch_async(AsyncDataFeedService(feeds=[feed])))
+    assert len(feed.calls) == 1
+    assert results[2].index[0] == pd.Timestamp("2024-03-01")
+
+
+def test_local_adjust(cache):
+    feed = StubFeed(dividend=date(2024, 2, 1))
+    service = DataFeedService(feeds=[feed], cache=cache, local_adjust=True)
+    raw = service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31", adjust="none")
+
+    # Adjusted series are computed from the cached raw bars, without new bar requests
+    backward = service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31", "backward")
+    forward = service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31", "forward")
+    assert {call[3] for call in feed.calls} == {"none"}
+    assert len(feed.calls) == 1
+    # Factors are fetched once, later only today's factor may be fetched again
+    assert feed.factor_calls[0][0] == date(2024, 1, 1)
+    assert all(start == date.today() for start, _ in feed.factor_calls[1:])
+
+    before = raw.index < "2024-02-01"
+    for col in ["open", "high", "low", "close"]:
+        assert (backward[col][before] == raw[col][before]).all()
+        assert (backward[col][~before] == raw[col][~before] * 1.1).all()
+        assert np.allclose(forward[col][before], raw[col][before] / 1.1)
+        assert np.allclose(forward[col][~before], raw[col][~before])
+    assert (forward["volume"] == raw["volume"]).all()
+
+    # The async service adjusts the same way
+    feed = StubFeed(dividend=date(2024, 2, 1))
+    service = AsyncDataFeedService(feeds=[feed], local_adjust=True)
+    pd.testing.assert_frame_equal(
+        asyncio.run(
+            service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31", "backward")
+        ),
+        backward,
+        check_freq=False,
+    )
+    assert {call[3] for call in feed.calls} == {"none"}
+
+    # Feeds without factors fall back to the providers' adjusted bars
+    service = DataFeedService(feeds=[StubFeed()], local_adjust=True)
+    assert service.get_adj_factors("600519.SH", "2024-01-01", "2024-03-31") is None
+    assert not service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31").empty
+
+    # So do feeds failing to return them
+    def unavailable(symbol, start, end):
+        raise ConnectionError("adj_factor unavailable")
+
+    feed = StubFeed(dividend=date(2024, 2, 1))
+    feed.get_adj_factors = unavailable
+    service = DataFeedService(feeds=[feed], local_adjust=True)
+    assert not service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31").empty
+    assert feed.calls[-1][3] == "forward"
+
+
+def test_forward_adjust_drift(cache):
+    feed = StubFeed()
+    service = DataFeedService(feeds=[feed], cache=cache, drift_check_bars=3)
+    service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31")
+
+    # Extending the series re-fetches only a few cached bars to check them
+    service.get_ohlcv("600519.SH", "2024-01-01", "2024-04-30")
+    assert len(feed.calls) == 2
+    assert feed.calls[-1][1:3] == (date(2024, 3, 27), date(2024, 4, 30))
+
+    # A changed adjustment (a dividend rescaling past prices) triggers a full refetch of the cached history
+    feed.scale = 0.9
+    df = service.get_ohlcv("600519.SH", "2024-01-01", "2024-05-31")
+    assert len(feed.calls) == 4
+    assert feed.calls[-1][1:3] == (date(2024, 1, 1), date(2024, 5, 31))
+    expected = feed.get_ohlcv("600519.SH", date(2024, 1, 1), date(2024, 5, 31))
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    # Backfilling before the cached bars checks the bars following the gap
+    feed.scale = 0.8
+    df = service.get_ohlcv("600519.SH", "2023-12-01", "2024-05-31")
+    assert feed.calls[-2][1:3] == (date(2023, 12, 1), date(2024, 1, 3))
+    assert feed.calls[-1][1:3] == (date(2023, 12, 1), date(2024, 5, 31))
+    expected = feed.get_ohlcv("600519.SH", date(2023, 12, 1), date(2024, 5, 31))
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    # Unadjusted bars are not checked
+    service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31", adjust="none")
+    service.get_ohlcv("600519.SH", "2024-01-01", "2024-04-30", adjust="none")
+    assert feed.calls[-1][1:3] == (date(2024, 4, 1), date(2024, 4, 30))
+
+
+@pytest.mark.asyncio
+async def test_async_forward_adjust_drift(cache):
+    feed = StubFeed()
+    service = AsyncDataFeedService(feeds=[feed], cache=cache, drift_check_bars=3)
+    await service.get_ohlcv("600519.SH", "2024-01-01", "2024-03-31")
+
+    feed.scale = 0.9
+    df = await service.get_ohlcv("600519.SH", "2024-01-01", "2024-04-30")
+    assert feed.calls[-2][1:3] == (date(2024, 3, 27), date(2024, 4, 30))
+    assert feed.calls[-1][1:3] == (date(2024, 1, 1), date(2024, 4, 30))
+    expected = feed.get_ohlcv("600519.SH", date(2024, 1, 1), date(2024, 4, 30))
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+
+def test_single_flight():
+    feed = StubFeed(delay=0.2)
+    service = DataFeedService(feeds=[feed])
+    ranges = [("2024-01-01", "2024-06-30")] * 5 + [("2024-02-01", "2024-02-29")] * 5
+    results = [None] * len(ranges)
+
+    def fetch(i):
+        results[i] = service.get_ohlcv("600519.SH", *ranges[i])
+
+    # The first request leads, identical and covered requests share its fetch
+    threads = [threading.Thread(target=fetch, args=(i,)) for i in range(len(ranges))]
+    threads[0].start()
+    time.sleep(0.05)
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(feed.calls) == 1
+    assert service.flights.followers == len(ranges) - 1
+    assert results[-1].index[0] == pd.Timestamp("2024-02-01")
+    assert results[-1].index[-1] == pd.Timestamp("2024-02-29")
+    pd.testing.assert_frame_equal(results[0], results[4])
+    # Callers get their own copies of the shared result
+    results[0].loc[:, "close"] = 0.0
+    assert (results[4]["close"] > 0).all()
+
+    # Ranges not covered by a fetch in flight are fetched separately
+    async def fetch_async(service):
+        return await asyncio.gather(
+            service.get_ohlcv("600519.SH", "2024-01-01", "2024-06-30"),
+            service.get_ohlcv("600519.SH", "2024-03-01", "2024-03-31"),
+            service.get_ohlcv("600519.SH", "2024-06-01", "2024-07-31"),
+            service.get_ohlcv("600519.SH", "2024-03-01", "2024-03-31", "none"),
+        )
+
+    feed.calls.clear()
+    service = AsyncDataFeedService(feeds=[feed])
+    results = asyncio.run(fetch_async(service))
+    assert len(feed.calls) == 3
+    assert service.flights.followers == 1
+    assert len(results[1]) == 21
+
+    # A cancelled leader detaches from the fetch, its followers still get the result
+    async def cancel_leader(service):
+        leader = asyncio.ensure_future(
+            service.get_ohlcv("600519.SH", "2024-01-01", "2024-06-30")
+        )
+        await asyncio.sleep(0.05)
+        follower = asyncio.ensure_future(
+            service.get_ohlcv("600519.SH", "2024-02-01", "2024-02-29")
+        )
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        return await follower
+
+    feed.calls.clear()
+    service = AsyncDataFeedService(feeds=[feed])
+    assert len(asyncio.run(cancel_leader(service))) == 21
+    assert len(feed.calls) == 1
+
+
+def test_lazy_imports():
+    import subprocess
+    import sys
+
+    from dumbmoney import import_times
+    from dumbmoney.feeds import FeedSpec, LazyFeed, registered_feeds
+
+    # Neither pandas, the provider SDKs nor the plotting backends load on import
+    sdks = ("akshare", "tushare", "massive", "tigeropen", "matplotlib", "plotly")
+    code = (
+        "import sys, dumbmoney; print('pandas' in sys.modules); "
+        "from dumbmoney.feeds import default_feed_service; default_feed_service(); "
+        f"print([m for m in {sdks!r} if m in sys.modules])"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.split("\n")[:2] == ["False", "[]"]
+
+    # Registered settings match the feed classes
+    for spec in registered_feeds():
+        try:
+            cls = spec.load_class()
+        except ImportError:
+            continue
+        defaults = cls.__dataclass_fields__
+        assert spec.markets == cls.markets()
+        assert spec.full_history_markets == cls.full_history_markets
+        assert spec.max_concurrency == defaults["max_concurrency"].default
+        assert spec.calls_per_minute == defaults["calls_per_minute"].default
+        assert spec.adj_factors == (cls.get_adj_factors is not BaseFeed.get_adj_factors)
+
+    # A lazy feed is built on first use
+    feed = LazyFeed(FeedSpec(name="LazyStub", target="tests.test_feeds:StubFeed"))
+    service = DataFeedService(feeds=[feed])
+    assert not feed.provides_adj_factors
+    assert not feed.loaded
+
+    # Class-level settings come from the spec
+    kcb = LazyFeed(
+        FeedSpec(
+            name="Kcb",
+            target="",
+            markets=[StockMarket.KCB],
+            full_history_markets=(StockMarket.KCB,),
+        )
+    )
+    assert isinstance(kcb, LazyFeed)
+    assert type(kcb).markets() == [StockMarket.KCB]
+    assert type(kcb).full_history_markets == (StockMarket.KCB,)
+    assert type(kcb).check_symbol("688981") == ("688981", StockMarket.KCB)
+    assert type(feed).markets() == "*" and type(feed).full_history_markets == ()
+    assert not service.get_ohlcv("600519.SH", "2024-01-01", "2024-01-31").empty
+    assert feed.loaded
+    assert "feed:LazyStub" in import_times()
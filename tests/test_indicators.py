@@ -1,4 +1,8 @@
+import numpy as np
+import pandas as pd
+
 from dumbmoney.indicators import MovingAverage, MACD, RSI
+from dumbmoney.indicators.kernels import ewm_alpha, ewm_mean, smma
 
 from tests import ohlcv_data  # noqa: F401
 
@@ -28,3 +32,209 @@ def test_rsi(ohlcv_data):  # noqa: F811
     assert len(values) == len(ohlcv_data)
     assert len(values.columns) == 1
     assert values.iloc[:, 0].isnull().sum() == window  # First 14 values should be NaN
+
+
+def test_recursive_kernels(monkeypatch):
+    from dumbmoney.indicators import kernels
+
+    # Step through time with row updates even for a few columns
+    monkeypatch.setattr(kernels, "_MIN_ROW_VECTORIZED_COLUMNS", 0)
+    rng = np.random.default_rng(0)
+    values = rng.normal(100, 5, (300, 4)).round(2)
+    values[:3, 1] = np.nan  # late start
+    values[rng.random(300) < 0.05, 2] = np.nan  # gaps
+    values[:, 3] = 10.0  # constant
+
+    # Identical to pandas, in 1-D and 2-D
+    for span in (9, 12, 26):
+        for adjust in (False, True):
+            expected = pd.DataFrame(values).ewm(span=span, adjust=adjust).mean()
+            alpha = ewm_alpha(span=span)
+            assert np.array_equal(
+                ewm_mean(values, alpha, adjust), expected.to_numpy(), equal_nan=True
+            )
+            assert np.array_equal(
+                ewm_mean(values[:, 2], alpha, adjust),
+                expected[2].to_numpy(),
+                equal_nan=True,
+            )
+
+    # Wilder's smoothing, with a start per column
+    period, starts = 14, np.array([14, 20, 14, 299])
+    seeds = values[starts, np.arange(4)]
+    smoothed = smma(values, period, seeds, starts)
+    for j, start in enumerate(starts):
+        expected = np.full(300, np.nan)
+        expected[start] = seeds[j]
+        for i in range(start + 1, 300):
+            expected[i] = (expected[i - 1] * (period - 1) + values[i, j]) / period
+        assert np.array_equal(smoothed[:, j], expected, equal_nan=True)
+        assert np.array_equal(
+            smma(values[:, j], period, seeds[j], start), expected, equal_nan=True
+        )
+
+
+def test_compute_panel(ohlcv_data):  # noqa: F811
+    from dumbmoney.indicators import Indicator
+
+    # Ragged listing dates and suspensions
+    frames = {
+        "AAPL": ohlcv_data,
+        "LATE": ohlcv_data.iloc[60:],
+        "GONE": ohlcv_data.iloc[:120],
+        "GAPS": ohlcv_data.drop(ohlcv_data.index[30:40]),
+        "NEW": ohlcv_data.iloc[-10:],
+    }
+
+    class Spread(Indicator):
+        """Indicator without `_compute_arrays`, computed symbol by symbol."""
+
+        def _compute(self, ohlcv):
+            return pd.DataFrame(ohlcv["high"] - ohlcv["low"])
+
+    indicators = [
+        MovingAverage(window=20),
+        MovingAverage(window=20, ma_type="EMA"),
+        MACD(),
+        RSI(),
+        Spread(name="Spread", inputs=["high", "low"]),
+    ]
+    for indicator in indicators:
+        panel = indicator.compute_panel(frames)
+        assert list(panel.symbols) == list(frames)
+        for symbol, ohlcv in frames.items():
+            expected = indicator.compute(ohlcv)
+            for col in expected.columns:
+                values = panel[col][symbol]
+                assert values.index[values.notna()].isin(ohlcv.index).all()
+                pd.testing.assert_series_equal(
+                    values.reindex(ohlcv.index),
+                    expected[col],
+                    check_names=False,
+                    check_freq=False,
+                    check_exact=True,
+                )
+
+
+def test_indicator_cache(ohlcv_data, tmp_path):  # noqa: F811
+    from dumbmoney.indicators import (
+        ComputeContext,
+        IndicatorCache,
+        get_indicator_cache,
+        set_indicator_cache,
+    )
+
+    assert get_indicator_cache() is None  # opt-in
+    previous = get_indicator_cache()
+    cache = IndicatorCache()
+    set_indicator_cache(cache)
+    try:
+        first = MovingAverage(window=20).compute(ohlcv_data)
+        first.iloc[:] = 0.0  # callers can't alter cached values
+        again = MovingAverage(window=20).compute(ohlcv_data.copy())
+        assert cache.stats().hits == 1 and cache.stats().misses == 1
+        assert again.notna().any().all() and (again.dropna() != 0).all().all()
+
+        # Other params, or other data, are computed
+        MovingAverage(window=10).compute(ohlcv_data)
+        MovingAverage(window=20).compute(ohlcv_data.iloc[1:])
+        assert cache.stats().misses == 3
+
+        # Least recently used entries are evicted beyond max_bytes
+        size = again.memory_usage(index=True).sum()
+        small = IndicatorCache(max_bytes=2 * size)
+        set_indicator_cache(small)
+        for window in (5, 6, 7):
+            MovingAverage(window=window).compute(ohlcv_data)
+        assert small.stats().evictions == 1 and small.stats().entries == 2
+
+        # The disk tier outlives the in-memory one
+        disk = IndicatorCache(root=tmp_path)
+        set_indicator_cache(disk)
+        expected = MACD().compute(ohlcv_data)
+        disk.clear()
+        pd.testing.assert_frame_equal(
+            MACD().compute(ohlcv_data), expected, check_freq=False
+        )
+        assert disk.stats().disk_hits == 1
+
+        # Inputs shared by indicators computed together are fingerprinted once
+        context = ComputeContext(ohlcv_data)
+        key = IndicatorCache.key(MovingAverage(window=5), ohlcv_data, context)
+        close = context.fingerprint("close")
+        IndicatorCache.key(RSI(), ohlcv_data, context)
+        assert context.fingerprint("close") is close
+        assert key == IndicatorCache.key(MovingAverage(window=5), ohlcv_data)
+
+        set_indicator_cache(None)
+        assert MovingAverage(window=20).compute(ohlcv_data).notna().any().all()
+    finally:
+        set_indicator_cache(previous)
+
+
+def test_streaming_updates(ohlcv_data):  # noqa: F811
+    from dumbmoney.indicators import Indicator
+
+    class Spread(Indicator):
+        """Indicator without a streaming implementation, recomputed on each bar."""
+
+        def _compute(self, ohlcv):
+            return pd.DataFrame(ohlcv["high"] - ohlcv["low"])
+
+    def indicators():
+        return [
+            MovingAverage(window=20),
+            MovingAverage(window=20, ma_type="EMA"),
+            MACD(),
+            RSI(),
+            Spread(name="Spread", inputs=["high", "low"]),
+        ]
+
+    half = len(ohlcv_data) // 2
+    for batch, streamed, resumed in zip(indicators(), indicators(), indicators()):
+        expected = batch.compute(ohlcv_data)
+
+        # Bar by bar from scratch, and continuing a compute() on older bars
+        assert list(streamed.extend(ohlcv_data.iloc[:0]).columns) == list(
+            expected.columns
+        )
+        pd.testing.assert_frame_equal(
+            streamed.extend(ohlcv_data), expected, check_freq=False, check_exact=True
+        )
+        resumed.compute(ohlcv_data.iloc[:half])
+        rows = [resumed.update(bar) for _, bar in ohlcv_data.iloc[half:].iterrows()]
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(rows, index=ohlcv_data.index[half:]),
+            expected.iloc[half:],
+            check_freq=False,
+            check_exact=True,
+        )
+
+
+def test_indicator_set(ohlcv_data):  # noqa: F811
+    from dumbmoney.indicators import IndicatorSet
+
+    def indicators():
+        return [
+            MovingAverage(window=5),
+            MovingAverage(window=20),
+            MovingAverage(window=12, ma_type="EMA"),
+            MACD(),
+            RSI(),
+            RSI(window=6),
+            MovingAverage(window=20, input_col="volume"),
+        ]
+
+    indicator_set = IndicatorSet(indicators())
+    results = indicator_set.compute(ohlcv_data)
+    for indicator, values in zip(indicators(), results):
+        pd.testing.assert_frame_equal(
+            values, indicator.compute(ohlcv_data), check_exact=True
+        )
+    assert indicator_set.values["MACD"] is indicator_set.indicators[3].values
+
+    # Columns, EMA12 and the differences, gains and losses of close are
+    # computed once: 2 columns, 2 SMAs, 3 EMAs, the MACD line, diff, gain,
+    # loss and the 4 rolling means of the RSIs, and the volume SMA
+    context = indicator_set.context
+    assert context is not None and context.computed == 16